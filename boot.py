@@ -0,0 +1,13 @@
+# CIRCUITPY is read-only to code.py unless boot.py remounts it, and code.py
+# keeps the CDC history in /history.bin. Remounting makes the drive read-only
+# over USB instead, so hold button B while resetting the MagTag to edit the
+# files from a computer.
+import board
+import digitalio
+import storage
+
+button_b = digitalio.DigitalInOut(board.BUTTON_B)
+button_b.switch_to_input(pull=digitalio.Pull.UP)
+# the pin reads False while the button is held
+storage.remount("/", readonly=not button_b.value)
+button_b.deinit()
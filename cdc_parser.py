@@ -0,0 +1,194 @@
+# Streaming parser for the JSON array of records returned by the Socrata API.
+#
+# The response body is fed in fixed-size chunks and only the requested fields
+# of each record are kept, so peak memory depends on the chunk size and the
+# number of fields used rather than on how wide the dataset rows are.
+import json
+
+_ARRAY_START = 0
+_ARRAY = 1
+_OBJECT = 2
+_COLON = 3
+_VALUE = 4
+_SKIP = 5
+_DONE = 6
+
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+_WHITESPACE = (0x20, 0x09, 0x0D, 0x0A)
+_SCALAR_END = (0x2C, 0x7D, 0x5D) + _WHITESPACE
+
+
+def _string_end(buffer, start):
+    # index of the quote closing the string that opens at start, -1 if the
+    # closing quote has not been received yet
+    end = buffer.find(b'"', start + 1)
+    while end != -1:
+        backslashes = 0
+        index = end - 1
+        while buffer[index] == _BACKSLASH:
+            backslashes += 1
+            index -= 1
+        if backslashes % 2 == 0:
+            return end
+        end = buffer.find(b'"', end + 1)
+    return -1
+
+
+def _decode_string(raw):
+    if b"\\" in raw:
+        return json.loads(str(raw, "utf-8"))
+    return str(raw[1:-1], "utf-8")
+
+
+class RecordParser:
+    def __init__(self, fields):
+        self.fields = fields
+        self.records = []
+        self.bytes_received = 0
+        self._buffer = b""
+        self._state = _ARRAY_START
+        self._record = None
+        self._key = None
+        self._skip_depth = 0
+        self._skip_in_string = False
+        self._skip_escape = False
+
+    def feed(self, chunk):
+        self.bytes_received += len(chunk)
+        if self._buffer:
+            self._buffer = self._buffer + chunk
+        else:
+            self._buffer = chunk
+        position = self._parse(self._buffer, False)
+        self._buffer = self._buffer[position:]
+
+    def finish(self):
+        if self._buffer:
+            position = self._parse(self._buffer, True)
+            self._buffer = self._buffer[position:]
+        if self._state != _DONE:
+            raise ValueError("response ended before the closing ]")
+        return self.records
+
+    def _parse(self, buffer, final):
+        # returns the index of the first byte that could not be consumed yet
+        position = 0
+        length = len(buffer)
+        while position < length:
+            state = self._state
+            if state == _SKIP:
+                position = self._skip(buffer, position)
+                continue
+
+            char = buffer[position]
+            if char in _WHITESPACE:
+                position += 1
+                continue
+
+            if state == _OBJECT:
+                if char == _QUOTE:
+                    end = _string_end(buffer, position)
+                    if end == -1:
+                        return position
+                    self._key = _decode_string(buffer[position : end + 1])
+                    self._state = _COLON
+                    position = end + 1
+                elif char == 0x2C:  # ,
+                    position += 1
+                elif char == 0x7D:  # }
+                    self.records.append(self._record)
+                    self._record = None
+                    self._state = _ARRAY
+                    position += 1
+                else:
+                    raise ValueError("unexpected character in record")
+            elif state == _COLON:
+                if char != 0x3A:  # :
+                    raise ValueError("expected : after key")
+                self._state = _VALUE
+                position += 1
+            elif state == _VALUE:
+                wanted = self._key in self.fields
+                if char == _QUOTE:
+                    end = _string_end(buffer, position)
+                    if end == -1:
+                        return position
+                    if wanted:
+                        self._record[self._key] = _decode_string(
+                            buffer[position : end + 1]
+                        )
+                    self._state = _OBJECT
+                    position = end + 1
+                elif char == 0x7B or char == 0x5B:  # { or [
+                    # nested values are never used, step over them
+                    self._skip_depth = 0
+                    self._skip_in_string = False
+                    self._skip_escape = False
+                    self._state = _SKIP
+                else:
+                    end = position + 1
+                    while end < length and buffer[end] not in _SCALAR_END:
+                        end += 1
+                    if end == length and not final:
+                        return position
+                    if wanted:
+                        self._record[self._key] = json.loads(
+                            str(buffer[position:end], "utf-8")
+                        )
+                    self._state = _OBJECT
+                    position = end
+            elif state == _ARRAY:
+                if char == 0x7B:  # {
+                    self._record = {}
+                    self._state = _OBJECT
+                elif char == 0x5D:  # ]
+                    self._state = _DONE
+                elif char != 0x2C:
+                    raise ValueError("unexpected character between records")
+                position += 1
+            elif state == _ARRAY_START:
+                if char != 0x5B:
+                    raise ValueError("response is not a JSON array")
+                self._state = _ARRAY
+                position += 1
+            else:
+                # anything after the closing ] is ignored
+                return length
+        return position
+
+    def _skip(self, buffer, position):
+        length = len(buffer)
+        depth = self._skip_depth
+        in_string = self._skip_in_string
+        escape = self._skip_escape
+        while position < length:
+            char = buffer[position]
+            position += 1
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == _BACKSLASH:
+                    escape = True
+                elif char == _QUOTE:
+                    in_string = False
+            elif char == _QUOTE:
+                in_string = True
+            elif char == 0x7B or char == 0x5B:
+                depth += 1
+            elif char == 0x7D or char == 0x5D:
+                depth -= 1
+                if depth == 0:
+                    self._state = _OBJECT
+                    break
+        self._skip_depth = depth
+        self._skip_in_string = in_string
+        self._skip_escape = escape
+        return position
+
+
+def parse(chunks, fields):
+    parser = RecordParser(fields)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
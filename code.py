@@ -1,14 +1,40 @@
 # SPDX-FileCopyrightText: 2020 ladyada, written for Adafruit Industries
 #
 # SPDX-License-Identifier: Unlicense
+import wake_timer
+
+# started before the other imports so their cost shows up too
+timer = wake_timer.WakeTimer()
+
 import secrets
 import time
-import json
+import binascii
+import displayio
+import ssl
+import alarm
+import rtc
+import board
+import socketpool
+import wifi
 from adafruit_magtag.magtag import MagTag
-import icons
+import cdc_parser
+import cooperative
+import covid_values
+import gzip_stream
+import history
+import http_client
+import label_batch
+import layout
+import payload
+import sleep_state
+import wake_schedule
+import wall_clock
+
+timer.mark("imports")
 
 # Change this to the hour you want to check the data at, for us its 7pm
-# local time (eastern), which is 19:00 hrs
+# local time (eastern), which is 19:00 hrs. Only used until wake_schedule
+# has seen the CDC publish new data once
 DAILY_UPDATE_HOUR = 19
 
 try:
@@ -25,381 +51,591 @@ except ImportError:
 #     'aio_key': "",
 #     'timezone' : "America/New_York",
 #     'cdc_app_token' : "",
-#     'county_fips_code' : ""
+#     'county_fips_code' : "",  # or a list of codes, button D pages between them
+#     'aggregator_url' : "http://192.168.1.2:8090/counties.bin",  # optional
+#     'screen_url' : "http://192.168.1.2:8090/screen.bmp",  # optional
+#     'cdc_proxy_url' : "http://192.168.1.2:8090",  # optional
 #     }
 
 CDC_API_ID = "3nnm-4jni"
 COUNTY_FIPS_CODE = secrets["county_fips_code"]
+if isinstance(COUNTY_FIPS_CODE, str):
+    COUNTY_FIPS_CODES = [code.strip() for code in COUNTY_FIPS_CODE.split(",")]
+else:
+    COUNTY_FIPS_CODES = list(COUNTY_FIPS_CODE)
 CDC_API_APP_TOKEN = secrets["cdc_app_token"]
-NUMBER_OF_RECORDS = 2
-
-
-CDC_API_DATA_SOURCE = f"https://data.cdc.gov/resource/{CDC_API_ID}.json?county_fips={COUNTY_FIPS_CODE}&$order=date_updated%20DESC&$limit={NUMBER_OF_RECORDS}"
-CDC_API_APP_TOKEN = {"X-App-Token": CDC_API_APP_TOKEN}
-
-magtag = MagTag(url=CDC_API_DATA_SOURCE, headers=CDC_API_APP_TOKEN,)
-
-LINE_HEIGHT = 20
-
-LINE_1_Y_POSITION = 10
-LINE_2_Y_POSITION = LINE_1_Y_POSITION + LINE_HEIGHT
-LINE_3_Y_POSITION = LINE_2_Y_POSITION + LINE_HEIGHT
-LINE_4_Y_POSITION = LINE_3_Y_POSITION + LINE_HEIGHT
-LINE_5_Y_POSITION = LINE_4_Y_POSITION + LINE_HEIGHT
-LINE_6_Y_POSITION = LINE_5_Y_POSITION + LINE_HEIGHT
-
-LEFT_ALIGN_X_POSITION = 10
-AFTER_ICON_TEXT_X_POSITION = 30
-
-SECOND_COLUMN_Y_LINE_1_POSITION = 20
-SECOND_COLUMN_X_POSITION = 245
-SECOND_COLUMN_Y_GAP = 40
-
-# As of date
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_1_Y_POSITION),
-    is_data=False,
-)
-
-# County
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_2_Y_POSITION),
-    is_data=False,
-)
 
-# Community Level
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(AFTER_ICON_TEXT_X_POSITION, LINE_3_Y_POSITION),
-    is_data=False,
+# the only columns covid_values.fetch_covid_data reads, the parser drops everything else
+CDC_FIELDS = covid_values.FIELDS
+# a tools/aggregator.py service that fetches the CDC data once for all the
+# MagTags and serves the values they show, None to ask data.cdc.gov directly
+AGGREGATOR_URL = secrets.get("aggregator_url")
+# a tools/aggregator.py service that passes the CDC queries on and keeps
+# the answers, so MagTags asking the same thing share one CDC request. The
+# MagTag still parses the records itself
+CDC_API_URL = "https://data.cdc.gov"
+CDC_API_HOST = secrets.get("cdc_proxy_url", CDC_API_URL)
+# the aggregator's /screen.bmp draws the whole screen, the MagTag only shows
+# the image and never loads a font. Takes the place of AGGREGATOR_URL
+SCREEN_URL = secrets.get("screen_url")
+# where the image is written while it downloads, displayio shows it from
+# there. Needs the drive writable, see boot.py
+SCREEN_PATH = "/screen.bmp"
+# the last aggregator payload, button D pages through the counties in it.
+# Without the aggregator they come from history.PATH
+PAYLOAD_PATH = "/values.bin"
+# the Adafruit IO time service magtag.get_local_time() asks, in the same
+# format, sent through the session every other request goes through
+TIME_SERVICE_URL = (
+    "https://io.adafruit.com/api/v2/%s/integrations/time/strftime?x-aio-key=%s"
 )
-
-# Cases
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(AFTER_ICON_TEXT_X_POSITION, LINE_4_Y_POSITION),
-    is_data=False,
-)
-
-# Inpatient Bed
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(AFTER_ICON_TEXT_X_POSITION, LINE_5_Y_POSITION),
-    is_data=False,
-)
-
-# Hospital Admissions
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(AFTER_ICON_TEXT_X_POSITION, LINE_6_Y_POSITION),
-    is_data=False,
-)
-
-# when was the API last called
-magtag.add_text(
-    text_font="/fonts/Arial-Bold-12.pcf",
-    text_position=(SECOND_COLUMN_X_POSITION, SECOND_COLUMN_Y_LINE_1_POSITION),
-    line_spacing=0.75,
-    is_data=False,
-)
-
-# Community Levels
-magtag.add_text(
-    text_font="/fonts/forkawesome-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_3_Y_POSITION),
-    is_data=False,
-)
-
-# Cases Icon
-magtag.add_text(
-    text_font="/fonts/forkawesome-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_4_Y_POSITION),
-    is_data=False,
+TIME_SERVICE_FORMAT = "%25Y-%25m-%25d+%25H%3A%25M%3A%25S.%25L+%25j+%25u+%25z+%25Z"
+# ask for the CDC response gzipped, it is decompressed by gzip_stream as it
+# arrives. Only where zlib can inflate a stream, which CircuitPython's
+# cannot
+ACCEPT_GZIP = gzip_stream.NATIVE
+# how many bytes are read from the socket at a time while parsing the response
+PARSER_CHUNK_SIZE = 256
+# how many wakes worth of response sizes are kept in sleep memory
+FETCH_LOG_LENGTH = 8
+# how many wakes worth of phase timings are kept in sleep memory, hold
+# button A while the MagTag wakes up to print them
+WAKE_LOG_LENGTH = 6
+# set up the labels and fonts while the CDC request is in flight, False runs
+# them one after the other for comparison
+OVERLAP_BOOT = True
+# glyphs loaded per step of the display setup, smaller steps let the CDC
+# response be read sooner
+GLYPHS_PER_STEP = 12
+
+
+# one query for every county, only asking Socrata for the columns in
+# CDC_FIELDS. All counties are published with the same date_updated, so
+# ordering by date first makes the limit return the latest
+# history.WEEKS weeks of each county
+COUNTY_FIPS_LIST = ",".join("%27" + code + "%27" for code in COUNTY_FIPS_CODES)
+CDC_API_DATA_SOURCE = (
+    f"{CDC_API_HOST}/resource/{CDC_API_ID}.json"
+    f"?$select={','.join(CDC_FIELDS)}"
+    f"&$where=county_fips%20in({COUNTY_FIPS_LIST})"
+    f"&$order=date_updated%20DESC,county_fips"
+    f"&$limit={history.WEEKS * len(COUNTY_FIPS_CODES)}"
 )
+CDC_API_APP_TOKEN = {"X-App-Token": CDC_API_APP_TOKEN}
 
-# Inpatient Icon
-magtag.add_text(
-    text_font="/fonts/forkawesome-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_5_Y_POSITION),
-    is_data=False,
-)
+magtag = MagTag()
 
-# Hospital Admissions Icon
-magtag.add_text(
-    text_font="/fonts/forkawesome-12.pcf",
-    text_position=(LEFT_ALIGN_X_POSITION, LINE_6_Y_POSITION),
-    is_data=False,
+# one socket pool and TLS context for every request of the wake
+session = http_client.Session(
+    socketpool.SocketPool(wifi.radio), ssl.create_default_context()
 )
 
+chart = layout.sparkline_chart()
 
-def get_percent_change(current, previous):
-    change_value = 0
-
-    try:
-        current_number = float(current)
-        previous_number = float(previous)
-    except ValueError:
-        print("current or previous value not a float")
-        pass
-
-    if current_number != previous_number:
-        try:
-            # change_value = (abs(current_number - previous_number) / previous_number)
-            change_value = (current_number - previous_number) / previous_number
-        except ZeroDivisionError:
-            print("previous number is 0")
-            pass
-
-    return change_value
-
-
-def get_float_or_zero(string_value):
-    float_value = 0.0
-
-    try:
-        float_value = float(string_value)
-    except ValueError:
-        print("current or previous value not a float")
-        pass
-
-    return float_value
 
+def data_source(histories):
+    # only the weeks newer than the ones every county already has, or the
+    # full history while a county has too few weeks to compare
+    latest = history.latest_date(histories)
+    if (
+        latest is None
+        or min(county_history.count for county_history in histories.values())
+        < covid_values.NUMBER_OF_RECORDS
+    ):
+        return CDC_API_DATA_SOURCE
+    return CDC_API_DATA_SOURCE.replace(
+        "&$where=", "&$where=date_updated%20>%20%27" + latest + "%27%20AND%20"
+    )
 
-def fetch_covid_data(json_covid_data_response):
-    print("fetching data")
 
+def request_headers(validators, url):
+    # only ask for the body if the CDC published something since the last
+    # response we rendered. The app token only goes to data.cdc.gov, never
+    # to the aggregator or the proxy, which may be plain HTTP
+    headers = {}
+    if url.startswith(CDC_API_URL + "/"):
+        headers.update(CDC_API_APP_TOKEN)
+    if ACCEPT_GZIP:
+        headers["Accept-Encoding"] = "gzip"
+    if validators.get("url") == url:
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response, url):
+    validators = {"url": url}
+    if "etag" in response.headers:
+        validators["etag"] = response.headers["etag"]
+    if "last-modified" in response.headers:
+        validators["last_modified"] = response.headers["last-modified"]
+    return validators
+
+
+def add_records(histories, json_covid_data_response):
+    # the records come newest first, the history takes them oldest first.
+    # Returns how many weeks were new
+    added = 0
+    for record in reversed(json_covid_data_response):
+        county_history = histories.get(record["county_fips"])
+        if county_history is not None and county_history.add(record):
+            added += 1
+    return added
+
+
+def last_called():
     now = time.localtime()
     print("Now: ", now)
+    return "%d/%d\n%d:%02d" % now[1:5]
 
-    output_values = {}
-
-    output_values["date_updated"] = json_covid_data_response[0]["date_updated"][0:10]
-
-    output_values["api_last_called"] = "%d/%d\n%d:%02d" % now[1:5]
 
-    output_values["county"] = json_covid_data_response[0]["county"]
-
-    county_population = get_float_or_zero(
-        json_covid_data_response[0]["county_population"]
-    )
-    per100k_multiplier = county_population / 100000.0
-
-    # ---------------------------------
-    # community level
-    # ---------------------------------
-
-    current_community_level = json_covid_data_response[0]["covid_19_community_level"]
-    prior_value_community_level = json_covid_data_response[1][
-        "covid_19_community_level"
-    ]
-
-    output_values["community_level"] = current_community_level
-
-    current_community_level = current_community_level.lower()
-    prior_value_community_level = prior_value_community_level.lower()
-
-    if current_community_level == "low" and (
-        prior_value_community_level == "medium" or prior_value_community_level == "high"
-    ):
-        output_values["community_level_direction"] = "down"
-    elif current_community_level == "medium" and (prior_value_community_level == "low"):
-        output_values["community_level_direction"] = "up"
-    elif current_community_level == "medium" and (
-        prior_value_community_level == "high"
-    ):
-        output_values["community_level_direction"] = "down"
-    elif current_community_level == "high" and (
-        prior_value_community_level == "low" or prior_value_community_level == "medium"
-    ):
-        output_values["community_level_direction"] = "up"
-
-    # ---------------------------------
-    # cases per 100k
-    # ---------------------------------
-
-    current_cases_per_100k = get_float_or_zero(
-        json_covid_data_response[0]["covid_cases_per_100k"]
-    )
-    prior_cases_per_100k = get_float_or_zero(
-        json_covid_data_response[1]["covid_cases_per_100k"]
-    )
-    print(f"current_cases_per_100k: {current_cases_per_100k}")
-    print(f"prior_cases_per_100k: {prior_cases_per_100k}")
+def covid_data_by_county(histories, api_last_called):
+    # the latest covid_values.NUMBER_OF_RECORDS weeks of each county
+    # compared, plus the sparkline of its whole history
+    output_values = {}
+    for county_fips, county_history in histories.items():
+        if county_history.count < covid_values.NUMBER_OF_RECORDS:
+            print("not enough records for county", county_fips)
+            continue
+        values = covid_values.fetch_covid_data(
+            county_history.records(covid_values.NUMBER_OF_RECORDS)
+        )
+        values["sparkline"] = [
+            round(value, 2)
+            for value in county_history.series(covid_values.SPARKLINE_METRIC)
+        ]
+        values["api_last_called"] = api_last_called
+        output_values[county_fips] = values
+    return output_values
 
-    current_cases = current_cases_per_100k * per100k_multiplier
-    output_values["cases"] = current_cases
-    print(f"current_cases: {current_cases}")
 
-    if current_cases_per_100k > prior_cases_per_100k:
-        output_values["cases_direction"] = "up"
-    elif current_cases_per_100k < prior_cases_per_100k:
-        output_values["cases_direction"] = "down"
+def aggregated_by_county(records, api_last_called):
+    # the aggregator has done the work, records are decoded payload records
+    output_values = {}
+    for values in records:
+        values["api_last_called"] = api_last_called
+        output_values[values.pop("county_fips")] = values
+    return output_values
 
-    print(output_values["cases_direction"])
 
-    case_pct_change_value = get_percent_change(
-        current_cases_per_100k, prior_cases_per_100k
-    )
+def page_values(county_values):
+    # fips and values of the county on the current page, the page wraps
+    # around if counties were removed from secrets.py
+    for _ in range(len(COUNTY_FIPS_CODES)):
+        county_fips = COUNTY_FIPS_CODES[state.get("page", 0) % len(COUNTY_FIPS_CODES)]
+        if county_fips in county_values:
+            return county_fips, county_values[county_fips]
+        state["page"] = state.get("page", 0) + 1
+    raise ValueError("no CDC data for any county")
 
-    output_values["cases_pct_change"] = case_pct_change_value
 
-    print(case_pct_change_value)
+def show_page(county_values):
+    # draws the county on the current page. Only its values are kept in
+    # sleep memory, which has no room for every county
+    county_fips, values = page_values(county_values)
+    state["shown"] = {county_fips: values}
+    return update_labels(values)
 
-    # ---------------------------------
-    # inpatient bed utilization
-    # ---------------------------------
 
-    current_inpatient_bed_utilization = get_float_or_zero(
-        json_covid_data_response[0]["covid_inpatient_bed_utilization"]
-    )
-    prior_inpatient_bed_utilization = get_float_or_zero(
-        json_covid_data_response[1]["covid_inpatient_bed_utilization"]
+def save_payload(parser):
+    # keeps the aggregator's answer for paging, False when the drive is
+    # read-only, see boot.py
+    try:
+        with open(PAYLOAD_PATH, "wb") as payload_file:
+            payload_file.write(memoryview(parser.buffer)[: parser.bytes_received])
+    except OSError as error:
+        print("values not saved -", error)
+        return False
+    return True
+
+
+def stored_county_values():
+    # every county of the last fetch, rebuilt from the drive. The county on
+    # screen comes from sleep memory in case the drive could not be written
+    county_values = dict(state["shown"])
+    api_last_called = next(iter(county_values.values()))["api_last_called"]
+    if AGGREGATOR_URL:
+        try:
+            with open(PAYLOAD_PATH, "rb") as payload_file:
+                data = payload_file.read()
+            records = payload.decode(data, len(data))
+        except (OSError, ValueError) as error:
+            print("no values loaded -", error)
+            records = []
+        county_values.update(aggregated_by_county(records, api_last_called))
+    else:
+        histories = history.load(COUNTY_FIPS_CODES)
+        county_values.update(covid_data_by_county(histories, api_last_called))
+    return county_values
+
+
+def literal_characters(text):
+    # the characters of text outside its {} format fields
+    characters = set()
+    in_field = False
+    for character in text:
+        if character == "{":
+            in_field = True
+        elif character == "}":
+            in_field = False
+        elif not in_field:
+            characters.add(character)
+    return characters
+
+
+def preload_glyphs():
+    # load every glyph the labels can show in one batch per font, instead of
+    # one at a time while update_labels lays out the text. The county name is
+    # the one shown last, other names are loaded on demand
+    text_glyphs = set(layout.VALUE_GLYPHS)
+    for values in state.get("shown", {}).values():
+        text_glyphs.update(values["county"])
+    for label_format in layout.LABEL_FORMATS:
+        text_glyphs.update(literal_characters(label_format))
+    # label 0 and the first icon label are the first ones using each font
+    text_glyphs = "".join(sorted(text_glyphs))
+    for start in range(0, len(text_glyphs), GLYPHS_PER_STEP):
+        magtag.preload_font(text_glyphs[start : start + GLYPHS_PER_STEP], 0)
+        yield
+    magtag.preload_font(
+        layout.direction_icon("up")
+        + layout.direction_icon("down")
+        + layout.direction_icon(None),
+        layout.FIRST_ICON_LABEL,
     )
 
-    output_values["inpatient_bed_utilization"] = current_inpatient_bed_utilization / 100
-
-    if current_inpatient_bed_utilization > prior_inpatient_bed_utilization:
-        output_values["inpatient_bed_utilization_direction"] = "up"
-    elif current_inpatient_bed_utilization < prior_inpatient_bed_utilization:
-        output_values["inpatient_bed_utilization_direction"] = "down"
 
-    inpatient_bed_utilization_pct_change_value = get_percent_change(
-        current_inpatient_bed_utilization, prior_inpatient_bed_utilization
+def setup_display():
+    # a task for cooperative.run, timer marks are when each part finished
+    yield from layout.add_labels(magtag)
+    magtag.root_group.append(chart.tile_grid)
+    timer.mark("setup")
+    yield from preload_glyphs()
+    timer.mark("glyphs")
+
+
+def fetch_records(url, parser):
+    # a task for cooperative.run that yields while the CDC server works on
+    # the request and between chunks of the response, feeding them to parser
+    # (a cdc_parser.RecordParser or payload.PayloadReader). Returns the
+    # response, the time.monotonic() its headers arrived at and the records,
+    # which are None unless the status is 200
+    fetch_start = time.monotonic()
+    response = yield from session.get(
+        url,
+        headers=request_headers(state.get("validators", {}), url),
+        chunk_size=PARSER_CHUNK_SIZE,
     )
-
-    output_values[
-        "inpatient_bed_utilization_pct_change"
-    ] = inpatient_bed_utilization_pct_change_value
-
-    # ---------------------------------
-    # hospital admissions per 100k
-    # ---------------------------------
-
-    current_hospital_admissions_per_100k = get_float_or_zero(
-        json_covid_data_response[0]["covid_hospital_admissions_per_100k"]
+    received_at = time.monotonic()
+    records = None
+    if response.status_code == 200:
+        for chunk in response.iter_content():
+            if chunk:
+                parser.feed(chunk)
+            yield
+        records = parser.finish()
+    else:
+        response.close()
+    fetch_ms = int((time.monotonic() - fetch_start) * 1000)
+    print(
+        "Received %d bytes (%d decompressed) in %d ms"
+        % (response.bytes_received, parser.bytes_received, fetch_ms)
     )
-    prior_hospital_admissions_per_100k = get_float_or_zero(
-        json_covid_data_response[1]["covid_hospital_admissions_per_100k"]
+    timer.mark("fetch + parse")
+
+    # [bytes over the air, ms] per wake, newest last
+    fetch_log = state.get("fetch_log", [])
+    fetch_log.append([response.bytes_received, fetch_ms])
+    state["fetch_log"] = fetch_log[-FETCH_LOG_LENGTH:]
+    print("Recent fetches [bytes, ms]:", state["fetch_log"])
+    return response, received_at, records
+
+
+def fetch_screen(url):
+    # a task for cooperative.run that writes the image to SCREEN_PATH as it
+    # arrives, so it never has to fit in RAM. Returns the response and the
+    # time.monotonic() its headers arrived at
+    fetch_start = time.monotonic()
+    response = yield from session.get(
+        url,
+        headers=request_headers(state.get("validators", {}), url),
+        chunk_size=PARSER_CHUNK_SIZE,
     )
-
-    output_values["hospital_admissions"] = (
-        current_hospital_admissions_per_100k
-    ) * per100k_multiplier
-
-    if current_hospital_admissions_per_100k > prior_hospital_admissions_per_100k:
-        output_values["hospital_admissions_direction"] = "up"
-    elif current_hospital_admissions_per_100k < prior_hospital_admissions_per_100k:
-        output_values["hospital_admissions_direction"] = "down"
-
-    hospital_admissions_per_100k_pct_change_value = get_percent_change(
-        current_hospital_admissions_per_100k, prior_hospital_admissions_per_100k
+    received_at = time.monotonic()
+    bytes_received = 0
+    if response.status_code == 200:
+        with open(SCREEN_PATH, "wb") as screen_file:
+            for chunk in response.iter_content():
+                if chunk:
+                    screen_file.write(chunk)
+                    bytes_received += len(chunk)
+                yield
+    else:
+        response.close()
+    fetch_ms = int((time.monotonic() - fetch_start) * 1000)
+    print("Received %d bytes in %d ms" % (bytes_received, fetch_ms))
+    timer.mark("fetch")
+    return response, received_at
+
+
+def show_screen(paging):
+    # screen mode: fetch the image of the county on the current page and show
+    # it as one TileGrid. Returns whether the panel was refreshed
+    if paging:
+        # button D woke us up: ask for the next county's image
+        state["page"] = state.get("page", 0) + 1
+    county_fips = COUNTY_FIPS_CODES[state.get("page", 0) % len(COUNTY_FIPS_CODES)]
+    url = SCREEN_URL + "?fips=" + county_fips
+    magtag.network.connect()
+    timer.mark("wifi")
+    response, received_at = cooperative.run(fetch_screen(url))[0]
+    set_clock(response, received_at)
+    timer.mark("time")
+    if response.status_code == 304:
+        print("Screen already shows this data, skipping the refresh")
+        return False
+    if response.status_code != 200:
+        raise RuntimeError("screen returned HTTP %d" % response.status_code)
+    learn_publication(response, url)
+
+    bitmap = displayio.OnDiskBitmap(SCREEN_PATH)
+    magtag.root_group.append(
+        displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
     )
+    timer.mark("image")
+    magtag.refresh()
+    timer.mark("refresh")
+    # wait 2 seconds for display to complete
+    time.sleep(2)
+    timer.mark("refresh wait")
+    state["validators"] = response_validators(response, url)
+    # the labels path has to draw everything again after the image
+    state.pop("screen_fingerprint", None)
+    return True
 
-    output_values[
-        "hospital_admissions_pct_change"
-    ] = hospital_admissions_per_100k_pct_change_value
-
-    return output_values
 
+def update_labels(values):
+    series = values.get("sparkline", [])
+    texts = layout.label_texts(values)
+
+    # e-ink keeps its image through deep sleep, so if the panel already shows
+    # exactly these texts and sparkline there is nothing to redraw
+    sparkline_text = " ".join("%g" % value for value in series)
+    fingerprint = binascii.crc32("\0".join(texts + (sparkline_text,)).encode("utf-8"))
+    if fingerprint == state.get("screen_fingerprint"):
+        print("Screen already shows this data, skipping the refresh")
+        return False
+
+    # Set the labels for the current game data, only the ones that changed
+    # are laid out again
+    changed = label_batch.set_texts(magtag, dict(enumerate(texts)))
+    chart.plot(series)
+    print("Updated labels", changed)
 
-def direction_icon(direction_text):
-    icon = ""
-    if direction_text == "up":
-        icon = icons.chevron_circle_up
-    elif direction_text == "down":
-        icon = icons.arrow_down
-    else:
-        icon = icons.circle_o
-    return icon
+    # magtag.graphics.qrcode(b"https://www.cdc.gov/coronavirus/2019-ncov/science/community-levels.html", qr_size=1, x=SECOND_COLUMN_X_POSITION, y=SECOND_COLUMN_Y_LINE_1_POSITION + SECOND_COLUMN_Y_GAP)
 
+    timer.mark("labels")
 
-def capitalize(input_string):
-    output = ""
-    if len(input_string) > 0:
-        output = input_string[0].upper() + input_string[1:].lower()
-    return output
+    magtag.refresh()
+    timer.mark("refresh")
+    # wait 2 seconds for display to complete
+    time.sleep(2)
+    timer.mark("refresh wait")
+    state["screen_fingerprint"] = fingerprint
+    return True
 
 
-def update_labels(values):
-    # Set the labels for the current game data
-    magtag.set_text(f"As of: {values.get('date_updated')}", 0, False)
-    magtag.set_text(f"{values.get('county')}", 1, False)
-    magtag.set_text(
-        f"Community Level: {capitalize(values.get('community_level'))}", 2, False
-    )
-    magtag.set_text(
-        "New COVID Cases: {0:,.0f} : {1:+.0%}".format(
-            values.get("cases"), values.get("cases_pct_change")
-        ),
-        3,
-        False,
-    )
-    magtag.set_text(
-        "Inpatient Bed %: {0:.1%} : {1:+.0%}".format(
-            values.get("inpatient_bed_utilization"),
-            values.get("inpatient_bed_utilization_pct_change"),
-        ),
-        4,
-        False,
-    )
-    magtag.set_text(
-        "New Admissions: {0:,.0f} : {1:+.0%}".format(
-            values.get("hospital_admissions"),
-            values.get("hospital_admissions_pct_change"),
-        ),
-        5,
-        False,
-    )
-    magtag.set_text(f"{values['api_last_called']}", 6, False)
+def seconds_to_daily_update():
+    now = time.localtime()
 
-    magtag.set_text(direction_icon(values.get("community_level_direction")), 7, False)
-    magtag.set_text(direction_icon(values.get("cases_direction")), 8, False)
-    magtag.set_text(
-        direction_icon(values.get("inpatient_bed_utilization_direction")), 9, False
+    # we only wanna wake up once a day, around the event update time:
+    event_time = time.struct_time(
+        (now[0], now[1], now[2], DAILY_UPDATE_HOUR, 0, 0, -1, -1, now[8])
     )
-    magtag.set_text(
-        direction_icon(values.get("hospital_admissions_direction")), 10, False
+    # how long is that from now?
+    remaining = time.mktime(event_time) - time.mktime(now)
+    if remaining < 0:  # ah its aready happened today...
+        remaining += 24 * 60 * 60  # wrap around to the next day
+    return remaining
+
+
+def learn_publication(response, url):
+    # the Last-Modified header says when the new weeks were published,
+    # without it the best guess is now, if the last wake had all older weeks
+    if "last-modified" in response.headers:
+        published = wall_clock.parse_http_date(response.headers["last-modified"])
+    elif url != CDC_API_DATA_SOURCE:
+        published = wall_clock.utc_now(state)
+    else:
+        return
+    wake_schedule.learn_publication(state, published)
+
+
+def fetch_local_time():
+    # a task for cooperative.run doing what magtag.get_local_time() does, but
+    # through the session: sets the RTC from Adafruit IO and returns the reply
+    url = (
+        TIME_SERVICE_URL % (secrets["aio_username"], secrets["aio_key"])
+        + "&tz="
+        + secrets["timezone"]
+        + "&fmt="
+        + TIME_SERVICE_FORMAT
     )
-
-    # magtag.graphics.qrcode(b"https://www.cdc.gov/coronavirus/2019-ncov/science/community-levels.html", qr_size=1, x=SECOND_COLUMN_X_POSITION, y=SECOND_COLUMN_Y_LINE_1_POSITION + SECOND_COLUMN_Y_GAP)
-
-    magtag.refresh()
-    # wait 2 seconds for display to complete
-    time.sleep(2)
+    response = yield from session.get(url, chunk_size=64)
+    reply = b""
+    for chunk in response.iter_content():
+        if chunk:
+            reply += chunk
+        yield
+    if response.status_code != 200:
+        raise RuntimeError("Adafruit IO time returned HTTP %d" % response.status_code)
+    reply = str(reply, "utf-8")
+    rtc.RTC().datetime = wall_clock.parse_local_time(reply)
+    return reply
+
+
+def get_local_time():
+    return cooperative.run(fetch_local_time())[0]
+
+
+def set_clock(response, received_at):
+    # the RTC runs on local time: UTC from the Date header plus the offset
+    # from the last Adafruit IO sync
+    if "date" not in response.headers:
+        get_local_time()
+        return
+    utc = wall_clock.parse_http_date(response.headers["date"])
+    # Adafruit IO is only asked for the UTC offset again after a daylight
+    # saving change
+    if wall_clock.offset_expired(state, utc):
+        wall_clock.learn_offset(state, get_local_time(), utc)
+    wall_clock.set_rtc(state, utc, received_at)
 
 
 # magtag.peripherals.neopixels.brightness = 0.1
 magtag.peripherals.neopixel_disable = True  # turn on lights
 # magtag.peripherals.neopixels.fill(0x0F0000)  # red!
 
-magtag.get_local_time()
-
-try:
-    output = fetch_covid_data(json.loads(magtag.fetch(auto_refresh=False)))
-    update_labels(output)
-    # OK we're done!
-    # magtag.peripherals.neopixels.fill(0x000F00)  # greten
-except (ValueError, RuntimeError, ConnectionError) as e:
-    print("Some error occured, trying again later -", e)
-    pass
-
-time.sleep(2)  # let screen finish updating
-
-now = time.localtime()
-
-# we only wanna wake up once a day, around the event update time:
-event_time = time.struct_time(
-    (now[0], now[1], now[2], DAILY_UPDATE_HOUR, 0, 0, -1, -1, now[8])
+state = sleep_state.load()
+screen_refreshed = False
+paging = isinstance(alarm.wake_alarm, alarm.pin.PinAlarm) and (
+    SCREEN_URL or state.get("shown")
 )
-# how long is that from now?
-remaining = time.mktime(event_time) - time.mktime(now)
-if remaining < 0:  # ah its aready happened today...
-    remaining += 24 * 60 * 60  # wrap around to the next day
-remaining_hrs = remaining // 3660
+fetch_failed = False
+
+if SCREEN_URL:
+    try:
+        screen_refreshed = show_screen(paging)
+    except (ValueError, RuntimeError, OSError) as e:
+        print("Some error occured, trying again later -", e)
+        fetch_failed = True
+elif paging:
+    # button D woke us up: show the next county from the data we already have
+    cooperative.run(setup_display())
+    state["page"] = state.get("page", 0) + 1
+    screen_refreshed = show_page(stored_county_values())
+else:
+    try:
+        if AGGREGATOR_URL:
+            histories = None
+            url = AGGREGATOR_URL + "?fips=" + ",".join(COUNTY_FIPS_CODES)
+            parser = payload.PayloadReader(len(COUNTY_FIPS_CODES))
+        else:
+            histories = history.load(COUNTY_FIPS_CODES)
+            url = data_source(histories)
+            parser = cdc_parser.RecordParser(CDC_FIELDS)
+        # joining blocks, so there is nothing to overlap it with
+        magtag.network.connect()
+        timer.mark("wifi")
+
+        # the request goes out first so the server works on it while the
+        # display is set up
+        if OVERLAP_BOOT:
+            tasks = cooperative.run(fetch_records(url, parser), setup_display())
+        else:
+            tasks = cooperative.run_in_order(
+                fetch_records(url, parser), setup_display()
+            )
+        response, received_at, records = tasks[0]
+
+        set_clock(response, received_at)
+        timer.mark("time")
+        if response.status_code not in (200, 304):
+            raise RuntimeError("CDC API returned HTTP %d" % response.status_code)
+
+        if histories is None:
+            # the aggregator only answers 200 when its values changed
+            added = len(records) if records else 0
+            if added:
+                save_payload(parser)
+        else:
+            added = add_records(histories, records) if records else 0
+            if added:
+                print("Added %d weeks to the history" % added)
+                history.save(histories)
+        if added:
+            learn_publication(response, url)
+        if not added and "shown" in state:
+            print("No new CDC data since the last wake, leaving the screen as is")
+        else:
+            if histories is None:
+                county_values = aggregated_by_county(records or [], last_called())
+            else:
+                county_values = covid_data_by_county(histories, last_called())
+            timer.mark("compute")
+            screen_refreshed = show_page(county_values)
+        if response.status_code == 200:
+            state["validators"] = response_validators(response, url)
+        # OK we're done!
+        # magtag.peripherals.neopixels.fill(0x000F00)  # greten
+    except (ValueError, RuntimeError, OSError) as e:
+        print("Some error occured, trying again later -", e)
+        fetch_failed = True
+
+session.close()
+if session.requests:
+    print(
+        "%d requests, %d connections, %d TLS handshakes (%d resumed)"
+        % (session.requests, session.connections, session.handshakes, session.resumed)
+    )
+    for host, status, ms in session.log:
+        print("  %s HTTP %d, headers after %d ms" % (host, status, ms))
+
+if screen_refreshed:
+    time.sleep(2)  # let screen finish updating
+    timer.mark("settle")
+
+now = wall_clock.utc_now(state)
+if paging and "wake_at" in state:
+    # paging keeps the wake that was already planned
+    remaining = max(state["wake_at"] - now, 60)
+else:
+    remaining = wake_schedule.seconds_to_sleep(state, now, fetch_failed)
+    if remaining is None:
+        remaining = seconds_to_daily_update()
+state["wake_at"] = now + remaining
+remaining_hrs = remaining // 3600
 remaining_min = (remaining % 3600) // 60
 print("Gonna zzz for %d hours, %d minutes" % (remaining_hrs, remaining_min))
+remaining = wall_clock.sleep_seconds(state, remaining)
+
+timer.save(state, WAKE_LOG_LENGTH)
+if magtag.peripherals.button_a_pressed:
+    wake_timer.show(state["wake_log"])
+else:
+    wake_timer.show(state["wake_log"][-1:])
+
+sleep_state.save(state)
 
 # Turn it all off and go to bed till the next update time
+if len(COUNTY_FIPS_CODES) > 1:
+    # button D wakes us up early to page to the next county. The buttons
+    # have to be released by the peripherals before a PinAlarm can use them
+    magtag.peripherals.deinit()
+    alarm.exit_and_deep_sleep_until_alarms(
+        alarm.time.TimeAlarm(monotonic_time=time.monotonic() + remaining),
+        alarm.pin.PinAlarm(pin=board.BUTTON_D, value=False, pull=True),
+    )
 magtag.exit_and_deep_sleep(remaining)
@@ -0,0 +1,26 @@
+# A small round-robin scheduler for generator based tasks, in the spirit of
+# asyncio but without needing the asyncio library on the CIRCUITPY drive.
+#
+# A task is a generator that yields whenever it is waiting or has done a
+# slice of its work. run() steps the tasks in turn until all are finished
+# and returns their return values in order. An exception in any task stops
+# the run and propagates.
+
+
+def run(*tasks):
+    results = [None] * len(tasks)
+    pending = list(enumerate(tasks))
+    while pending:
+        for entry in tuple(pending):
+            index, task = entry
+            try:
+                next(task)
+            except StopIteration as stop:
+                results[index] = stop.value
+                pending.remove(entry)
+    return results
+
+
+def run_in_order(*tasks):
+    # the same tasks one after the other, for comparing against run()
+    return [run(task)[0] for task in tasks]
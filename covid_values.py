@@ -0,0 +1,137 @@
+# Turns the newest two weeks of a county's CDC records into the values the
+# MagTag shows: the latest numbers, which way they moved and by how much.
+# Shared by code.py and tools/aggregator.py.
+
+# a scale that turns a rate per 100k people into a count for the county
+PER_100K = "per 100k"
+
+# one line per metric shown: the value name, the CDC column it comes from,
+# what the column is multiplied by for display, and the label text, which
+# is formatted with the value and its percent change. Directions and percent
+# changes compare the column itself. history.py, payload.py and layout.py
+# all follow this table
+# fmt: off
+METRICS = (
+    ("cases", "covid_cases_per_100k", PER_100K, "New COVID Cases: {0:,.0f} : {1:+.0%}"),
+    ("inpatient_bed_utilization", "covid_inpatient_bed_utilization", 0.01, "Inpatient Bed %: {0:.1%} : {1:+.0%}"),
+    ("hospital_admissions", "covid_hospital_admissions_per_100k", PER_100K, "New Admissions: {0:,.0f} : {1:+.0%}"),
+)
+# fmt: on
+
+# the only columns fetch_covid_data reads
+FIELDS = (
+    "date_updated",
+    "county_fips",
+    "county",
+    "county_population",
+    "covid_19_community_level",
+) + tuple(metric[1] for metric in METRICS)
+
+# community levels from lowest to highest, as the CDC spells them
+LEVELS = ("Low", "Medium", "High")
+
+# how many of a county's newest weeks fetch_covid_data compares
+NUMBER_OF_RECORDS = 2
+
+# the metric drawn as a sparkline of the weeks in the history
+SPARKLINE_METRIC = "covid_cases_per_100k"
+
+
+def get_percent_change(current, previous):
+    change_value = 0
+
+    try:
+        current_number = float(current)
+        previous_number = float(previous)
+    except ValueError:
+        print("current or previous value not a float")
+        pass
+
+    if current_number != previous_number:
+        try:
+            # change_value = (abs(current_number - previous_number) / previous_number)
+            change_value = (current_number - previous_number) / previous_number
+        except ZeroDivisionError:
+            print("previous number is 0")
+            pass
+
+    return change_value
+
+
+def get_float_or_zero(string_value):
+    float_value = 0.0
+
+    try:
+        float_value = float(string_value)
+    except ValueError:
+        print("current or previous value not a float")
+        pass
+
+    return float_value
+
+
+def direction(current, prior):
+    if current > prior:
+        return "up"
+    if current < prior:
+        return "down"
+    return None
+
+
+def level_index(level):
+    # position of a community level in LEVELS ignoring case, -1 when unknown
+    level = (level or "").lower()
+    for index, name in enumerate(LEVELS):
+        if name.lower() == level:
+            return index
+    return -1
+
+
+def fetch_covid_data(json_covid_data_response):
+    print("fetching data")
+
+    current = json_covid_data_response[0]
+    prior = json_covid_data_response[1]
+
+    output_values = {}
+
+    output_values["date_updated"] = current["date_updated"][0:10]
+
+    output_values["county"] = current["county"]
+
+    per100k_multiplier = get_float_or_zero(current["county_population"]) / 100000.0
+
+    # ---------------------------------
+    # community level
+    # ---------------------------------
+
+    output_values["community_level"] = current["covid_19_community_level"]
+
+    current_level = level_index(current["covid_19_community_level"])
+    prior_level = level_index(prior["covid_19_community_level"])
+    if current_level >= 0 and prior_level >= 0:
+        level_direction = direction(current_level, prior_level)
+        if level_direction:
+            output_values["community_level_direction"] = level_direction
+
+    # ---------------------------------
+    # every metric in METRICS
+    # ---------------------------------
+
+    for name, column, scale, _ in METRICS:
+        current_value = get_float_or_zero(current[column])
+        prior_value = get_float_or_zero(prior[column])
+
+        if scale == PER_100K:
+            scale = per100k_multiplier
+        output_values[name] = current_value * scale
+
+        metric_direction = direction(current_value, prior_value)
+        if metric_direction:
+            output_values[name + "_direction"] = metric_direction
+
+        output_values[name + "_pct_change"] = get_percent_change(
+            current_value, prior_value
+        )
+
+    return output_values
@@ -0,0 +1,41 @@
+# Streaming decoder for gzipped response bodies.
+#
+# GzipDecoder.feed() takes the compressed body a chunk at a time as it comes
+# off the socket and yields the decompressed bytes in chunks of at most
+# chunk_size, so neither the compressed nor the decompressed body has to fit
+# in RAM. finish() checks that the body ended where the gzip trailer says.
+#
+# The inflating is zlib.decompressobj's. CircuitPython's zlib only
+# decompresses whole buffers, so there NATIVE is False and code.py does not
+# ask for gzip.
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+# whether zlib can inflate a stream
+NATIVE = hasattr(zlib, "decompressobj")
+
+
+class GzipDecoder:
+    def __init__(self, chunk_size=256):
+        if not NATIVE:
+            raise ValueError("gzip body but no zlib.decompressobj to inflate it")
+        self.chunk_size = chunk_size
+        self.bytes_out = 0
+        self._zlib = zlib.decompressobj(31)  # 31: with a gzip header
+
+    def feed(self, data):
+        # a generator of the decompressed chunks this data completes
+        while True:
+            chunk = self._zlib.decompress(data, self.chunk_size)
+            data = self._zlib.unconsumed_tail
+            if chunk:
+                self.bytes_out += len(chunk)
+                yield chunk
+            if not data and len(chunk) < self.chunk_size:
+                return
+
+    def finish(self):
+        if not self._zlib.eof:
+            raise ValueError("gzip body ended early")
@@ -0,0 +1,175 @@
+# Weekly CDC values of each county, kept in a file on CIRCUITPY so a wake
+# only has to download the weeks published since the last one.
+#
+# Every county is a ring buffer of WEEKS slots: the dates packed into an
+# array("H"), the community levels in an array("b") and one array("f") per
+# metric. The file is those arrays back to back, so loading and saving are
+# a readinto/write per array. boot.py remounts the drive so code.py can write
+# it; while the drive is read-only save() fails and every wake downloads the
+# full history again.
+import array
+import binascii
+import struct
+import covid_values
+
+PATH = "/history.bin"
+# weeks kept per county
+WEEKS = 12
+# the numeric CDC columns kept for every week
+METRICS = ("county_population",) + tuple(metric[1] for metric in covid_values.METRICS)
+# covid_19_community_level is kept as its index in covid_values.LEVELS,
+# -1 when unknown
+
+# changing WEEKS or the metrics, their names or their order, starts a new
+# history file
+_MAGIC = (
+    b"CD"
+    + bytes((WEEKS, len(METRICS)))
+    + struct.pack("<I", binascii.crc32(",".join(METRICS).encode("utf-8")))
+)
+# fips, length of the county name, next slot, filled slots
+_COUNTY = "<5sBBB"
+
+
+def pack_date(text):
+    # "2022-12-29T00:00:00.000" as 16 bits that sort like the dates
+    return (int(text[0:4]) - 2000) << 9 | int(text[5:7]) << 5 | int(text[8:10])
+
+
+def unpack_date(packed):
+    return "%04d-%02d-%02dT00:00:00.000" % (
+        2000 + (packed >> 9),
+        packed >> 5 & 0x0F,
+        packed & 0x1F,
+    )
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CountyHistory:
+    def __init__(self, fips, county=""):
+        self.fips = fips
+        self.county = county
+        self.dates = array.array("H", bytes(2 * WEEKS))
+        self.levels = array.array("b", bytes(WEEKS))
+        self.values = [array.array("f", bytes(4 * WEEKS)) for _ in METRICS]
+        self.head = 0  # the slot the next week goes into
+        self.count = 0
+
+    def _slot(self, age):
+        # slot of the week `age` weeks older than the newest one
+        return (self.head - 1 - age) % WEEKS
+
+    def latest(self):
+        # packed date of the newest week, 0 while empty
+        return self.dates[self._slot(0)] if self.count else 0
+
+    def add(self, record):
+        # weeks go in oldest first, a week that is not newer than the latest
+        # one is already kept and skipped. Returns whether it was added
+        date = pack_date(record["date_updated"])
+        if date <= self.latest():
+            return False
+        slot = self.head
+        self.dates[slot] = date
+        self.levels[slot] = covid_values.level_index(
+            record.get("covid_19_community_level")
+        )
+        for values, metric in zip(self.values, METRICS):
+            values[slot] = _float(record.get(metric))
+        self.county = record.get("county", self.county)
+        self.head = (slot + 1) % WEEKS
+        self.count = min(self.count + 1, WEEKS)
+        return True
+
+    def records(self, count):
+        # up to count weeks, newest first, shaped like the CDC records
+        records = []
+        for age in range(min(count, self.count)):
+            slot = self._slot(age)
+            level = self.levels[slot]
+            record = {
+                "date_updated": unpack_date(self.dates[slot]),
+                "county_fips": self.fips,
+                "county": self.county,
+                "covid_19_community_level": (
+                    covid_values.LEVELS[level] if level >= 0 else ""
+                ),
+            }
+            for values, metric in zip(self.values, METRICS):
+                record[metric] = values[slot]
+            records.append(record)
+        return records
+
+    def series(self, metric, count=WEEKS):
+        # up to count weeks of one metric, oldest first
+        values = self.values[METRICS.index(metric)]
+        weeks = min(count, self.count)
+        return [values[self._slot(age)] for age in range(weeks - 1, -1, -1)]
+
+
+def latest_date(histories):
+    # the newest week every county has, as a SoQL timestamp, None if a county
+    # has no weeks yet
+    latest = min(county_history.latest() for county_history in histories.values())
+    return unpack_date(latest) if latest else None
+
+
+def load(fips_codes):
+    # {fips: CountyHistory} for fips_codes, empty for counties not in the file
+    histories = {fips: CountyHistory(fips) for fips in fips_codes}
+    header = bytearray(struct.calcsize(_COUNTY))
+    try:
+        with open(PATH, "rb") as history_file:
+            if history_file.read(len(_MAGIC)) != _MAGIC:
+                print("history file is from another version, starting fresh")
+                return histories
+            for _ in range(history_file.read(1)[0]):
+                history_file.readinto(header)
+                fips, name_length, head, count = struct.unpack(_COUNTY, header)
+                county_history = CountyHistory(str(fips, "utf-8"))
+                county_history.county = str(history_file.read(name_length), "utf-8")
+                county_history.head = head
+                county_history.count = count
+                history_file.readinto(county_history.dates)
+                history_file.readinto(county_history.levels)
+                for values in county_history.values:
+                    history_file.readinto(values)
+                if county_history.fips in histories:
+                    histories[county_history.fips] = county_history
+    except (OSError, IndexError, ValueError) as error:
+        print("no history loaded -", error)
+    return histories
+
+
+def save(histories):
+    # False when the drive is read-only, see boot.py
+    try:
+        with open(PATH, "wb") as history_file:
+            history_file.write(_MAGIC)
+            history_file.write(bytes((len(histories),)))
+            for county_history in histories.values():
+                name = county_history.county.encode("utf-8")
+                history_file.write(
+                    struct.pack(
+                        _COUNTY,
+                        county_history.fips.encode("utf-8"),
+                        len(name),
+                        county_history.head,
+                        county_history.count,
+                    )
+                )
+                history_file.write(name)
+                history_file.write(county_history.dates)
+                history_file.write(county_history.levels)
+                for values in county_history.values:
+                    history_file.write(values)
+    except OSError as error:
+        print("history not saved -", error)
+        return False
+    return True
@@ -0,0 +1,270 @@
+# Minimal HTTP/1.1 GET over socketpool that does not block while the server
+# is working on the response, so other tasks can run in the meantime.
+#
+# Session.get() and Response.iter_content() are generators for
+# cooperative.run(). They yield None while the socket has nothing to read,
+# and iter_content() yields the body in chunks once it arrives. Connecting
+# (DNS, TCP and the TLS handshake) still blocks. Bodies can be
+# Content-Length, chunked or read until the server closes the connection,
+# and gzipped bodies are decompressed by gzip_stream as they arrive.
+#
+# A Session holds the one SocketPool and SSLContext every request of a wake
+# goes through. Once a response has been read to the end its connection is
+# kept for the next request to the same host, unless the server closes it.
+# Where the ssl module can hand out TLS sessions (CPython's can,
+# CircuitPython's cannot) a new connection to a host resumes the last one
+# instead of a full handshake.
+import errno
+import time
+
+import gzip_stream
+
+# what recv_into raises on a non-blocking socket with nothing to read yet
+_WOULD_BLOCK = (errno.EAGAIN, errno.ETIMEDOUT)
+
+
+class Response:
+    def __init__(self, sock, timeout, chunk_size, release=None):
+        self.status_code = None
+        self.reason = b""
+        self.headers = {}
+        self.bytes_received = 0
+        self._sock = sock
+        # an idle timeout: the seconds recv_into may find nothing to read
+        self._timeout = timeout
+        self._deadline = time.monotonic() + timeout
+        self._buffer = bytearray(chunk_size)
+        self._pending = b""  # received but not handed out yet
+        # release(sock, reusable) takes the socket back once the response is
+        # done with it, the socket is closed if there is none
+        self._release = release
+        self._keep_alive = False
+        self._body_read = False
+
+    def _receive(self):
+        # waits for more data in _pending, returns False at end of stream
+        while True:
+            try:
+                count = self._sock.recv_into(self._buffer)
+            except OSError as error:
+                if error.errno not in _WOULD_BLOCK:
+                    raise
+                if time.monotonic() > self._deadline:
+                    raise OSError(errno.ETIMEDOUT) from error
+                yield
+                continue
+            self._deadline = time.monotonic() + self._timeout
+            self._pending += self._buffer[:count]
+            return count > 0
+
+    def _read_line(self):
+        while b"\r\n" not in self._pending:
+            if not (yield from self._receive()):
+                raise ConnectionError("connection closed in the HTTP headers")
+        line, self._pending = self._pending.split(b"\r\n", 1)
+        return line
+
+    def _read_head(self):
+        status = yield from self._read_line()
+        parts = status.split(b" ", 2)
+        self.status_code = int(parts[1])
+        self.reason = parts[2] if len(parts) > 2 else b""
+        while True:
+            line = yield from self._read_line()
+            if not line:
+                break
+            name, _, value = str(line, "utf-8").partition(":")
+            self.headers[name.strip().lower()] = value.strip()
+        self._keep_alive = (
+            parts[0] == b"HTTP/1.1"
+            and self.headers.get("connection", "").lower() != "close"
+        )
+        self._body_read = self.status_code in (204, 304)
+
+    def _read_body(self, size):
+        # size bytes of body, or everything up to the end of the stream
+        while size:
+            if not self._pending:
+                if not (yield from self._receive()):
+                    if size > 0:
+                        raise ConnectionError("connection closed in the body")
+                    return
+                continue
+            if size > 0:
+                chunk = self._pending[:size]
+                self._pending = self._pending[size:]
+                size -= len(chunk)
+            else:
+                chunk = self._pending
+                self._pending = b""
+            self.bytes_received += len(chunk)
+            yield chunk
+
+    def iter_content(self):
+        # the body in chunks of at most chunk_size, decompressed if the
+        # server gzipped it. bytes_received counts what came over the wire
+        if self.headers.get("content-encoding", "").lower() != "gzip":
+            yield from self._iter_body()
+            return
+        decoder = gzip_stream.GzipDecoder(len(self._buffer))
+        for chunk in self._iter_body():
+            if chunk:
+                yield from decoder.feed(chunk)
+            else:
+                yield chunk
+        decoder.finish()
+
+    def _iter_body(self):
+        if self.status_code in (204, 304):
+            pass
+        elif "chunked" in self.headers.get("transfer-encoding", ""):
+            while True:
+                size = int((yield from self._read_line()).split(b";")[0], 16)
+                if not size:
+                    break
+                yield from self._read_body(size)
+                yield from self._read_line()
+            # trailers, up to the empty line that ends the response
+            while (yield from self._read_line()):
+                pass
+        elif "content-length" in self.headers:
+            yield from self._read_body(int(self.headers["content-length"]))
+        else:
+            # only the server closing the connection ends this body
+            yield from self._read_body(-1)
+            self._keep_alive = False
+        self._body_read = True
+        self.close()
+
+    def close(self):
+        # the connection can take another request once the body has been
+        # read to the end and the server keeps it open
+        if self._sock:
+            reusable = self._keep_alive and self._body_read and not self._pending
+            if self._release:
+                self._release(self._sock, reusable)
+            else:
+                self._sock.close()
+            self._sock = None
+
+
+def _split_url(url):
+    scheme, _, rest = url.partition("://")
+    host, _, path = rest.partition("/")
+    port = 443 if scheme == "https" else 80
+    if ":" in host:
+        host, port = host.split(":")
+        port = int(port)
+    return scheme, host, port, path
+
+
+class Session:
+    def __init__(self, pool, ssl_context, keep_alive=True):
+        self.pool = pool
+        self.ssl_context = ssl_context
+        self.keep_alive = keep_alive
+        self._idle = {}  # {(scheme, host, port): socket between requests}
+        self._tls_sessions = {}  # {(host, port): TLS session to resume}
+        self.requests = 0
+        self.connections = 0
+        self.handshakes = 0
+        self.resumed = 0  # handshakes that resumed a TLS session
+        # [host, status, ms to the headers] of every request, newest last
+        self.log = []
+
+    def _connect(self, scheme, host, port, timeout):
+        address = self.pool.getaddrinfo(host, port)[0][-1]
+        sock = self.pool.socket(self.pool.AF_INET, self.pool.SOCK_STREAM)
+        if hasattr(self.pool, "TCP_NODELAY"):
+            # the request would otherwise wait for the ACK of the last
+            # handshake message when a TLS session is resumed
+            sock.setsockopt(self.pool.IPPROTO_TCP, self.pool.TCP_NODELAY, 1)
+        if scheme == "https":
+            tls_session = self._tls_sessions.get((host, port))
+            if tls_session is None:
+                sock = self.ssl_context.wrap_socket(sock, server_hostname=host)
+            else:
+                sock = self.ssl_context.wrap_socket(
+                    sock, server_hostname=host, session=tls_session
+                )
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except BaseException:
+            sock.close()
+            raise
+        self.connections += 1
+        if scheme == "https":
+            self.handshakes += 1
+            if getattr(sock, "session_reused", False):
+                self.resumed += 1
+        return sock
+
+    def _request(self, sock, host, path, headers, timeout, chunk_size, release):
+        sock.settimeout(timeout)
+        request = "GET /%s HTTP/1.1\r\nHost: %s\r\n" % (path, host)
+        if not self.keep_alive:
+            request += "Connection: close\r\n"
+        for name, value in (headers or {}).items():
+            request += "%s: %s\r\n" % (name, value)
+        request = (request + "\r\n").encode("utf-8")
+        sent = 0
+        while sent < len(request):
+            sent += sock.send(request[sent:])
+
+        sock.settimeout(0)
+        response = Response(sock, timeout, chunk_size, release)
+        yield from response._read_head()
+        return response
+
+    def get(self, url, headers=None, timeout=10, chunk_size=256):
+        # sends the request and waits for the status line and headers,
+        # returning a Response whose body has not been read yet
+        scheme, host, port, path = _split_url(url)
+        key = (scheme, host, port)
+        started = time.monotonic()
+
+        def release(sock, reusable):
+            self._release(key, sock, reusable)
+
+        response = None
+        sock = self._idle.pop(key, None)
+        if sock is not None:
+            try:
+                response = yield from self._request(
+                    sock, host, path, headers, timeout, chunk_size, release
+                )
+            except OSError:
+                # the server closed the idle connection, try a new one
+                sock.close()
+        if response is None:
+            sock = self._connect(scheme, host, port, timeout)
+            try:
+                response = yield from self._request(
+                    sock, host, path, headers, timeout, chunk_size, release
+                )
+            except BaseException:
+                self._release(key, sock, False)
+                raise
+        self.requests += 1
+        self.log.append(
+            [host, response.status_code, int((time.monotonic() - started) * 1000)]
+        )
+        return response
+
+    def _release(self, key, sock, reusable):
+        # CPython's TLS 1.3 session tickets arrive with the response, so the
+        # session to resume is only known once it has been read
+        tls_session = getattr(sock, "session", None)
+        if tls_session is not None:
+            self._tls_sessions[key[1:]] = tls_session
+        if reusable and self.keep_alive and key not in self._idle:
+            self._idle[key] = sock
+        else:
+            sock.close()
+
+    def close(self):
+        # closes the connections kept for later requests
+        for sock in self._idle.values():
+            sock.close()
+        self._idle = {}
@@ -1,796 +1,191 @@
-activitypub = "\uf2f2"
-address_book_o = "\uf2ba"
-address_book = "\uf2b9"
-address_card_o = "\uf2bc"
-address_card = "\uf2bb"
-adjust = "\uf042"
-adn = "\uf170"
-align_center = "\uf037"
-align_justify = "\uf039"
-align_left = "\uf036"
-align_right = "\uf038"
-amazon = "\uf270"
-ambulance = "\uf0f9"
-american_sign_language_interpreting = "\uf2a3"
-anchor = "\uf13d"
-android = "\uf17b"
-angellist = "\uf209"
-angle_double_down = "\uf103"
-angle_double_left = "\uf100"
-angle_double_right = "\uf101"
-angle_double_up = "\uf102"
-angle_down = "\uf107"
-angle_left = "\uf104"
-angle_right = "\uf105"
-angle_up = "\uf106"
-apple = "\uf179"
-archive_org = "\uf2fc"
-archive = "\uf187"
-archlinux = "\uf323"
-area_chart = "\uf1fe"
-arrow_circle_down = "\uf0ab"
-arrow_circle_left = "\uf0a8"
-arrow_circle_o_down = "\uf01a"
-arrow_circle_o_left = "\uf190"
-arrow_circle_o_right = "\uf18e"
-arrow_circle_o_up = "\uf01b"
-arrow_circle_right = "\uf0a9"
-arrow_circle_up = "\uf0aa"
-arrow_down = "\uf063"
-arrow_left = "\uf060"
-arrow_right = "\uf061"
-arrows_alt = "\uf0b2"
-arrows_h = "\uf07e"
-arrows = "\uf047"
-arrows_v = "\uf07d"
-arrow_up = "\uf062"
-artstation = "\uf2ed"
-askfm = "\uf33a"
-assistive_listening_systems = "\uf2a2"
-asterisk = "\uf069"
-att = "\uf31e"
-at = "\uf1fa"
-audio_description = "\uf29e"
-backward = "\uf04a"
-balance_scale = "\uf24e"
-bandcamp = "\uf2d5"
-ban = "\uf05e"
-bar_chart = "\uf080"
-barcode = "\uf02a"
-bars = "\uf0c9"
-bath = "\uf2cd"
-battery_empty = "\uf244"
-battery_full = "\uf240"
-battery_half = "\uf242"
-battery_quarter = "\uf243"
-battery_three_quarters = "\uf241"
-bed = "\uf236"
-beer = "\uf0fc"
-behance_square = "\uf1b5"
-behance = "\uf1b4"
-bell_o = "\uf0f3"
-bell_ringing_o = "\uf330"
-bell_ringing = "\uf32d"
-bell_slash_o = "\uf1f7"
-bell_slash = "\uf1f6"
-bell = "\uf0a2"
-bicycle = "\uf206"
-binoculars = "\uf1e5"
-biometric = "\uf32b"
-birthday_cake = "\uf1fd"
-bitbucket_square = "\uf172"
-bitbucket = "\uf171"
-black_tie = "\uf27e"
-blind = "\uf29d"
-blockstack = "\uf33b"
-bluetooth_b = "\uf294"
-bluetooth = "\uf293"
-boardgamegeek = "\uf33c"
-bold = "\uf032"
-bolt = "\uf0e7"
-bomb = "\uf1e2"
-bookmark_o = "\uf097"
-bookmark = "\uf02e"
-book = "\uf02d"
-bootstrap = "\uf315"
-braille = "\uf2a1"
-briefcase = "\uf0b1"
-btc = "\uf15a"
-bug = "\uf188"
-building_o = "\uf0f7"
-building = "\uf1ad"
-bullhorn = "\uf0a1"
-bullseye = "\uf140"
-bunny = "\uf35f"
-bus = "\uf207"
-buymeacoffee = "\uf33d"
-buysellads = "\uf20d"
-calculator = "\uf1ec"
-calendar_check_o = "\uf274"
-calendar_minus_o = "\uf272"
-calendar_o = "\uf133"
-calendar_plus_o = "\uf271"
-calendar_times_o = "\uf273"
-calendar = "\uf073"
-camera_retro = "\uf083"
-camera = "\uf030"
-caret_down = "\uf0d7"
-caret_left = "\uf0d9"
-caret_right = "\uf0da"
-caret_square_o_down = "\uf150"
-caret_square_o_left = "\uf191"
-caret_square_o_right = "\uf152"
-caret_square_o_up = "\uf151"
-caret_up = "\uf0d8"
-cart_arrow_down = "\uf218"
-cart_plus = "\uf217"
-car = "\uf1b9"
-cc_amex = "\uf1f3"
-cc_by = "\uf33e"
-cc_cc = "\uf33f"
-cc_diners_club = "\uf24c"
-cc_discover = "\uf1f2"
-cc_jcb = "\uf24b"
-cc_mastercard = "\uf1f1"
-cc_nc_eu = "\uf341"
-cc_nc_jp = "\uf342"
-cc_nc = "\uf340"
-cc_nd = "\uf343"
-cc_paypal = "\uf1f4"
-cc_pd = "\uf344"
-cc_remix = "\uf345"
-cc_sa = "\uf346"
-cc_share = "\uf347"
-cc_stripe = "\uf1f5"
-cc = "\uf20a"
-cc_visa = "\uf1f0"
-cc_zero = "\uf348"
-certificate = "\uf0a3"
-chain_broken = "\uf127"
-check_circle_o = "\uf05d"
-check_circle = "\uf058"
-check_square_o = "\uf046"
-check_square = "\uf14a"
-check = "\uf00c"
-chevron_circle_down = "\uf13a"
-chevron_circle_left = "\uf137"
-chevron_circle_right = "\uf138"
-chevron_circle_up = "\uf139"
-chevron_down = "\uf078"
-chevron_left = "\uf053"
-chevron_right = "\uf054"
-chevron_up = "\uf077"
-child = "\uf1ae"
-chrome = "\uf268"
-circle_o_notch = "\uf1ce"
-circle_o = "\uf10c"
-circle_thin = "\uf1db"
-circle = "\uf111"
-classicpress_circle = "\uf332"
-classicpress = "\uf331"
-clipboard = "\uf0ea"
-clock_o = "\uf017"
-clone = "\uf24d"
-cloud_download = "\uf0ed"
-cloud = "\uf0c2"
-cloud_upload = "\uf0ee"
-code_fork = "\uf126"
-codepen = "\uf1cb"
-code = "\uf121"
-codiepie = "\uf284"
-coffee = "\uf0f4"
-cogs = "\uf085"
-cog = "\uf013"
-columns = "\uf0db"
-commenting_o = "\uf27b"
-commenting = "\uf27a"
-comment_o = "\uf0e5"
-comments_o = "\uf0e6"
-comments = "\uf086"
-comment = "\uf075"
-compass = "\uf14e"
-compress = "\uf066"
-connectdevelop = "\uf20e"
-contao = "\uf26d"
-conway_glider = "\uf349"
-copyright = "\uf1f9"
-creative_commons = "\uf25e"
-credit_card_alt = "\uf283"
-credit_card = "\uf09d"
-crop = "\uf125"
-crosshairs = "\uf05b"
-csharp = "\uf34a"
-css3 = "\uf13c"
-cubes = "\uf1b3"
-cube = "\uf1b2"
-c = "\uf31c"
-cutlery = "\uf0f5"
-dashcube = "\uf210"
-database = "\uf1c0"
-deaf = "\uf2a4"
-debian = "\uf2ff"
-delicious = "\uf1a5"
-desktop = "\uf108"
-deviantart = "\uf1bd"
-dev_to = "\uf316"
-diamond = "\uf219"
-diaspora = "\uf2e5"
-digg = "\uf1a6"
-digitalocean = "\uf31d"
-discord_alt = "\uf2ef"
-discord = "\uf2ee"
-dogmazic = "\uf303"
-dot_circle_o = "\uf192"
-download = "\uf019"
-dribbble = "\uf17d"
-dropbox = "\uf16b"
-drupal = "\uf1a9"
-edge = "\uf282"
-eercast = "\uf2da"
-eject = "\uf052"
-ellipsis_h = "\uf141"
-ellipsis_v = "\uf142"
-email_bulk_o = "\uf34c"
-email_bulk = "\uf34b"
-emby = "\uf319"
-empire = "\uf1d1"
-envelope_open_o = "\uf2b7"
-envelope_open = "\uf2b6"
-envelope_o = "\uf003"
-envelope_square = "\uf199"
-envelope = "\uf0e0"
-envira = "\uf299"
-eraser = "\uf12d"
-ethereum = "\uf2f3"
-etsy = "\uf2d7"
-eur = "\uf153"
-exchange = "\uf0ec"
-exclamation_circle = "\uf06a"
-exclamation_triangle = "\uf071"
-exclamation = "\uf12a"
-expand = "\uf065"
-expeditedssl = "\uf23e"
-external_link_square = "\uf14c"
-external_link = "\uf08e"
-eyedropper = "\uf1fb"
-eye_slash = "\uf070"
-eye = "\uf06e"
-facebook_messenger = "\uf2fe"
-facebook_official = "\uf230"
-facebook_square = "\uf082"
-facebook = "\uf09a"
-fast_backward = "\uf049"
-fast_forward = "\uf050"
-fax = "\uf1ac"
-f_droid = "\uf32a"
-female = "\uf182"
-ffmpeg = "\uf30f"
-fighter_jet = "\uf0fb"
-file_archive_o = "\uf1c6"
-file_audio_o = "\uf1c7"
-file_code_o = "\uf1c9"
-file_epub = "\uf321"
-file_excel_o = "\uf1c3"
-file_image_o = "\uf1c5"
-file_o = "\uf016"
-file_pdf_o = "\uf1c1"
-file_powerpoint_o = "\uf1c4"
-files_o = "\uf0c5"
-file_text_o = "\uf0f6"
-file_text = "\uf15c"
-file_ = "\uf15b"
-file_video_o = "\uf1c8"
-file_word_o = "\uf1c2"
-film = "\uf008"
-filter_ = "\uf0b0"
-fire_extinguisher = "\uf134"
-firefox = "\uf269"
-fire = "\uf06d"
-first_order = "\uf2b0"
-fivehundredpx = "\uf26e"
-flag_checkered = "\uf11e"
-flag_o = "\uf11d"
-flag = "\uf024"
-flask = "\uf0c3"
-flickr = "\uf16e"
-floppy_o = "\uf0c7"
-folder_open_o = "\uf115"
-folder_open = "\uf07c"
-folder_o = "\uf114"
-folder = "\uf07b"
-font_awesome = "\uf2b4"
-fonticons = "\uf280"
-font = "\uf031"
-fork_awesome = "\uf2e3"
-fort_awesome = "\uf286"
-forumbee = "\uf211"
-forward = "\uf04e"
-foursquare = "\uf180"
-free_code_camp = "\uf2c5"
-freedombox = "\uf2fd"
-friendica = "\uf2e6"
-frown_o = "\uf119"
-funkwhale = "\uf339"
-futbol_o = "\uf1e3"
-gamepad = "\uf11b"
-gavel = "\uf0e3"
-gbp = "\uf154"
-genderless = "\uf22d"
-get_pocket = "\uf265"
-gg_circle = "\uf261"
-gg = "\uf260"
-gift = "\uf06b"
-gimp = "\uf31b"
-gitea = "\uf31f"
-github_alt = "\uf113"
-github_square = "\uf092"
-github = "\uf09b"
-gitlab = "\uf296"
-git_square = "\uf1d2"
-git = "\uf1d3"
-glass = "\uf000"
-glide_g = "\uf2a6"
-glide = "\uf2a5"
-globe_e = "\uf304"
-globe = "\uf0ac"
-globe_w = "\uf305"
-gnupg = "\uf30d"
-gnu_social = "\uf2e7"
-gnu = "\uf34d"
-google_play = "\uf34e"
-google_plus_official = "\uf2b3"
-google_plus_square = "\uf0d4"
-google_plus = "\uf0d5"
-google = "\uf1a0"
-google_wallet = "\uf1ee"
-graduation_cap = "\uf19d"
-gratipay = "\uf184"
-grav = "\uf2d6"
-hackaday = "\uf30a"
-hacker_news = "\uf1d4"
-hackster = "\uf326"
-hal = "\uf333"
-hand_lizard_o = "\uf258"
-hand_o_down = "\uf0a7"
-hand_o_left = "\uf0a5"
-hand_o_right = "\uf0a4"
-hand_o_up = "\uf0a6"
-hand_paper_o = "\uf256"
-hand_peace_o = "\uf25b"
-hand_pointer_o = "\uf25a"
-hand_rock_o = "\uf255"
-hand_scissors_o = "\uf257"
-handshake_o = "\uf2b5"
-hand_spock_o = "\uf259"
-hashnode = "\uf317"
-hashtag = "\uf292"
-hdd_o = "\uf0a0"
-header = "\uf1dc"
-headphones = "\uf025"
-heartbeat = "\uf21e"
-heart_o = "\uf08a"
-heart = "\uf004"
-heroku = "\uf34f"
-history = "\uf1da"
-home_assistant = "\uf350"
-home = "\uf015"
-hospital_o = "\uf0f8"
-hourglass_end = "\uf253"
-hourglass_half = "\uf252"
-hourglass_o = "\uf250"
-hourglass_start = "\uf251"
-hourglass = "\uf254"
-houzz = "\uf27c"
-h_square = "\uf0fd"
-html5 = "\uf13b"
-hubzilla = "\uf2eb"
-i_cursor = "\uf246"
-id_badge = "\uf2c1"
-id_card_o = "\uf2c3"
-id_card = "\uf2c2"
-ils = "\uf20b"
-imdb = "\uf2d8"
-inbox = "\uf01c"
-indent = "\uf03c"
-industry = "\uf275"
-info_circle = "\uf05a"
-info = "\uf129"
-inkscape = "\uf312"
-inr = "\uf156"
-instagram = "\uf16d"
-internet_explorer = "\uf26b"
-ioxhost = "\uf208"
-italic = "\uf033"
-java = "\uf351"
-jirafeau = "\uf318"
-joomla = "\uf1aa"
-joplin = "\uf310"
-jpy = "\uf157"
-jsfiddle = "\uf1cc"
-julia = "\uf334"
-jupyter = "\uf335"
-keybase = "\uf2f4"
-keyboard_o = "\uf11c"
-key_modern = "\uf2f7"
-key = "\uf084"
-krw = "\uf159"
-language = "\uf1ab"
-laptop = "\uf109"
-laravel = "\uf30b"
-lastfm_square = "\uf203"
-lastfm = "\uf202"
-leaf = "\uf06c"
-leanpub = "\uf212"
-lemon_o = "\uf094"
-level_down = "\uf149"
-level_up = "\uf148"
-liberapay_square = "\uf2e8"
-liberapay = "\uf2e9"
-life_ring = "\uf1cd"
-lightbulb_o = "\uf0eb"
-line_chart = "\uf201"
-linkedin_square = "\uf08c"
-linkedin = "\uf0e1"
-link = "\uf0c1"
-linode = "\uf2b8"
-linux = "\uf17c"
-list_alt = "\uf022"
-list_ol = "\uf0cb"
-list_ = "\uf03a"
-list_ul = "\uf0ca"
-location_arrow = "\uf124"
-lock = "\uf023"
-long_arrow_down = "\uf175"
-long_arrow_left = "\uf177"
-long_arrow_right = "\uf178"
-long_arrow_up = "\uf176"
-low_vision = "\uf2a8"
-magic = "\uf0d0"
-magnet = "\uf076"
-male = "\uf183"
-map_marker = "\uf041"
-map_o = "\uf278"
-map_pin = "\uf276"
-map_signs = "\uf277"
-map_ = "\uf279"
-mariadb = "\uf352"
-markdown = "\uf353"
-mars_double = "\uf227"
-mars_stroke_h = "\uf22b"
-mars_stroke = "\uf229"
-mars_stroke_v = "\uf22a"
-mars = "\uf222"
-mastodon_alt = "\uf2e2"
-mastodon_square = "\uf300"
-mastodon = "\uf2e1"
-matrix_org = "\uf313"
-maxcdn = "\uf136"
-meanpath = "\uf20c"
-medium_square = "\uf2f8"
-medium = "\uf23a"
-medkit = "\uf0fa"
-meetup = "\uf2e0"
-meh_o = "\uf11a"
-mercury = "\uf223"
-microchip = "\uf2db"
-microphone_slash = "\uf131"
-microphone = "\uf130"
-minus_circle = "\uf056"
-minus_square_o = "\uf147"
-minus_square = "\uf146"
-minus = "\uf068"
-mixcloud = "\uf289"
-mobile = "\uf10b"
-modx = "\uf285"
-money = "\uf0d6"
-moon_o = "\uf186"
-moon = "\uf328"
-motorcycle = "\uf21c"
-mouse_pointer = "\uf245"
-music = "\uf001"
-mysql = "\uf354"
-neuter = "\uf22c"
-newspaper_o = "\uf1ea"
-nextcloud_square = "\uf307"
-nextcloud = "\uf306"
-nodejs = "\uf308"
-nordcast = "\uf355"
-object_group = "\uf247"
-object_ungroup = "\uf248"
-odnoklassniki_square = "\uf264"
-odnoklassniki = "\uf263"
-opencart = "\uf23d"
-open_collective = "\uf336"
-openid = "\uf19b"
-opera = "\uf26a"
-optin_monster = "\uf23c"
-orcid = "\uf337"
-outdent = "\uf03b"
-pagelines = "\uf18c"
-paint_brush = "\uf1fc"
-paperclip = "\uf0c6"
-paper_plane_o = "\uf1d9"
-paper_plane = "\uf1d8"
-paragraph = "\uf1dd"
-patreon = "\uf2f0"
-pause_circle_o = "\uf28c"
-pause_circle = "\uf28b"
-pause = "\uf04c"
-paw = "\uf1b0"
-paypal = "\uf1ed"
-peertube = "\uf2e4"
-pencil_square_o = "\uf044"
-pencil_square = "\uf14b"
-pencil = "\uf040"
-percent = "\uf295"
-phone_square = "\uf098"
-phone = "\uf095"
-php = "\uf30e"
-picture_o = "\uf03e"
-pie_chart = "\uf200"
-pinterest_p = "\uf231"
-pinterest_square = "\uf0d3"
-pinterest = "\uf0d2"
-pixelfed = "\uf314"
-plane = "\uf072"
-play_circle_o = "\uf01d"
-play_circle = "\uf144"
-play = "\uf04b"
-pleroma = "\uf324"
-plug = "\uf1e6"
-plume = "\uf356"
-plus_circle = "\uf055"
-plus_square_o = "\uf196"
-plus_square = "\uf0fe"
-plus = "\uf067"
-podcast = "\uf2ce"
-postgresql = "\uf357"
-power_off = "\uf011"
-print_ = "\uf02f"
-product_hunt = "\uf288"
-puzzle_piece = "\uf12e"
-python = "\uf322"
-qq = "\uf1d6"
-qrcode = "\uf029"
-question_circle_o = "\uf29c"
-question_circle = "\uf059"
-question = "\uf128"
-quora = "\uf2c4"
-quote_left = "\uf10d"
-quote_right = "\uf10e"
-random = "\uf074"
-ravelry = "\uf2d9"
-react = "\uf302"
-rebel = "\uf1d0"
-recycle = "\uf1b8"
-reddit_alien = "\uf281"
-reddit_square = "\uf1a2"
-reddit = "\uf1a1"
-refresh = "\uf021"
-registered = "\uf25d"
-renren = "\uf18b"
-repeat = "\uf01e"
-reply_all = "\uf122"
-reply = "\uf112"
-researchgate = "\uf338"
-retweet = "\uf079"
-road = "\uf018"
-rocket = "\uf135"
-rss_square = "\uf143"
-rss = "\uf09e"
-rub = "\uf158"
-safari = "\uf267"
-sass_alt = "\uf359"
-sass = "\uf358"
-scissors = "\uf0c4"
-scribd = "\uf28a"
-scuttlebutt = "\uf2ea"
-search_minus = "\uf010"
-search_plus = "\uf00e"
-search = "\uf002"
-sellsy = "\uf213"
-server = "\uf233"
-shaarli_o = "\uf2f6"
-shaarli = "\uf2f5"
-share_alt_square = "\uf1e1"
-share_alt = "\uf1e0"
-share_square_o = "\uf045"
-share_square = "\uf14d"
-share = "\uf064"
-shield = "\uf132"
-ship = "\uf21a"
-shirtsinbulk = "\uf214"
-shopping_bag = "\uf290"
-shopping_basket = "\uf291"
-shopping_cart = "\uf07a"
-shower = "\uf2cc"
-signalapp = "\uf30c"
-signal = "\uf012"
-sign_in = "\uf090"
-sign_language = "\uf2a7"
-sign_out = "\uf08b"
-simplybuilt = "\uf215"
-sitemap = "\uf0e8"
-skate = "\uf35a"
-sketchfab = "\uf35b"
-skyatlas = "\uf216"
-skype = "\uf17e"
-slack = "\uf198"
-sliders = "\uf1de"
-slideshare = "\uf1e7"
-smile_o = "\uf118"
-snapchat_ghost = "\uf2ac"
-snapchat_square = "\uf2ad"
-snapchat = "\uf2ab"
-snowdrift = "\uf2f1"
-snowflake_o = "\uf2dc"
-social_home = "\uf2ec"
-sort_alpha_asc = "\uf15d"
-sort_alpha_desc = "\uf15e"
-sort_amount_asc = "\uf160"
-sort_amount_desc = "\uf161"
-sort_asc = "\uf0de"
-sort_desc = "\uf0dd"
-sort_numeric_asc = "\uf162"
-sort_numeric_desc = "\uf163"
-sort = "\uf0dc"
-soundcloud = "\uf1be"
-space_shuttle = "\uf197"
-spell_check = "\uf327"
-spinner = "\uf110"
-spoon = "\uf1b1"
-spotify = "\uf1bc"
-square_o = "\uf096"
-square = "\uf0c8"
-stack_exchange = "\uf18d"
-stack_overflow = "\uf16c"
-star_half_o = "\uf123"
-star_half = "\uf089"
-star_o = "\uf006"
-star = "\uf005"
-steam_square = "\uf1b7"
-steam = "\uf1b6"
-step_backward = "\uf048"
-step_forward = "\uf051"
-stethoscope = "\uf0f1"
-sticky_note_o = "\uf24a"
-sticky_note = "\uf249"
-stop_circle_o = "\uf28e"
-stop_circle = "\uf28d"
-stop = "\uf04d"
-street_view = "\uf21d"
-strikethrough = "\uf0cc"
-stumbleupon_circle = "\uf1a3"
-stumbleupon = "\uf1a4"
-subscript = "\uf12c"
-subway = "\uf239"
-suitcase = "\uf0f2"
-sun_o = "\uf185"
-sun = "\uf329"
-superpowers = "\uf2dd"
-superscript = "\uf12b"
-syncthing = "\uf311"
-tablet = "\uf10a"
-table = "\uf0ce"
-tachometer = "\uf0e4"
-tags = "\uf02c"
-tag = "\uf02b"
-tasks = "\uf0ae"
-taxi = "\uf1ba"
-telegram = "\uf2c6"
-television = "\uf26c"
-tencent_weibo = "\uf1d5"
-terminal = "\uf120"
-text_height = "\uf034"
-textpattern = "\uf35d"
-text_width = "\uf035"
-tex = "\uf35c"
-themeisle = "\uf2b2"
-thermometer_empty = "\uf2cb"
-thermometer_full = "\uf2c7"
-thermometer_half = "\uf2c9"
-thermometer_quarter = "\uf2ca"
-thermometer_three_quarters = "\uf2c8"
-th_large = "\uf009"
-th_list = "\uf00b"
-th = "\uf00a"
-thumbs_down = "\uf165"
-thumbs_o_down = "\uf088"
-thumbs_o_up = "\uf087"
-thumbs_up = "\uf164"
-thumb_tack = "\uf08d"
-ticket = "\uf145"
-times_circle_o = "\uf05c"
-times_circle = "\uf057"
-times = "\uf00d"
-tint = "\uf043"
-tipeee = "\uf301"
-toggle_off = "\uf204"
-toggle_on = "\uf205"
-tor_onion = "\uf32e"
-trademark = "\uf25c"
-train = "\uf238"
-transgender_alt = "\uf225"
-transgender = "\uf224"
-trash_o = "\uf014"
-trash = "\uf1f8"
-tree = "\uf1bb"
-trello = "\uf181"
-tripadvisor = "\uf262"
-trophy = "\uf091"
-truck = "\uf0d1"
-try_ = "\uf195"
-tty = "\uf1e4"
-tumblr_square = "\uf174"
-tumblr = "\uf173"
-twitch = "\uf1e8"
-twitter_square = "\uf081"
-twitter = "\uf099"
-umbrella = "\uf0e9"
-underline = "\uf0cd"
-undo = "\uf0e2"
-unity = "\uf35e"
-universal_access = "\uf29a"
-university = "\uf19c"
-unlock_alt = "\uf13e"
-unlock = "\uf09c"
-unsplash = "\uf325"
-upload = "\uf093"
-usb = "\uf287"
-usd = "\uf155"
-user_circle_o = "\uf2be"
-user_circle = "\uf2bd"
-user_md = "\uf0f0"
-user_o = "\uf2c0"
-user_plus = "\uf234"
-user_secret = "\uf21b"
-users = "\uf0c0"
-user_times = "\uf235"
-user = "\uf007"
-venus_double = "\uf226"
-venus_mars = "\uf228"
-venus = "\uf221"
-viacoin = "\uf237"
-viadeo_square = "\uf2aa"
-viadeo = "\uf2a9"
-video_camera = "\uf03d"
-vimeo_square = "\uf194"
-vimeo = "\uf27d"
-vine = "\uf1ca"
-vk = "\uf189"
-volume_control_phone = "\uf2a0"
-volume_down = "\uf027"
-volume_mute = "\uf32f"
-volume_off = "\uf026"
-volume_up = "\uf028"
-weibo = "\uf18a"
-weixin = "\uf1d7"
-whatsapp = "\uf232"
-wheelchair_alt = "\uf29b"
-wheelchair = "\uf193"
-wifi = "\uf1eb"
-wikidata = "\uf31a"
-wikipedia_w = "\uf266"
-window_close_o = "\uf2d4"
-window_close = "\uf2d3"
-window_maximize = "\uf2d0"
-window_minimize = "\uf2d1"
-window_restore = "\uf2d2"
-windows = "\uf17a"
-wire = "\uf32c"
-wordpress = "\uf19a"
-wpbeginner = "\uf297"
-wpexplorer = "\uf2de"
-wpforms = "\uf298"
-wrench = "\uf0ad"
-xing_square = "\uf169"
-xing = "\uf168"
-xmpp = "\uf2f9"
-yahoo = "\uf19e"
-y_combinator = "\uf23b"
-yelp = "\uf1e9"
-yoast = "\uf2b1"
-youtube_play = "\uf16a"
-youtube_square = "\uf166"
-youtube = "\uf167"
-zotero = "\uf309"
\ No newline at end of file
+# Fork Awesome icons by name, for the forkawesome-12 font: icons.arrow_down
+#
+# The names are one sorted, space separated string and _CODES holds the icon
+# at the same position, so importing this module creates two strings instead
+# of one object per icon. The icon string is only made when a name is used.
+
+_NAMES = (
+    " activitypub address_book address_book_o address_card address_card_o adjust "
+    "adn align_center align_justify align_left align_right amazon ambulance "
+    "american_sign_language_interpreting anchor android angellist "
+    "angle_double_down angle_double_left angle_double_right angle_double_up "
+    "angle_down angle_left angle_right angle_up apple archive archive_org "
+    "archlinux area_chart arrow_circle_down arrow_circle_left arrow_circle_o_down "
+    "arrow_circle_o_left arrow_circle_o_right arrow_circle_o_up arrow_circle_right "
+    "arrow_circle_up arrow_down arrow_left arrow_right arrow_up arrows arrows_alt "
+    "arrows_h arrows_v artstation askfm assistive_listening_systems asterisk at "
+    "att audio_description backward balance_scale ban bandcamp bar_chart barcode "
+    "bars bath battery_empty battery_full battery_half battery_quarter "
+    "battery_three_quarters bed beer behance behance_square bell bell_o "
+    "bell_ringing bell_ringing_o bell_slash bell_slash_o bicycle binoculars "
+    "biometric birthday_cake bitbucket bitbucket_square black_tie blind blockstack "
+    "bluetooth bluetooth_b boardgamegeek bold bolt bomb book bookmark bookmark_o "
+    "bootstrap braille briefcase btc bug building building_o bullhorn bullseye "
+    "bunny bus buymeacoffee buysellads c calculator calendar calendar_check_o "
+    "calendar_minus_o calendar_o calendar_plus_o calendar_times_o camera "
+    "camera_retro car caret_down caret_left caret_right caret_square_o_down "
+    "caret_square_o_left caret_square_o_right caret_square_o_up caret_up "
+    "cart_arrow_down cart_plus cc cc_amex cc_by cc_cc cc_diners_club cc_discover "
+    "cc_jcb cc_mastercard cc_nc cc_nc_eu cc_nc_jp cc_nd cc_paypal cc_pd cc_remix "
+    "cc_sa cc_share cc_stripe cc_visa cc_zero certificate chain_broken check "
+    "check_circle check_circle_o check_square check_square_o chevron_circle_down "
+    "chevron_circle_left chevron_circle_right chevron_circle_up chevron_down "
+    "chevron_left chevron_right chevron_up child chrome circle circle_o "
+    "circle_o_notch circle_thin classicpress classicpress_circle clipboard clock_o "
+    "clone cloud cloud_download cloud_upload code code_fork codepen codiepie "
+    "coffee cog cogs columns comment comment_o commenting commenting_o comments "
+    "comments_o compass compress connectdevelop contao conway_glider copyright "
+    "creative_commons credit_card credit_card_alt crop crosshairs csharp css3 cube "
+    "cubes cutlery dashcube database deaf debian delicious desktop dev_to "
+    "deviantart diamond diaspora digg digitalocean discord discord_alt dogmazic "
+    "dot_circle_o download dribbble dropbox drupal edge eercast eject ellipsis_h "
+    "ellipsis_v email_bulk email_bulk_o emby empire envelope envelope_o "
+    "envelope_open envelope_open_o envelope_square envira eraser ethereum etsy eur "
+    "exchange exclamation exclamation_circle exclamation_triangle expand "
+    "expeditedssl external_link external_link_square eye eye_slash eyedropper "
+    "f_droid facebook facebook_messenger facebook_official facebook_square "
+    "fast_backward fast_forward fax female ffmpeg fighter_jet file_ file_archive_o "
+    "file_audio_o file_code_o file_epub file_excel_o file_image_o file_o "
+    "file_pdf_o file_powerpoint_o file_text file_text_o file_video_o file_word_o "
+    "files_o film filter_ fire fire_extinguisher firefox first_order fivehundredpx "
+    "flag flag_checkered flag_o flask flickr floppy_o folder folder_o folder_open "
+    "folder_open_o font font_awesome fonticons fork_awesome fort_awesome forumbee "
+    "forward foursquare free_code_camp freedombox friendica frown_o funkwhale "
+    "futbol_o gamepad gavel gbp genderless get_pocket gg gg_circle gift gimp git "
+    "git_square gitea github github_alt github_square gitlab glass glide glide_g "
+    "globe globe_e globe_w gnu gnu_social gnupg google google_play google_plus "
+    "google_plus_official google_plus_square google_wallet graduation_cap gratipay "
+    "grav h_square hackaday hacker_news hackster hal hand_lizard_o hand_o_down "
+    "hand_o_left hand_o_right hand_o_up hand_paper_o hand_peace_o hand_pointer_o "
+    "hand_rock_o hand_scissors_o hand_spock_o handshake_o hashnode hashtag hdd_o "
+    "header headphones heart heart_o heartbeat heroku history home home_assistant "
+    "hospital_o hourglass hourglass_end hourglass_half hourglass_o hourglass_start "
+    "houzz html5 hubzilla i_cursor id_badge id_card id_card_o ils imdb inbox "
+    "indent industry info info_circle inkscape inr instagram internet_explorer "
+    "ioxhost italic java jirafeau joomla joplin jpy jsfiddle julia jupyter key "
+    "key_modern keybase keyboard_o krw language laptop laravel lastfm "
+    "lastfm_square leaf leanpub lemon_o level_down level_up liberapay "
+    "liberapay_square life_ring lightbulb_o line_chart link linkedin "
+    "linkedin_square linode linux list_ list_alt list_ol list_ul location_arrow "
+    "lock long_arrow_down long_arrow_left long_arrow_right long_arrow_up "
+    "low_vision magic magnet male map_ map_marker map_o map_pin map_signs mariadb "
+    "markdown mars mars_double mars_stroke mars_stroke_h mars_stroke_v mastodon "
+    "mastodon_alt mastodon_square matrix_org maxcdn meanpath medium medium_square "
+    "medkit meetup meh_o mercury microchip microphone microphone_slash minus "
+    "minus_circle minus_square minus_square_o mixcloud mobile modx money moon "
+    "moon_o motorcycle mouse_pointer music mysql neuter newspaper_o nextcloud "
+    "nextcloud_square nodejs nordcast object_group object_ungroup odnoklassniki "
+    "odnoklassniki_square open_collective opencart openid opera optin_monster "
+    "orcid outdent pagelines paint_brush paper_plane paper_plane_o paperclip "
+    "paragraph patreon pause pause_circle pause_circle_o paw paypal peertube "
+    "pencil pencil_square pencil_square_o percent phone phone_square php picture_o "
+    "pie_chart pinterest pinterest_p pinterest_square pixelfed plane play "
+    "play_circle play_circle_o pleroma plug plume plus plus_circle plus_square "
+    "plus_square_o podcast postgresql power_off print_ product_hunt puzzle_piece "
+    "python qq qrcode question question_circle question_circle_o quora quote_left "
+    "quote_right random ravelry react rebel recycle reddit reddit_alien "
+    "reddit_square refresh registered renren repeat reply reply_all researchgate "
+    "retweet road rocket rss rss_square rub safari sass sass_alt scissors scribd "
+    "scuttlebutt search search_minus search_plus sellsy server shaarli shaarli_o "
+    "share share_alt share_alt_square share_square share_square_o shield ship "
+    "shirtsinbulk shopping_bag shopping_basket shopping_cart shower sign_in "
+    "sign_language sign_out signal signalapp simplybuilt sitemap skate sketchfab "
+    "skyatlas skype slack sliders slideshare smile_o snapchat snapchat_ghost "
+    "snapchat_square snowdrift snowflake_o social_home sort sort_alpha_asc "
+    "sort_alpha_desc sort_amount_asc sort_amount_desc sort_asc sort_desc "
+    "sort_numeric_asc sort_numeric_desc soundcloud space_shuttle spell_check "
+    "spinner spoon spotify square square_o stack_exchange stack_overflow star "
+    "star_half star_half_o star_o steam steam_square step_backward step_forward "
+    "stethoscope sticky_note sticky_note_o stop stop_circle stop_circle_o "
+    "street_view strikethrough stumbleupon stumbleupon_circle subscript subway "
+    "suitcase sun sun_o superpowers superscript syncthing table tablet tachometer "
+    "tag tags tasks taxi telegram television tencent_weibo terminal tex "
+    "text_height text_width textpattern th th_large th_list themeisle "
+    "thermometer_empty thermometer_full thermometer_half thermometer_quarter "
+    "thermometer_three_quarters thumb_tack thumbs_down thumbs_o_down thumbs_o_up "
+    "thumbs_up ticket times times_circle times_circle_o tint tipeee toggle_off "
+    "toggle_on tor_onion trademark train transgender transgender_alt trash trash_o "
+    "tree trello tripadvisor trophy truck try_ tty tumblr tumblr_square twitch "
+    "twitter twitter_square umbrella underline undo unity universal_access "
+    "university unlock unlock_alt unsplash upload usb usd user user_circle "
+    "user_circle_o user_md user_o user_plus user_secret user_times users venus "
+    "venus_double venus_mars viacoin viadeo viadeo_square video_camera vimeo "
+    "vimeo_square vine vk volume_control_phone volume_down volume_mute volume_off "
+    "volume_up weibo weixin whatsapp wheelchair wheelchair_alt wifi wikidata "
+    "wikipedia_w window_close window_close_o window_maximize window_minimize "
+    "window_restore windows wire wordpress wpbeginner wpexplorer wpforms wrench "
+    "xing xing_square xmpp y_combinator yahoo yelp yoast youtube youtube_play "
+    "youtube_square zotero "
+)
+
+_CODES = (
+    "\uf2f2\uf2b9\uf2ba\uf2bb\uf2bc\uf042\uf170\uf037\uf039\uf036\uf038\uf270\uf0f9"
+    "\uf2a3\uf13d\uf17b\uf209\uf103\uf100\uf101\uf102\uf107\uf104\uf105\uf106\uf179"
+    "\uf187\uf2fc\uf323\uf1fe\uf0ab\uf0a8\uf01a\uf190\uf18e\uf01b\uf0a9\uf0aa\uf063"
+    "\uf060\uf061\uf062\uf047\uf0b2\uf07e\uf07d\uf2ed\uf33a\uf2a2\uf069\uf1fa\uf31e"
+    "\uf29e\uf04a\uf24e\uf05e\uf2d5\uf080\uf02a\uf0c9\uf2cd\uf244\uf240\uf242\uf243"
+    "\uf241\uf236\uf0fc\uf1b4\uf1b5\uf0a2\uf0f3\uf32d\uf330\uf1f6\uf1f7\uf206\uf1e5"
+    "\uf32b\uf1fd\uf171\uf172\uf27e\uf29d\uf33b\uf293\uf294\uf33c\uf032\uf0e7\uf1e2"
+    "\uf02d\uf02e\uf097\uf315\uf2a1\uf0b1\uf15a\uf188\uf1ad\uf0f7\uf0a1\uf140\uf35f"
+    "\uf207\uf33d\uf20d\uf31c\uf1ec\uf073\uf274\uf272\uf133\uf271\uf273\uf030\uf083"
+    "\uf1b9\uf0d7\uf0d9\uf0da\uf150\uf191\uf152\uf151\uf0d8\uf218\uf217\uf20a\uf1f3"
+    "\uf33e\uf33f\uf24c\uf1f2\uf24b\uf1f1\uf340\uf341\uf342\uf343\uf1f4\uf344\uf345"
+    "\uf346\uf347\uf1f5\uf1f0\uf348\uf0a3\uf127\uf00c\uf058\uf05d\uf14a\uf046\uf13a"
+    "\uf137\uf138\uf139\uf078\uf053\uf054\uf077\uf1ae\uf268\uf111\uf10c\uf1ce\uf1db"
+    "\uf331\uf332\uf0ea\uf017\uf24d\uf0c2\uf0ed\uf0ee\uf121\uf126\uf1cb\uf284\uf0f4"
+    "\uf013\uf085\uf0db\uf075\uf0e5\uf27a\uf27b\uf086\uf0e6\uf14e\uf066\uf20e\uf26d"
+    "\uf349\uf1f9\uf25e\uf09d\uf283\uf125\uf05b\uf34a\uf13c\uf1b2\uf1b3\uf0f5\uf210"
+    "\uf1c0\uf2a4\uf2ff\uf1a5\uf108\uf316\uf1bd\uf219\uf2e5\uf1a6\uf31d\uf2ee\uf2ef"
+    "\uf303\uf192\uf019\uf17d\uf16b\uf1a9\uf282\uf2da\uf052\uf141\uf142\uf34b\uf34c"
+    "\uf319\uf1d1\uf0e0\uf003\uf2b6\uf2b7\uf199\uf299\uf12d\uf2f3\uf2d7\uf153\uf0ec"
+    "\uf12a\uf06a\uf071\uf065\uf23e\uf08e\uf14c\uf06e\uf070\uf1fb\uf32a\uf09a\uf2fe"
+    "\uf230\uf082\uf049\uf050\uf1ac\uf182\uf30f\uf0fb\uf15b\uf1c6\uf1c7\uf1c9\uf321"
+    "\uf1c3\uf1c5\uf016\uf1c1\uf1c4\uf15c\uf0f6\uf1c8\uf1c2\uf0c5\uf008\uf0b0\uf06d"
+    "\uf134\uf269\uf2b0\uf26e\uf024\uf11e\uf11d\uf0c3\uf16e\uf0c7\uf07b\uf114\uf07c"
+    "\uf115\uf031\uf2b4\uf280\uf2e3\uf286\uf211\uf04e\uf180\uf2c5\uf2fd\uf2e6\uf119"
+    "\uf339\uf1e3\uf11b\uf0e3\uf154\uf22d\uf265\uf260\uf261\uf06b\uf31b\uf1d3\uf1d2"
+    "\uf31f\uf09b\uf113\uf092\uf296\uf000\uf2a5\uf2a6\uf0ac\uf304\uf305\uf34d\uf2e7"
+    "\uf30d\uf1a0\uf34e\uf0d5\uf2b3\uf0d4\uf1ee\uf19d\uf184\uf2d6\uf0fd\uf30a\uf1d4"
+    "\uf326\uf333\uf258\uf0a7\uf0a5\uf0a4\uf0a6\uf256\uf25b\uf25a\uf255\uf257\uf259"
+    "\uf2b5\uf317\uf292\uf0a0\uf1dc\uf025\uf004\uf08a\uf21e\uf34f\uf1da\uf015\uf350"
+    "\uf0f8\uf254\uf253\uf252\uf250\uf251\uf27c\uf13b\uf2eb\uf246\uf2c1\uf2c2\uf2c3"
+    "\uf20b\uf2d8\uf01c\uf03c\uf275\uf129\uf05a\uf312\uf156\uf16d\uf26b\uf208\uf033"
+    "\uf351\uf318\uf1aa\uf310\uf157\uf1cc\uf334\uf335\uf084\uf2f7\uf2f4\uf11c\uf159"
+    "\uf1ab\uf109\uf30b\uf202\uf203\uf06c\uf212\uf094\uf149\uf148\uf2e9\uf2e8\uf1cd"
+    "\uf0eb\uf201\uf0c1\uf0e1\uf08c\uf2b8\uf17c\uf03a\uf022\uf0cb\uf0ca\uf124\uf023"
+    "\uf175\uf177\uf178\uf176\uf2a8\uf0d0\uf076\uf183\uf279\uf041\uf278\uf276\uf277"
+    "\uf352\uf353\uf222\uf227\uf229\uf22b\uf22a\uf2e1\uf2e2\uf300\uf313\uf136\uf20c"
+    "\uf23a\uf2f8\uf0fa\uf2e0\uf11a\uf223\uf2db\uf130\uf131\uf068\uf056\uf146\uf147"
+    "\uf289\uf10b\uf285\uf0d6\uf328\uf186\uf21c\uf245\uf001\uf354\uf22c\uf1ea\uf306"
+    "\uf307\uf308\uf355\uf247\uf248\uf263\uf264\uf336\uf23d\uf19b\uf26a\uf23c\uf337"
+    "\uf03b\uf18c\uf1fc\uf1d8\uf1d9\uf0c6\uf1dd\uf2f0\uf04c\uf28b\uf28c\uf1b0\uf1ed"
+    "\uf2e4\uf040\uf14b\uf044\uf295\uf095\uf098\uf30e\uf03e\uf200\uf0d2\uf231\uf0d3"
+    "\uf314\uf072\uf04b\uf144\uf01d\uf324\uf1e6\uf356\uf067\uf055\uf0fe\uf196\uf2ce"
+    "\uf357\uf011\uf02f\uf288\uf12e\uf322\uf1d6\uf029\uf128\uf059\uf29c\uf2c4\uf10d"
+    "\uf10e\uf074\uf2d9\uf302\uf1d0\uf1b8\uf1a1\uf281\uf1a2\uf021\uf25d\uf18b\uf01e"
+    "\uf112\uf122\uf338\uf079\uf018\uf135\uf09e\uf143\uf158\uf267\uf358\uf359\uf0c4"
+    "\uf28a\uf2ea\uf002\uf010\uf00e\uf213\uf233\uf2f5\uf2f6\uf064\uf1e0\uf1e1\uf14d"
+    "\uf045\uf132\uf21a\uf214\uf290\uf291\uf07a\uf2cc\uf090\uf2a7\uf08b\uf012\uf30c"
+    "\uf215\uf0e8\uf35a\uf35b\uf216\uf17e\uf198\uf1de\uf1e7\uf118\uf2ab\uf2ac\uf2ad"
+    "\uf2f1\uf2dc\uf2ec\uf0dc\uf15d\uf15e\uf160\uf161\uf0de\uf0dd\uf162\uf163\uf1be"
+    "\uf197\uf327\uf110\uf1b1\uf1bc\uf0c8\uf096\uf18d\uf16c\uf005\uf089\uf123\uf006"
+    "\uf1b6\uf1b7\uf048\uf051\uf0f1\uf249\uf24a\uf04d\uf28d\uf28e\uf21d\uf0cc\uf1a4"
+    "\uf1a3\uf12c\uf239\uf0f2\uf329\uf185\uf2dd\uf12b\uf311\uf0ce\uf10a\uf0e4\uf02b"
+    "\uf02c\uf0ae\uf1ba\uf2c6\uf26c\uf1d5\uf120\uf35c\uf034\uf035\uf35d\uf00a\uf009"
+    "\uf00b\uf2b2\uf2cb\uf2c7\uf2c9\uf2ca\uf2c8\uf08d\uf165\uf088\uf087\uf164\uf145"
+    "\uf00d\uf057\uf05c\uf043\uf301\uf204\uf205\uf32e\uf25c\uf238\uf224\uf225\uf1f8"
+    "\uf014\uf1bb\uf181\uf262\uf091\uf0d1\uf195\uf1e4\uf173\uf174\uf1e8\uf099\uf081"
+    "\uf0e9\uf0cd\uf0e2\uf35e\uf29a\uf19c\uf09c\uf13e\uf325\uf093\uf287\uf155\uf007"
+    "\uf2bd\uf2be\uf0f0\uf2c0\uf234\uf21b\uf235\uf0c0\uf221\uf226\uf228\uf237\uf2a9"
+    "\uf2aa\uf03d\uf27d\uf194\uf1ca\uf189\uf2a0\uf027\uf32f\uf026\uf028\uf18a\uf1d7"
+    "\uf232\uf193\uf29b\uf1eb\uf31a\uf266\uf2d3\uf2d4\uf2d0\uf2d1\uf2d2\uf17a\uf32c"
+    "\uf19a\uf297\uf2de\uf298\uf0ad\uf168\uf169\uf2f9\uf23b\uf19e\uf1e9\uf2b1\uf167"
+    "\uf16a\uf166\uf309"
+)
+
+
+def __getattr__(name):
+    position = _NAMES.find(" " + name + " ")
+    if position == -1:
+        raise AttributeError(name)
+    return _CODES[_NAMES.count(" ", 0, position)]
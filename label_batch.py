@@ -0,0 +1,21 @@
+# Batched text updates for the MagTag's text labels.
+#
+# set_texts() takes the text of every label in one call and passes only the
+# ones that changed to the public magtag.set_text(), with auto_refresh off
+# so the panel is refreshed once afterwards. It compares with the texts it
+# set before: every label starts out empty after a deep sleep, so on a wake
+# that saves the labels left empty, on later calls in the same wake all
+# the unchanged ones.
+_shown = {}
+
+
+def set_texts(magtag, texts):
+    # texts maps label index -> text, returns the indices that changed
+    changed = []
+    for index, text in texts.items():
+        if _shown.get(index, "") == text:
+            continue
+        magtag.set_text(text, index, auto_refresh=False)
+        _shown[index] = text
+        changed.append(index)
+    return changed
@@ -0,0 +1,152 @@
+# Where everything goes on the MagTag's screen and what it says. Shared by
+# code.py, which draws it with labels, and tools/render_screen.py, which
+# draws it on the desktop for trackers that only show a finished image.
+import covid_values
+import icons
+import sparkline
+
+LINE_HEIGHT = 20
+
+LINE_1_Y_POSITION = 10
+LINE_2_Y_POSITION = LINE_1_Y_POSITION + LINE_HEIGHT
+LINE_3_Y_POSITION = LINE_2_Y_POSITION + LINE_HEIGHT
+# the metrics of covid_values.METRICS get a line each from here down, the
+# panel has room for three
+METRIC_LINES_Y_POSITION = LINE_3_Y_POSITION + LINE_HEIGHT
+
+LEFT_ALIGN_X_POSITION = 10
+AFTER_ICON_TEXT_X_POSITION = 30
+
+SECOND_COLUMN_Y_LINE_1_POSITION = 20
+SECOND_COLUMN_X_POSITION = 245
+SECOND_COLUMN_Y_GAP = 40
+
+# below the last called time, clear of the longer first column labels
+SPARKLINE_Y_POSITION = 36
+SPARKLINE_WIDTH = 46
+SPARKLINE_HEIGHT = 22
+
+# fixed text of the labels, the {} fields are filled in by label_texts
+DATE_FORMAT = "As of: {}"
+COMMUNITY_LEVEL_FORMAT = "Community Level: {}"
+LABEL_FORMATS = (DATE_FORMAT, COMMUNITY_LEVEL_FORMAT) + tuple(
+    metric[3] for metric in covid_values.METRICS
+)
+# label indexes: the text labels come first, then the icons
+LAST_CALLED_LABEL = 3 + len(covid_values.METRICS)
+FIRST_ICON_LABEL = LAST_CALLED_LABEL + 1
+# characters the CDC values put into those fields: formatted numbers, the
+# date, the last called time and the community levels
+VALUE_GLYPHS = "0123456789,.%+-/: LowMediumHigh"
+
+
+def metric_line_y(line):
+    return METRIC_LINES_Y_POSITION + line * LINE_HEIGHT
+
+
+def add_labels(magtag):
+    # one label per step, add_text loads the font file on first use
+
+    # As of date
+    magtag.add_text(
+        text_font="/fonts/Arial-Bold-12.pcf",
+        text_position=(LEFT_ALIGN_X_POSITION, LINE_1_Y_POSITION),
+        is_data=False,
+    )
+    yield
+
+    # County
+    magtag.add_text(
+        text_font="/fonts/Arial-Bold-12.pcf",
+        text_position=(LEFT_ALIGN_X_POSITION, LINE_2_Y_POSITION),
+        is_data=False,
+    )
+    yield
+
+    # Community Level
+    magtag.add_text(
+        text_font="/fonts/Arial-Bold-12.pcf",
+        text_position=(AFTER_ICON_TEXT_X_POSITION, LINE_3_Y_POSITION),
+        is_data=False,
+    )
+    yield
+
+    # Metrics
+    for line in range(len(covid_values.METRICS)):
+        magtag.add_text(
+            text_font="/fonts/Arial-Bold-12.pcf",
+            text_position=(AFTER_ICON_TEXT_X_POSITION, metric_line_y(line)),
+            is_data=False,
+        )
+        yield
+
+    # when was the API last called
+    magtag.add_text(
+        text_font="/fonts/Arial-Bold-12.pcf",
+        text_position=(SECOND_COLUMN_X_POSITION, SECOND_COLUMN_Y_LINE_1_POSITION),
+        line_spacing=0.75,
+        is_data=False,
+    )
+    yield
+
+    # Community Levels
+    magtag.add_text(
+        text_font="/fonts/forkawesome-12.pcf",
+        text_position=(LEFT_ALIGN_X_POSITION, LINE_3_Y_POSITION),
+        is_data=False,
+    )
+    yield
+
+    # Metric Icons
+    for line in range(len(covid_values.METRICS)):
+        magtag.add_text(
+            text_font="/fonts/forkawesome-12.pcf",
+            text_position=(LEFT_ALIGN_X_POSITION, metric_line_y(line)),
+            is_data=False,
+        )
+        yield
+
+
+def direction_icon(direction_text):
+    icon = ""
+    if direction_text == "up":
+        icon = icons.chevron_circle_up
+    elif direction_text == "down":
+        icon = icons.arrow_down
+    else:
+        icon = icons.circle_o
+    return icon
+
+
+def capitalize(input_string):
+    output = ""
+    if len(input_string) > 0:
+        output = input_string[0].upper() + input_string[1:].lower()
+    return output
+
+
+def label_texts(values):
+    # the text of every label, in the order they were added
+    texts = [
+        DATE_FORMAT.format(values.get("date_updated")),
+        f"{values.get('county')}",
+        COMMUNITY_LEVEL_FORMAT.format(capitalize(values.get("community_level"))),
+    ]
+    for name, _, _, label_format in covid_values.METRICS:
+        texts.append(
+            label_format.format(values.get(name), values.get(name + "_pct_change"))
+        )
+    texts.append(f"{values['api_last_called']}")
+    texts.append(direction_icon(values.get("community_level_direction")))
+    for name, _, _, _ in covid_values.METRICS:
+        texts.append(direction_icon(values.get(name + "_direction")))
+    return tuple(texts)
+
+
+def sparkline_chart():
+    return sparkline.Sparkline(
+        SECOND_COLUMN_X_POSITION,
+        SPARKLINE_Y_POSITION,
+        SPARKLINE_WIDTH,
+        SPARKLINE_HEIGHT,
+    )
@@ -0,0 +1,155 @@
+# Binary form of the values tools/aggregator.py computes for each county, so
+# the MagTag decodes numbers with struct instead of parsing JSON text.
+#
+# A payload is a header (magic, VERSION, metric count, record count)
+# followed by fixed size records. Strings are UTF-8 padded with zero bytes,
+# county names longer than COUNTY_BYTES are cut between characters,
+# directions are -1 for down, 1 for up and 0 for neither, the community
+# level is its index in covid_values.LEVELS or -1, and the sparkline is a
+# count followed by SPARKLINE_LENGTH floats, oldest first. Records have a
+# direction and a value and percent change pair per metric of
+# covid_values.METRICS, a payload with a different metric count is refused.
+# Any other change to the layout needs a new VERSION.
+import struct
+import covid_values
+
+VERSION = 3
+# room for the longest county names, "Prince of Wales-Hyder Census Area"
+# is 33 bytes
+COUNTY_BYTES = 40
+SPARKLINE_LENGTH = 12
+# the metrics in record order, each followed by its percent change
+METRICS = tuple(metric[0] for metric in covid_values.METRICS)
+
+_MAGIC = b"CDC"
+_HEADER = "<3sBBB"
+_HEADER_SIZE = struct.calcsize(_HEADER)
+# fips, county, date, level, level direction, metric directions, metric and
+# percent change pairs, sparkline count and values
+_RECORD = "<5s%ds10sbb%db%dfB%df" % (
+    COUNTY_BYTES,
+    len(METRICS),
+    2 * len(METRICS),
+    SPARKLINE_LENGTH,
+)
+# where the values and the sparkline start in an unpacked record
+_VALUES = 5 + len(METRICS)
+_SPARKLINE = _VALUES + 2 * len(METRICS)
+_RECORD_SIZE = struct.calcsize(_RECORD)
+_DIRECTIONS = {"down": -1, "up": 1}
+
+
+def size(county_count):
+    # bytes in a payload of county_count records
+    return _HEADER_SIZE + county_count * _RECORD_SIZE
+
+
+def _text(raw):
+    end = raw.find(b"\0")
+    return str(raw if end == -1 else raw[:end], "utf-8")
+
+
+def _truncate(text, length):
+    # text as UTF-8 of at most length bytes, not ending inside a character
+    raw = text.encode("utf-8")
+    if len(raw) <= length:
+        return raw
+    end = length
+    while end and raw[end] & 0xC0 == 0x80:
+        end -= 1
+    return raw[:end]
+
+
+def _direction(value):
+    if value > 0:
+        return "up"
+    if value < 0:
+        return "down"
+    return None
+
+
+def decode(buffer, length):
+    # value dicts of the records in buffer[:length], shaped like
+    # covid_values.fetch_covid_data's plus county_fips and sparkline
+    if length < _HEADER_SIZE:
+        raise ValueError("payload is too short")
+    magic, version, metric_count, count = struct.unpack_from(_HEADER, buffer, 0)
+    if magic != _MAGIC or version != VERSION:
+        raise ValueError("payload version %d is not supported" % version)
+    if metric_count != len(METRICS):
+        raise ValueError(
+            "payload has %d metrics, expected %d" % (metric_count, len(METRICS))
+        )
+    if length < size(count):
+        raise ValueError("payload ended after %d bytes" % length)
+
+    records = []
+    offset = _HEADER_SIZE
+    for _ in range(count):
+        fields = struct.unpack_from(_RECORD, buffer, offset)
+        offset += _RECORD_SIZE
+        values = {
+            "county_fips": _text(fields[0]),
+            "county": _text(fields[1]),
+            "date_updated": _text(fields[2]),
+            "community_level": (
+                covid_values.LEVELS[fields[3]] if fields[3] >= 0 else ""
+            ),
+        }
+        direction = _direction(fields[4])
+        if direction:
+            values["community_level_direction"] = direction
+        for index, metric in enumerate(METRICS):
+            direction = _direction(fields[5 + index])
+            if direction:
+                values[metric + "_direction"] = direction
+            values[metric] = fields[_VALUES + 2 * index]
+            values[metric + "_pct_change"] = fields[_VALUES + 1 + 2 * index]
+        start = _SPARKLINE + 1
+        values["sparkline"] = list(fields[start : start + fields[_SPARKLINE]])
+        records.append(values)
+    return records
+
+
+def encode(records):
+    # the payload of value dicts, see decode(). Used by tools/aggregator.py
+    data = bytearray(size(len(records)))
+    struct.pack_into(_HEADER, data, 0, _MAGIC, VERSION, len(METRICS), len(records))
+    offset = _HEADER_SIZE
+    for values in records:
+        fields = [
+            values["county_fips"].encode("utf-8"),
+            _truncate(values["county"], COUNTY_BYTES),
+            values["date_updated"].encode("utf-8"),
+            covid_values.level_index(values.get("community_level")),
+            _DIRECTIONS.get(values.get("community_level_direction"), 0),
+        ]
+        for metric in METRICS:
+            fields.append(_DIRECTIONS.get(values.get(metric + "_direction"), 0))
+        for metric in METRICS:
+            fields.append(values[metric])
+            fields.append(values[metric + "_pct_change"])
+        sparkline = list(values.get("sparkline", ()))[-SPARKLINE_LENGTH:]
+        fields.append(len(sparkline))
+        fields.extend(sparkline + [0.0] * (SPARKLINE_LENGTH - len(sparkline)))
+        struct.pack_into(_RECORD, data, offset, *fields)
+        offset += _RECORD_SIZE
+    return bytes(data)
+
+
+class PayloadReader:
+    # collects a streamed payload in one buffer allocated up front, with the
+    # feed/finish interface of cdc_parser.RecordParser
+    def __init__(self, county_count):
+        self.buffer = bytearray(size(county_count))
+        self.bytes_received = 0
+
+    def feed(self, chunk):
+        end = self.bytes_received + len(chunk)
+        if end > len(self.buffer):
+            raise ValueError("payload is larger than expected")
+        self.buffer[self.bytes_received : end] = chunk
+        self.bytes_received = end
+
+    def finish(self):
+        return decode(self.buffer, self.bytes_received)
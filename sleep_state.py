@@ -0,0 +1,46 @@
+# Small JSON store kept in alarm.sleep_memory for values that have to survive
+# magtag.exit_and_deep_sleep. The contents are lost on reset or power loss, in
+# which case load() returns an empty dict. When the state grows past the
+# sleep memory, save() drops the OPTIONAL keys, which are only printed.
+import json
+import alarm
+
+_MAGIC = b"CDC1"
+_HEADER_SIZE = 6  # magic + 16 bit length
+# kept for the serial console only, dropped in this order when the state
+# does not fit
+OPTIONAL = ("fetch_log", "wake_log")
+
+
+def load():
+    memory = alarm.sleep_memory
+    if bytes(memory[0:4]) != _MAGIC:
+        return {}
+    length = memory[4] | memory[5] << 8
+    data = bytes(memory[_HEADER_SIZE : _HEADER_SIZE + length])
+    try:
+        return json.loads(str(data, "utf-8"))
+    except ValueError:
+        print("sleep memory state is corrupt, starting fresh")
+        return {}
+
+
+def save(state):
+    memory = alarm.sleep_memory
+    data = json.dumps(state).encode("utf-8")
+    optional = [key for key in OPTIONAL if key in state]
+    while _HEADER_SIZE + len(data) > len(memory):
+        if not optional:
+            # starting fresh beats never waking up again
+            print("state does not fit in sleep memory, not saved")
+            memory[0:4] = b"\0\0\0\0"
+            return False
+        key = optional.pop(0)
+        print("sleep memory is full, dropping", key)
+        state = {name: value for name, value in state.items() if name != key}
+        data = json.dumps(state).encode("utf-8")
+    memory[_HEADER_SIZE : _HEADER_SIZE + len(data)] = data
+    memory[4] = len(data) & 0xFF
+    memory[5] = len(data) >> 8
+    memory[0:4] = _MAGIC
+    return True
@@ -0,0 +1,38 @@
+# A small line chart of the last weeks of one metric, drawn into a 1 bit
+# displayio.Bitmap that sits in the MagTag's root group next to the labels.
+import displayio
+
+
+class Sparkline:
+    def __init__(self, x, y, width, height):
+        self.bitmap = displayio.Bitmap(width, height, 2)
+        palette = displayio.Palette(2)
+        palette[0] = 0xFFFFFF
+        palette[1] = 0x000000
+        palette.make_transparent(0)
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=palette, x=x, y=y)
+
+    def plot(self, values):
+        # values oldest first, stretched over the full width and height. Fewer
+        # than two values leave the chart empty
+        bitmap = self.bitmap
+        bitmap.fill(0)
+        if len(values) < 2:
+            return
+        width = bitmap.width
+        height = bitmap.height
+        low = min(values)
+        span = (max(values) - low) or 1
+        previous = None
+        for x in range(width):
+            # the value at this column, between the two nearest weeks
+            position = x * (len(values) - 1) / (width - 1)
+            index = min(int(position), len(values) - 2)
+            fraction = position - index
+            value = values[index] + (values[index + 1] - values[index]) * fraction
+            y = height - 1 - int((value - low) * (height - 1) / span + 0.5)
+            # join this column to the last one so steep weeks stay connected
+            top, bottom = (y, y) if previous is None else sorted((y, previous))
+            for row in range(top, bottom + 1):
+                bitmap[x, row] = 1
+            previous = y
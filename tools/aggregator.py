@@ -0,0 +1,469 @@
+# Fetches the CDC dataset once per publication and serves the values each
+# MagTag shows, so a fleet of trackers shares one set of upstream requests
+# and each tracker parses a few hundred bytes instead of the CDC records.
+#
+# When a tracker asks and the last check is more than --poll seconds old, a
+# one row query with If-None-Match asks Socrata whether a new week is out.
+# Only then are the last history.WEEKS weeks of every county downloaded and
+# covid_values.fetch_covid_data run for each county, as code.py would.
+# Trackers ask for
+#
+#   /counties.bin?fips=37183,37063
+#
+# and get one fixed size payload.py record per county, decoded on the MagTag
+# with struct. /counties.json has the same values as JSON for people, and
+#
+#   /screen.bmp?fips=37183
+#
+# is the whole screen of one county drawn by tools/render_screen.py, for
+# trackers with 'screen_url' set that only show the image. Its "last called"
+# time is when the aggregator fetched the data. The
+# Last-Modified header is the upstream publication and ETags change with the
+# values, so conditional requests and wake scheduling on the trackers work
+# the same as against data.cdc.gov. Set 'aggregator_url' in secrets.py to
+# point a tracker here, or 'screen_url' for the image.
+#
+# With --cache the weeks are kept in a tools/county_cache.py file instead of
+# in memory. A new publication only downloads the weeks newer than the
+# cache, a restart serves the cache without downloading anything, and each
+# county's values are worked out from a cache lookup when first asked for.
+#
+# Trackers that still parse the CDC records can set 'cdc_proxy_url' to the
+# aggregator instead. Their queries, /resource/3nnm-4jni.json?..., go
+# through a tools/upstream_cache.py cache: the same query from many
+# trackers is one upstream request while it is in flight, and its answer is
+# kept until the next publication is due, then for --poll seconds at a time.
+# /stats.json counts upstream requests and the cache's hits, misses and
+# coalesced requests.
+#
+#   python3 tools/aggregator.py [--port 8090] [--upstream URL] [--app-token T]
+#                               [--cafile PEM] [--poll SECONDS] [--cache PATH]
+import argparse
+import contextlib
+import datetime
+import email.utils
+import hashlib
+import io
+import json
+import os
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import covid_values  # noqa: E402
+import history  # noqa: E402
+import payload  # noqa: E402
+import render_screen  # noqa: E402
+import upstream_cache  # noqa: E402
+import wake_schedule  # noqa: E402
+
+UPSTREAM = "https://data.cdc.gov/resource/3nnm-4jni.json"
+# more than the rows of every county for history.WEEKS weeks
+ROW_LIMIT = 500000
+# the upstream response headers the proxy passes on
+PROXY_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def county_values(rows):
+    # {fips: value record} from rows of any number of counties and weeks
+    histories = {}
+    for row in sorted(rows, key=lambda row: row["date_updated"]):
+        fips = row["county_fips"]
+        if fips not in histories:
+            histories[fips] = history.CountyHistory(fips)
+        histories[fips].add(row)
+
+    values = {}
+    # fetch_covid_data talks to the MagTag's serial console, not needed here
+    with contextlib.redirect_stdout(io.StringIO()):
+        for fips, county_history in histories.items():
+            if county_history.count < covid_values.NUMBER_OF_RECORDS:
+                continue
+            county = covid_values.fetch_covid_data(
+                county_history.records(covid_values.NUMBER_OF_RECORDS)
+            )
+            county["county_fips"] = fips
+            county["sparkline"] = [
+                round(value, 2)
+                for value in county_history.series(covid_values.SPARKLINE_METRIC)
+            ]
+            values[fips] = county
+    return values
+
+
+def publication_ttl(last_modified, poll, now=None):
+    # seconds an answer stays fresh: until the week after the publication
+    # it came from is due, then poll seconds at a time while that is late
+    if not last_modified:
+        return poll
+    published = email.utils.parsedate_to_datetime(last_modified).timestamp()
+    if now is None:
+        now = time.time()
+    return max(published + wake_schedule.WEEK - now, poll)
+
+
+def not_modified(headers, etag, last_modified):
+    # whether a conditional request already has the answer
+    if "If-None-Match" in headers:
+        return headers["If-None-Match"] == etag
+    if "If-Modified-Since" in headers and last_modified:
+        try:
+            since = email.utils.parsedate_to_datetime(headers["If-Modified-Since"])
+        except (TypeError, ValueError):
+            return False
+        return since >= email.utils.parsedate_to_datetime(last_modified)
+    return False
+
+
+class Server(ThreadingHTTPServer):
+    # trackers waking for the same publication connect at once, more than
+    # the default backlog of 5 would keep some waiting for a SYN retry
+    request_queue_size = 128
+
+
+class Aggregator:
+    def __init__(
+        self,
+        upstream=UPSTREAM,
+        host="0.0.0.0",
+        port=8090,
+        app_token=None,
+        context=None,
+        poll=300,
+        cache_path=None,
+        proxy_entries=128,
+    ):
+        self.upstream = upstream
+        self.app_token = app_token
+        self.context = context
+        self.poll = poll  # seconds between checks for a new publication
+        self.fields = covid_values.FIELDS
+        self.values = {}
+        self.screens = {}  # {fips: BMP}, drawn on first request
+        self.fetched_at = None  # local time of the dataset fetch, as shown
+        self.latest = None  # date_updated of the newest week
+        self.latest_etag = None
+        self.last_modified = None
+        self.checked = None  # time.monotonic() of the last check
+        self.upstream_requests = 0
+        self.dataset_fetches = 0
+        # re-entrant, screen() holds it while county() takes it
+        self.lock = threading.RLock()
+        # CDC queries trackers send through the aggregator, by query
+        self.queries = upstream_cache.SingleFlightCache(
+            self._query, self._query_ttl, proxy_entries
+        )
+        self.cache_path = cache_path
+        self.cache = None
+        if cache_path:
+            # county_cache needs NumPy, which the aggregator does not otherwise
+            import county_cache
+
+            self.cache = county_cache.open_or_none(cache_path)
+            if self.cache and self.cache.latest:
+                self._serve_cache()
+        self.server = Server((host, port), self._handler())
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    @property
+    def base_url(self):
+        return "http://%s:%d" % self.address
+
+    def _get(self, query, headers=None):
+        # (status, headers, body) of a SoQL query, 304 comes back as a status
+        request_headers = dict(headers or {})
+        if self.app_token:
+            request_headers["X-App-Token"] = self.app_token
+        url = self.upstream + "?" + urlencode(query, quote_via=quote, safe="$,'")
+        request = urllib.request.Request(url, headers=request_headers)
+        self.upstream_requests += 1
+        try:
+            with urllib.request.urlopen(
+                request, timeout=30, context=self.context
+            ) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as error:
+            if error.code != 304:
+                raise
+            return 304, error.headers, b""
+
+    def _query(self, key):
+        # (status, headers, body) of a query a tracker sent, key is its
+        # sorted query parameters
+        try:
+            status, headers, body = self._get(dict(key))
+        except urllib.error.HTTPError as error:
+            status, headers, body = error.code, error.headers, error.read()
+        kept = {name: headers[name] for name in PROXY_HEADERS if name in headers}
+        return status, kept, body
+
+    def _query_ttl(self, answer):
+        status, headers, _ = answer
+        if status != 200:
+            return 0
+        return publication_ttl(headers.get("Last-Modified"), self.poll)
+
+    def query(self, query):
+        # the upstream answer to a SoQL query string, from the cache if
+        # another tracker asked the same since the last publication
+        key = tuple(sorted(parse_qsl(query, keep_blank_values=True)))
+        return self.queries.get(key)
+
+    def stats(self):
+        return {
+            "upstream_requests": self.upstream_requests,
+            "dataset_fetches": self.dataset_fetches,
+            "queries": self.queries.stats(),
+        }
+
+    def refresh(self):
+        # checks for a new publication unless the last check is recent,
+        # downloading the dataset only when there is one
+        with self.lock:
+            if self.checked is not None and time.monotonic() - self.checked < self.poll:
+                return
+            headers = {}
+            if self.latest_etag:
+                headers["If-None-Match"] = self.latest_etag
+            status, response_headers, body = self._get(
+                {
+                    "$select": "date_updated",
+                    "$order": "date_updated DESC",
+                    "$limit": "1",
+                },
+                headers,
+            )
+            if status != 304:
+                rows = json.loads(body)
+                if rows and rows[0]["date_updated"] != self.latest:
+                    self._fetch_dataset(rows[0]["date_updated"])
+                # only once the dataset is in, a failed download is tried
+                # again on the next request instead of answered with 304
+                self.latest_etag = response_headers.get("ETag")
+            self.checked = time.monotonic()
+
+    def _fetch_dataset(self, latest):
+        if self.cache and self.cache.latest:
+            # only the weeks the cache does not have yet
+            where = "date_updated > '%s'" % self.cache.latest
+        else:
+            newest = datetime.datetime.strptime(latest[:10], "%Y-%m-%d")
+            since = newest - datetime.timedelta(weeks=history.WEEKS - 1)
+            where = "date_updated >= '%s'" % since.strftime("%Y-%m-%dT00:00:00.000")
+        _, headers, body = self._get(
+            {
+                "$select": ",".join(self.fields),
+                "$where": where,
+                "$order": "date_updated DESC,county_fips",
+                "$limit": str(ROW_LIMIT),
+            }
+        )
+        self.dataset_fetches += 1
+        last_modified = headers.get("Last-Modified") or email.utils.formatdate(
+            usegmt=True
+        )
+        if self.cache_path:
+            self._update_cache(json.loads(body), last_modified)
+        else:
+            self.values = county_values(json.loads(body))
+            self.screens = {}
+        self.fetched_at = "%d/%d\n%d:%02d" % time.localtime()[1:5]
+        self.latest = latest
+        self.last_modified = last_modified
+        print("fetched %d bytes of weeks up to %s" % (len(body), latest[:10]))
+
+    def _update_cache(self, rows, last_modified):
+        import county_cache
+
+        builder = county_cache.ColumnBuilder()
+        builder.add_records(rows)
+        old = self.cache.columns() if self.cache else county_cache.empty()
+        county_cache.write(
+            self.cache_path,
+            *county_cache.merge(old, builder.columns(), history.WEEKS),
+            last_modified=last_modified,
+        )
+        if self.cache:
+            self.cache.reload()
+        else:
+            self.cache = county_cache.CountyCache(self.cache_path)
+        self._serve_cache()
+
+    def _serve_cache(self):
+        # the values are worked out from the cache when asked for
+        self.values = {}
+        self.screens = {}
+        modified = os.path.getmtime(self.cache_path)
+        self.fetched_at = "%d/%d\n%d:%02d" % time.localtime(modified)[1:5]
+        self.latest = self.cache.latest
+        self.last_modified = self.cache.last_modified or email.utils.formatdate(
+            modified, usegmt=True
+        )
+
+    def county(self, fips):
+        # value record of one county, None if it has too few weeks
+        with self.lock:
+            if fips not in self.values and self.cache is not None:
+                self.values.update(county_values(self.cache.rows(fips, history.WEEKS)))
+            return self.values.get(fips)
+
+    def counties(self, fips_codes):
+        # value records of fips_codes in that order, every county if empty
+        if not fips_codes:
+            fips_codes = self.cache.fips_codes() if self.cache else sorted(self.values)
+        records = [self.county(fips) for fips in fips_codes]
+        return [values for values in records if values]
+
+    def screen(self, fips):
+        # the BMP of one county, None if there are no values for it
+        with self.lock:
+            values = self.county(fips)
+            if fips not in self.screens and values:
+                values = dict(values, api_last_called=self.fetched_at)
+                self.screens[fips] = render_screen.render(values)
+            return self.screens.get(fips)
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        aggregator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == urlsplit(aggregator.upstream).path:
+                    self.proxy(url.query)
+                    return
+                if url.path == "/stats.json":
+                    self.send_json(aggregator.stats())
+                    return
+                if url.path not in ("/counties.json", "/counties.bin", "/screen.bmp"):
+                    self.send_error(404)
+                    return
+                try:
+                    aggregator.refresh()
+                except (OSError, ValueError) as error:
+                    # keep serving what we have while upstream is down or
+                    # sends a body that does not parse
+                    print("upstream check failed -", error)
+                if aggregator.latest is None:
+                    self.send_error(502, "no CDC data yet")
+                    return
+                query = dict(parse_qsl(url.query))
+                fips_codes = [
+                    fips.strip() for fips in query.get("fips", "").split(",") if fips
+                ]
+                records = aggregator.counties(fips_codes)
+                if url.path == "/screen.bmp":
+                    body = aggregator.screen(query.get("fips", "").strip())
+                    if body is None:
+                        self.send_error(404, "no CDC data for that county")
+                        return
+                    content_type = "image/bmp"
+                elif url.path == "/counties.bin":
+                    body = payload.encode(records)
+                    content_type = "application/octet-stream"
+                else:
+                    body = json.dumps(records, separators=(",", ":")).encode()
+                    content_type = "application/json;charset=utf-8"
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", aggregator.last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def proxy(self, query):
+                try:
+                    status, headers, body = aggregator.query(query)
+                except OSError as error:
+                    self.send_error(502, "upstream failed - %s" % error)
+                    return
+                if status == 200 and not_modified(
+                    self.headers, headers.get("ETag"), headers.get("Last-Modified")
+                ):
+                    self.send_response(304)
+                    if "ETag" in headers:
+                        self.send_header("ETag", headers["ETag"])
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_json(self, value):
+                body = json.dumps(value).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--upstream", default=UPSTREAM)
+    parser.add_argument("--app-token")
+    parser.add_argument("--cafile", help="extra CA to trust, e.g. the stub's")
+    parser.add_argument("--poll", type=float, default=300, metavar="SECONDS")
+    parser.add_argument("--cache", help="keep the weeks in this county_cache file")
+    args = parser.parse_args()
+
+    context = ssl.create_default_context()
+    if args.cafile:
+        context.load_verify_locations(args.cafile)
+    aggregator = Aggregator(
+        args.upstream,
+        args.host,
+        args.port,
+        args.app_token,
+        context,
+        args.poll,
+        args.cache,
+    )
+    print(f"serving {aggregator.base_url}/counties.json from {args.upstream}")
+    try:
+        aggregator.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
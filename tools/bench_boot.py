@@ -0,0 +1,60 @@
+# Compare awake time with the display set up while the CDC request is in
+# flight (OVERLAP_BOOT = True) against doing one after the other, using the
+# desktop stand-in and tools/cdc_stub.py with a simulated server latency.
+#
+#   python3 tools/bench_boot.py [--latency-ms 400] [--join-ms 0] [--runs 5]
+#
+# Each run is a cold boot (200 with the full body) followed by a timer wake
+# that gets a 304.
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import run_host  # noqa: E402
+
+
+def awake_ms(overlap, latency_ms, join_ms, runs):
+    cold, warm = [], []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            wakes, _ = run_host.run(
+                wakes=2,
+                overrides={"OVERLAP_BOOT": str(overlap)},
+                latency_ms=latency_ms,
+                join_ms=join_ms,
+            )
+        for wake in wakes:
+            if wake.error:
+                raise SystemExit("wake %d failed: %r" % (wake.index, wake.error))
+        cold.append(wakes[0].awake_ms)
+        warm.append(wakes[1].awake_ms)
+    return statistics.median(cold), statistics.median(warm)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=int, default=400)
+    parser.add_argument("--join-ms", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"server latency {args.latency_ms} ms, Wi-Fi join {args.join_ms} ms,"
+        f" median of {args.runs} runs"
+    )
+    print(f"{'boot':<14}{'cold ms':>10}{'304 ms':>10}")
+    results = {}
+    for name, overlap in (("sequential", False), ("overlapped", True)):
+        results[name] = awake_ms(overlap, args.latency_ms, args.join_ms, args.runs)
+        print(f"{name:<14}{results[name][0]:>10.0f}{results[name][1]:>10.0f}")
+    saved = [a - b for a, b in zip(results["sequential"], results["overlapped"])]
+    print(f"{'saved':<14}{saved[0]:>10.0f}{saved[1]:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
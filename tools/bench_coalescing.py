@@ -0,0 +1,135 @@
+# Count the CDC requests a fleet of trackers costs when they all ask at
+# once, straight to tools/cdc_stub.py against through the aggregator's query
+# cache (tools/upstream_cache.py).
+#
+#   python3 tools/bench_coalescing.py [--trackers N] [--rounds R]
+#                                     [--latency-ms MS] [rows.json ...]
+#
+# Every round the trackers send the query code.py sends for their county
+# at the same moment, like trackers waking for the same publication. The
+# trackers are spread over the recorded counties, so there is one distinct
+# query per county. The stub counts the requests that reach it.
+import argparse
+import glob
+import os
+import ssl
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools", "host"))
+
+import aggregator  # noqa: E402
+import cdc_stub  # noqa: E402
+import covid_values  # noqa: E402
+import history  # noqa: E402
+import host_network  # noqa: E402
+
+
+def county_query(fips):
+    # code.py's CDC_API_DATA_SOURCE query for one county
+    return (
+        f"$select={','.join(covid_values.FIELDS)}"
+        f"&$where=county_fips%20in(%27{fips}%27)"
+        f"&$order=date_updated%20DESC,county_fips"
+        f"&$limit={history.WEEKS}"
+    )
+
+
+def fire(urls, context):
+    # every url at once from its own thread, returns the seconds each took,
+    # None for the ones that failed
+    start = threading.Barrier(len(urls))
+    elapsed = [None] * len(urls)
+
+    def tracker(index):
+        start.wait()
+        began = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urls[index], timeout=30, context=context) as r:
+                r.read()
+        except OSError as error:
+            print("  request failed -", error)
+            return
+        elapsed[index] = time.perf_counter() - began
+
+    threads = [threading.Thread(target=tracker, args=(i,)) for i in range(len(urls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return elapsed
+
+
+def run(base_url, queries, rounds, context):
+    results = []
+    began = time.perf_counter()
+    for _ in range(rounds):
+        urls = [base_url + "/resource/3nnm-4jni.json?" + query for query in queries]
+        results.extend(fire(urls, context))
+    return time.perf_counter() - began, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--trackers", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    rows = cdc_stub.load_rows(paths)
+    fips_codes = sorted({row["county_fips"] for row in rows})
+    queries = [
+        county_query(fips_codes[index % len(fips_codes)])
+        for index in range(args.trackers)
+    ]
+    context = ssl.create_default_context(cafile=host_network.CERTIFICATE)
+
+    print(
+        f"{args.trackers} trackers, {len(fips_codes)} distinct queries,"
+        f" {args.rounds} rounds, {args.latency_ms} ms upstream latency"
+    )
+    print(
+        f"{'path':<12}{'upstream':>10}{'failed':>8}{'wall s':>9}"
+        f"{'median ms':>11}{'max ms':>9}"
+    )
+    for path in ("direct", "aggregator"):
+        stub = cdc_stub.CdcStub(rows, tls=True, latency=args.latency_ms / 1000)
+        stub.start()
+        proxy = None
+        base_url = stub.base_url
+        if path == "aggregator":
+            proxy = aggregator.Aggregator(
+                stub.base_url + "/resource/3nnm-4jni.json",
+                host="127.0.0.1",
+                port=0,
+                context=context,
+            ).start()
+            base_url = proxy.base_url
+        try:
+            wall_s, results = run(base_url, queries, args.rounds, context)
+        finally:
+            if proxy:
+                proxy.stop()
+            stub.stop()
+        latencies = [elapsed for elapsed in results if elapsed is not None]
+        print(
+            f"{path:<12}{stub.hits:>10}{len(results) - len(latencies):>8}"
+            f"{wall_s:>9.2f}"
+            f"{statistics.median(latencies) * 1000:>11.1f}"
+            f"{max(latencies) * 1000:>9.1f}"
+        )
+        if proxy:
+            print("  query cache:", proxy.queries.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Compare fetching the CDC records plain against gzipped, through
+# http_client.Session and cdc_parser the way code.py fetches them, from
+# tools/cdc_stub.py sending at a Wi-Fi like rate:
+#
+#   identity        no Accept-Encoding, the body as it is
+#   gzip            decompressed by gzip_stream as it arrives
+#
+#   python3 tools/bench_gzip.py [--counties N] [--kbps KB/S] [rows.json ...]
+#
+# Reports the body bytes over the wire, the fetch and parse time, and the
+# peak memory tracemalloc saw while fetching. The stub runs in a process of
+# its own so its memory is not counted.
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "tools", "host"), ROOT]
+
+import cdc_parser  # noqa: E402
+import cdc_stub  # noqa: E402
+import cooperative  # noqa: E402
+import covid_values  # noqa: E402
+import history  # noqa: E402
+import host_network  # noqa: E402
+import http_client  # noqa: E402
+import socketpool  # noqa: E402
+from bench_parser import code_constant  # noqa: E402
+from bench_payload import county_rows  # noqa: E402
+
+MODES = ("identity", "gzip")
+
+
+def data_source(fips_codes):
+    # code.py's CDC_API_DATA_SOURCE for these counties
+    fips_list = ",".join("%27" + fips + "%27" for fips in fips_codes)
+    return (
+        "https://data.cdc.gov/resource/3nnm-4jni.json"
+        f"?$select={','.join(covid_values.FIELDS)}"
+        f"&$where=county_fips%20in({fips_list})"
+        f"&$order=date_updated%20DESC,county_fips"
+        f"&$limit={history.WEEKS * len(fips_codes)}"
+    )
+
+
+def fetch(session, url, headers, chunk_size):
+    # fetch_records without the display: (bytes over the wire, records)
+    parser = cdc_parser.RecordParser(covid_values.FIELDS)
+    response = yield from session.get(url, headers=headers, chunk_size=chunk_size)
+    for chunk in response.iter_content():
+        if chunk:
+            parser.feed(chunk)
+        yield
+    return response.bytes_received, parser.finish()
+
+
+def measure(mode, url, chunk_size, repeat):
+    headers = {} if mode == "identity" else {"Accept-Encoding": "gzip"}
+    session = http_client.Session(
+        socketpool.SocketPool(None), host_network.client_context()
+    )
+    elapsed = []
+    try:
+        for _ in range(repeat):
+            tracemalloc.start()
+            started = time.perf_counter()
+            task = fetch(session, url, headers, chunk_size)
+            size, records = cooperative.run(task)[0]
+            elapsed.append(time.perf_counter() - started)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        session.close()
+    return size, records, statistics.median(elapsed), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--counties", type=int, default=2)
+    parser.add_argument("--kbps", type=float, default=20, help="stub send rate")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    rows = county_rows(cdc_stub.load_rows(paths), args.counties)
+    fips_codes = sorted({row["county_fips"] for row in rows})
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as rows_file:
+        json.dump(rows, rows_file)
+    stub = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, "tools", "cdc_stub.py")]
+        + ["--tls", "--port", "0", "--kbps", str(args.kbps), rows_file.name],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # "serving N rows on https://127.0.0.1:PORT"
+    server = urlsplit(stub.stdout.readline().split()[-1])
+    host_network.HOSTS["data.cdc.gov", 443] = (server.hostname, server.port)
+    url = data_source(fips_codes)
+    chunk_size = code_constant("PARSER_CHUNK_SIZE")
+
+    rate = f"{args.kbps:g} KB/s" if args.kbps else "no rate limit"
+    print(f"{args.counties} counties, {rate} from the stub, chunk size {chunk_size}")
+    print(f"{'':<16}{'wire bytes':>11}{'records':>9}{'fetch ms':>10}{'peak KB':>9}")
+    expected = None
+    try:
+        for mode in MODES:
+            size, records, elapsed, peak = measure(mode, url, chunk_size, args.repeat)
+            if expected is None:
+                expected = records
+            elif records != expected:
+                raise SystemExit(f"{mode} parsed different records")
+            print(
+                f"{mode:<16}{size:>11}{len(records):>9}"
+                f"{elapsed * 1000:>10.1f}{peak / 1024:>9.1f}"
+            )
+    finally:
+        stub.terminate()
+        stub.wait()
+        os.remove(rows_file.name)
+
+
+if __name__ == "__main__":
+    main()
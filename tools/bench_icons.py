@@ -0,0 +1,78 @@
+# Measure what importing icons costs, against the old layout of one module
+# level string constant per icon (rebuilt here from the same table).
+#
+#   python3 tools/bench_icons.py [--repeat N]
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import icons  # noqa: E402
+
+# run in a fresh interpreter so each import starts from a clean heap
+MEASURE = """
+import sys, time, tracemalloc
+sys.path.insert(0, sys.argv[1])
+source = open(sys.argv[1] + "/icons.py").read()
+repeat = int(sys.argv[2])
+
+start = time.perf_counter()
+for _ in range(repeat):
+    namespace = {}
+    exec(compile(source, "icons.py", "exec"), namespace)
+import_ms = (time.perf_counter() - start) * 1000 / repeat
+
+tracemalloc.start()
+import icons
+retained = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+start = time.perf_counter()
+for _ in range(repeat):
+    icons.arrow_down, icons.chevron_circle_up, icons.circle_o
+lookup_us = (time.perf_counter() - start) * 1e6 / repeat / 3
+print(import_ms, retained, lookup_us)
+"""
+
+
+def eager_source():
+    names = icons._NAMES.split()
+    return "".join(
+        '%s = "\\u%04x"\n' % (name, ord(getattr(icons, name))) for name in names
+    )
+
+
+def measure(directory, repeat):
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASURE, directory, str(repeat)], text=True
+    )
+    import_ms, retained, lookup_us = output.split()
+    return float(import_ms), int(retained), float(lookup_us)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as eager_directory:
+        with open(os.path.join(eager_directory, "icons.py"), "w") as eager_file:
+            eager_file.write(eager_source())
+        results = (
+            ("constants", eager_directory),
+            ("compact", ROOT),
+        )
+        print(f"{'layout':<12}{'import ms':>10}{'heap KB':>10}{'lookup us':>11}")
+        for name, directory in results:
+            import_ms, retained, lookup_us = measure(directory, args.repeat)
+            print(
+                f"{name:<12}{import_ms:>10.3f}{retained / 1024:>10.1f}{lookup_us:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Compare covid_values.fetch_covid_data run county by county against
+# tools/vector_values.py computing every county at once with NumPy, and
+# check that both give the same values.
+#
+#   python3 tools/bench_metrics.py [--counties N] [rows.json ...]
+#
+# --counties makes up that many counties from the recorded weeks.
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+import cdc_stub  # noqa: E402
+import covid_values  # noqa: E402
+import vector_values  # noqa: E402
+
+NUMERIC_FIELDS = ("county_population",) + tuple(
+    metric[1] for metric in covid_values.METRICS
+)
+
+
+def county_pairs(rows, count):
+    # [newest, week before] of `count` counties, made from consecutive
+    # recorded weeks of the recorded counties
+    by_county = {}
+    for row in sorted(rows, key=lambda row: row["date_updated"], reverse=True):
+        by_county.setdefault(row["county_fips"], []).append(row)
+    pairs = [
+        county_rows[index : index + 2]
+        for county_rows in by_county.values()
+        for index in range(len(county_rows) - 1)
+    ]
+    chosen = random.Random(0).choices(pairs, k=count)
+    return [
+        [dict(row, county_fips="%05d" % index) for row in pair]
+        for index, pair in enumerate(chosen)
+    ]
+
+
+def one_by_one(pairs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [covid_values.fetch_covid_data(pair) for pair in pairs]
+
+
+def columns(rows):
+    arrays = {
+        field: np.array([float(row[field]) for row in rows]) for field in NUMERIC_FIELDS
+    }
+    arrays["covid_19_community_level"] = vector_values.level_indexes(
+        [row["covid_19_community_level"] for row in rows]
+    )
+    return arrays
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--counties", type=int, default=3000)
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    pairs = county_pairs(cdc_stub.load_rows(paths), args.counties)
+    expected, scalar_s = timed(one_by_one, pairs)
+    # turning rows into columns depends on where they come from, so it is
+    # timed on its own
+    (current, prior), columns_s = timed(
+        lambda: (
+            columns([pair[0] for pair in pairs]),
+            columns([pair[1] for pair in pairs]),
+        )
+    )
+    values, vector_s = timed(vector_values.compute, current, prior)
+
+    for index, county in enumerate(expected):
+        vector_county = vector_values.county_values(values, index)
+        for name, value in vector_county.items():
+            if isinstance(value, float):
+                if abs(value - county[name]) > 1e-9 * max(1.0, abs(value)):
+                    raise SystemExit(f"{name} differs for county {index}")
+            elif value != county.get(name):
+                raise SystemExit(f"{name} differs for county {index}")
+        shown = {name for name in county if name.endswith("_direction")}
+        if shown != {name for name in vector_county if name.endswith("_direction")}:
+            raise SystemExit(f"directions differ for county {index}")
+
+    print(f"{args.counties} counties, {len(covid_values.METRICS)} metrics")
+    print(f"{'engine':<28}{'ms':>10}")
+    print(f"{'fetch_covid_data per county':<28}{scalar_s * 1000:>10.2f}")
+    print(f"{'rows to NumPy columns':<28}{columns_s * 1000:>10.2f}")
+    print(f"{'vector_values.compute':<28}{vector_s * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Compare json.loads on the whole body against the streaming cdc_parser on
+# recorded 3nnm-4jni responses.
+#
+#   python3 tools/bench_parser.py [--pad-columns N] [response.json ...]
+#
+# --pad-columns adds N extra string columns to every record to show how each
+# path scales with the width of the CDC rows.
+import argparse
+import ast
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cdc_parser  # noqa: E402
+import covid_values  # noqa: E402
+
+
+def code_constant(name):
+    with open(os.path.join(ROOT, "code.py")) as code_file:
+        tree = ast.parse(code_file.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and node.targets[0].id == name:
+            return ast.literal_eval(node.value)
+    raise KeyError(name)
+
+
+def pad_columns(body, count):
+    records = json.loads(body)
+    for record in records:
+        for column in range(count):
+            record[f"padding_column_{column}"] = "x" * 24
+    return json.dumps(records).encode()
+
+
+def chunks(body, size):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def load_whole(body, chunk_size, fields):
+    # what magtag.fetch() + json.loads() does: buffer the text, then parse it
+    text = b"".join(chunks(body, chunk_size)).decode()
+    return json.loads(text)
+
+
+def load_streaming(body, chunk_size, fields):
+    return cdc_parser.parse(chunks(body, chunk_size), fields)
+
+
+def measure(loader, body, chunk_size, fields, repeat):
+    tracemalloc.start()
+    loader(body, chunk_size, fields)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loader(body, chunk_size, fields)
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("responses", nargs="*")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--pad-columns", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    responses = args.responses or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    fields = covid_values.FIELDS
+    chunk_size = args.chunk_size or code_constant("PARSER_CHUNK_SIZE")
+
+    print(f"chunk size {chunk_size} bytes, {len(fields)} fields kept")
+    print(f"{'response':<36}{'bytes':>8}{'path':>11}{'time ms':>10}{'peak KB':>10}")
+    for path in responses:
+        with open(path, "rb") as response_file:
+            body = response_file.read()
+        if args.pad_columns:
+            body = pad_columns(body, args.pad_columns)
+
+        expected = [
+            {key: value for key, value in record.items() if key in fields}
+            for record in json.loads(body)
+        ]
+        if load_streaming(body, chunk_size, fields) != expected:
+            raise SystemExit(f"{path}: streaming parser output differs from json")
+
+        for name, loader in (("json", load_whole), ("streaming", load_streaming)):
+            elapsed, peak = measure(loader, body, chunk_size, fields, args.repeat)
+            print(
+                f"{os.path.basename(path):<36}{len(body):>8}{name:>11}"
+                f"{elapsed * 1000:>10.3f}{peak / 1024:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Compare what a MagTag receives and how long it takes to turn it into the
+# values it shows: CDC records through cdc_parser and fetch_covid_data,
+# against the aggregator's payload.py records decoded with struct.
+#
+#   python3 tools/bench_payload.py [--counties N] [rows.json ...]
+#
+# --counties repeats the recorded counties under made up FIPS codes to show
+# how both paths scale with the number of counties a tracker pages through.
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import aggregator  # noqa: E402
+import cdc_parser  # noqa: E402
+import cdc_stub  # noqa: E402
+import covid_values  # noqa: E402
+import payload  # noqa: E402
+from bench_parser import chunks, code_constant  # noqa: E402
+
+
+def county_rows(rows, count):
+    # rows of `count` counties, made from the recorded ones
+    fips_codes = sorted({row["county_fips"] for row in rows})
+    made_up = []
+    for index in range(count):
+        fips = fips_codes[index % len(fips_codes)]
+        made_up.extend(
+            dict(row, county_fips="%05d" % (90000 + index))
+            for row in rows
+            if row["county_fips"] == fips
+        )
+    return made_up
+
+
+def from_records(body, chunk_size, fields):
+    records = cdc_parser.parse(chunks(body, chunk_size), fields)
+    by_county = {}
+    for record in records:
+        by_county.setdefault(record["county_fips"], []).append(record)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [
+            covid_values.fetch_covid_data(county_records[:2])
+            for county_records in by_county.values()
+        ]
+
+
+def from_payload(body, chunk_size, county_count):
+    reader = payload.PayloadReader(county_count)
+    for chunk in chunks(body, chunk_size):
+        reader.feed(chunk)
+    return reader.finish()
+
+
+def timed(function, repeat, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--counties", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    rows = county_rows(cdc_stub.load_rows(paths), args.counties)
+    fields = covid_values.FIELDS
+    chunk_size = code_constant("PARSER_CHUNK_SIZE")
+
+    # what the tracker asks data.cdc.gov for: the newest two weeks of each
+    # county, only the columns it reads
+    query = {
+        "$select": ",".join(fields),
+        "$order": "date_updated DESC,county_fips",
+        "$limit": str(2 * args.counties),
+    }
+    records_body = cdc_stub.encode_rows(cdc_stub.query_rows(rows, query))
+    values = aggregator.county_values(rows)
+    payload_body = payload.encode([values[fips] for fips in sorted(values)])
+
+    decoded = from_payload(payload_body, chunk_size, args.counties)
+    if [record["county"] for record in decoded] != [
+        values[fips]["county"] for fips in sorted(values)
+    ]:
+        raise SystemExit("payload does not decode to the encoded counties")
+
+    print(f"{args.counties} counties, chunk size {chunk_size} bytes")
+    print(f"{'path':<24}{'bytes':>8}{'time ms':>10}")
+    for name, body, elapsed in (
+        (
+            "CDC records",
+            records_body,
+            timed(from_records, args.repeat, records_body, chunk_size, fields),
+        ),
+        (
+            "payload v%d" % payload.VERSION,
+            payload_body,
+            timed(from_payload, args.repeat, payload_body, chunk_size, args.counties),
+        ),
+    ):
+        print(f"{name:<24}{len(body):>8}{elapsed * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
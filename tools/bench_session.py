@@ -0,0 +1,116 @@
+# Compare TLS handshakes and request latency of http_client.Session against
+# tools/cdc_stub.py over HTTPS, through the desktop socketpool stand-in:
+#
+#   new session     a Session per request, a full handshake every time
+#   resume          one Session with keep-alive off, every request connects
+#                   again but resumes the TLS session of the last one
+#   keep-alive      one Session, every request after the first reuses the
+#                   connection
+#
+#   python3 tools/bench_session.py [--requests N] [--latency-ms MS]
+#
+# CircuitPython's ssl module has no TLS sessions to resume, so on a MagTag
+# only keep-alive applies.
+import argparse
+import glob
+import os
+import ssl
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "tools", "host"), ROOT]
+
+import cdc_stub  # noqa: E402
+import cooperative  # noqa: E402
+import host_network  # noqa: E402
+import http_client  # noqa: E402
+import socketpool  # noqa: E402
+from bench_coalescing import county_query  # noqa: E402
+
+
+def request(session, url):
+    response = yield from session.get(url)
+    for _ in response.iter_content():
+        yield
+    return response.status_code
+
+
+def run(new_session, url, count, per_request):
+    # seconds each request took, until its body was read
+    elapsed = []
+    session = new_session()
+    for _ in range(count):
+        if elapsed and per_request:
+            session.close()
+            session = new_session()
+        started = time.perf_counter()
+        status = cooperative.run(request(session, url))[0]
+        elapsed.append(time.perf_counter() - started)
+        if status != 200:
+            raise SystemExit("HTTP %d from the stub" % status)
+    session.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    rows = cdc_stub.load_rows(paths)
+    stub = cdc_stub.CdcStub(rows, tls=True, latency=args.latency_ms / 1000).start()
+    host_network.HOSTS["data.cdc.gov", 443] = stub.address
+    url = "https://data.cdc.gov/resource/3nnm-4jni.json?" + county_query(
+        rows[0]["county_fips"]
+    )
+    pool = socketpool.SocketPool(None)
+    # TLS 1.2 as well, its session IDs resume the same way TLS 1.3 tickets do
+    versions = {"TLS 1.3": ssl.TLSVersion.TLSv1_3, "TLS 1.2": ssl.TLSVersion.TLSv1_2}
+
+    print(f"{args.requests} requests, {args.latency_ms} ms server latency")
+    print(
+        f"{'':<22}{'handshakes':>11}{'resumed':>9}{'first ms':>10}"
+        f"{'median ms':>11}{'total ms':>10}"
+    )
+    try:
+        for version_name, version in versions.items():
+
+            def context():
+                context = host_network.client_context()
+                context.maximum_version = version
+                return context
+
+            shared = context()
+            # (session factory, a new session for every request)
+            modes = {
+                "new session": (lambda: http_client.Session(pool, context()), True),
+                "resume": (
+                    lambda: http_client.Session(pool, shared, keep_alive=False),
+                    False,
+                ),
+                "keep-alive": (lambda: http_client.Session(pool, shared), False),
+            }
+            for mode, (new_session, per_request) in modes.items():
+                handshakes = host_network.stats.handshakes
+                resumed = host_network.stats.resumed
+                elapsed = run(new_session, url, args.requests, per_request)
+                print(
+                    f"{version_name + ' ' + mode:<22}"
+                    f"{host_network.stats.handshakes - handshakes:>11}"
+                    f"{host_network.stats.resumed - resumed:>9}"
+                    f"{elapsed[0] * 1000:>10.1f}"
+                    f"{statistics.median(elapsed) * 1000:>11.1f}"
+                    f"{sum(elapsed) * 1000:>10.1f}"
+                )
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# Local stand-in for the Socrata endpoint behind CDC_API_DATA_SOURCE.
+#
+# Replays recorded 3nnm-4jni rows and understands the parts of SoQL the
+# tracker sends ($select, $where, $order, $limit and column=value filters).
+# Responses carry ETag and Last-Modified headers and conditional requests
+# get a 304. /time and /api/v2/<user>/integrations/time/strftime answer
+# like the Adafruit IO strftime service that code.py and
+# MagTag.get_local_time use. Connections are kept open between requests
+# (HTTP/1.1 keep-alive) unless the client asks to close them.
+#
+# --tls serves HTTPS with the test certificate in tools/fixtures/stub_tls,
+# which is valid for data.cdc.gov, io.adafruit.com and 127.0.0.1. --latency
+# holds every data response back the way a busy Socrata server would.
+# Data responses are gzipped for clients that send Accept-Encoding: gzip,
+# as Socrata does, unless --no-gzip is given. --kbps sends every response
+# body at that rate, like a slow Wi-Fi link.
+#
+#   python3 tools/cdc_stub.py [--port 8080] [--tls] [--latency MS]
+#                             [--no-gzip] [--kbps KB/S] [rows.json ...]
+import argparse
+import calendar
+import email.utils
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tools", "fixtures")
+CERTIFICATE = os.path.join(FIXTURES, "stub_tls", "cert.pem")
+KEY = os.path.join(FIXTURES, "stub_tls", "key.pem")
+
+
+def load_rows(paths):
+    rows = []
+    for path in paths:
+        with open(path) as rows_file:
+            for row in json.load(rows_file):
+                if row not in rows:
+                    rows.append(row)
+    return rows
+
+
+_IN = re.compile(r"(\w+)\s+in\s*\(([^)]*)\)$", re.IGNORECASE)
+_COMPARISON = re.compile(r"(\w+)\s*(=|!=|>=|<=|>|<)\s*'([^']*)'$")
+_OPERATORS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+}
+
+
+def where_filter(clause):
+    # conditions joined with AND, each "column in ('a','b')" or "column > 'a'"
+    tests = []
+    for condition in re.split(r"\s+AND\s+", clause.strip(), flags=re.IGNORECASE):
+        match = _IN.match(condition.strip())
+        if match:
+            values = {value.strip().strip("'") for value in match[2].split(",")}
+            tests.append(lambda row, c=match[1], v=values: row.get(c) in v)
+            continue
+        match = _COMPARISON.match(condition.strip())
+        if not match:
+            raise ValueError(f"unsupported $where condition: {condition}")
+        operator = _OPERATORS[match[2]]
+        tests.append(
+            lambda row, c=match[1], o=operator, v=match[3]: c in row and o(row[c], v)
+        )
+    return lambda row: all(test(row) for test in tests)
+
+
+def query_rows(rows, query):
+    selected = rows
+    for column, value in query.items():
+        if not column.startswith("$"):
+            selected = [row for row in selected if row.get(column) == value]
+    if "$where" in query:
+        selected = list(filter(where_filter(query["$where"]), selected))
+
+    for term in reversed(query.get("$order", "").split(",")):
+        if term.strip():
+            column, _, direction = term.strip().partition(" ")
+            selected = sorted(
+                selected,
+                key=lambda row, column=column: row.get(column, ""),
+                reverse=direction.strip().upper() == "DESC",
+            )
+
+    if "$limit" in query:
+        selected = selected[: int(query["$limit"])]
+
+    if "$select" in query:
+        columns = [column.strip() for column in query["$select"].split(",")]
+        selected = [
+            {column: row[column] for column in columns if column in row}
+            for row in selected
+        ]
+    return selected
+
+
+def encode_rows(rows):
+    # Socrata puts every column and every record on its own line
+    return (
+        "["
+        + "\n,".join(
+            "{"
+            + "\n,".join(f"{json.dumps(k)}:{json.dumps(v)}" for k, v in row.items())
+            + "}"
+            for row in rows
+        )
+        + "]\n"
+    ).encode()
+
+
+def not_modified(headers, etag, last_modified):
+    if "If-None-Match" in headers:
+        return headers["If-None-Match"] == etag
+    if "If-Modified-Since" in headers:
+        since = email.utils.parsedate_to_datetime(headers["If-Modified-Since"])
+        return since >= email.utils.parsedate_to_datetime(last_modified)
+    return False
+
+
+class Server(ThreadingHTTPServer):
+    # room for tools/bench_coalescing.py's trackers connecting at once
+    request_queue_size = 128
+
+
+class CdcStub:
+    def __init__(self, rows, port=0, tls=False, latency=0.0, gzip=True, rate=0):
+        self.rows = rows
+        self.tls = tls
+        self.latency = latency  # seconds before each data response
+        self.gzip = gzip  # gzip data responses for clients that accept it
+        self.rate = rate  # body bytes per second, 0 for as fast as it goes
+        self.body_bytes = 0  # sent in data responses
+        self.hits = 0
+        self.not_modified = 0
+        self.time_requests = 0
+        self.lock = threading.Lock()
+        self.server = Server(("127.0.0.1", port), self._handler())
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERTIFICATE, KEY)
+            self.server.socket = context.wrap_socket(
+                self.server.socket, server_side=True
+            )
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    @property
+    def base_url(self):
+        return "%s://%s:%d" % (("https" if self.tls else "http",) + self.address)
+
+    def publish(self, rows):
+        with self.lock:
+            self.rows = rows
+
+    def last_modified(self):
+        newest = max((row.get("date_updated", "") for row in self.rows), default="")
+        if not newest:
+            return email.utils.formatdate(0, usegmt=True)
+        stamp = time.strptime(newest[:19], "%Y-%m-%dT%H:%M:%S")
+        return email.utils.formatdate(calendar.timegm(stamp), usegmt=True)
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # the headers and the body are separate writes, with Nagle on
+            # the body of a kept alive connection waits for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == "/time" or url.path.endswith(
+                    "/integrations/time/strftime"
+                ):
+                    stub.time_requests += 1
+                    body = time.strftime("%Y-%m-%d %H:%M:%S.000 %j %u %z %Z").encode()
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                if not url.path.startswith("/resource/"):
+                    self.send_error(404)
+                    return
+                if stub.latency:
+                    # not time.sleep, tools/run_host.py patches that
+                    threading.Event().wait(stub.latency)
+                with stub.lock:
+                    stub.hits += 1
+                    rows = query_rows(stub.rows, dict(parse_qsl(url.query)))
+                    body = encode_rows(rows)
+                    last_modified = stub.last_modified()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+                if not_modified(self.headers, etag, last_modified):
+                    with stub.lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                if stub.gzip:
+                    self.send_header("Vary", "Accept-Encoding")
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body = gzip.compress(body, compresslevel=6)
+                        self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.write_body(body)
+                with stub.lock:
+                    stub.body_bytes += len(body)
+
+            def write_body(self, body):
+                if not stub.rate:
+                    self.wfile.write(body)
+                    return
+                # a TCP segment at a time, at stub.rate on average
+                started = time.monotonic()
+                for start in range(0, len(body), 1460):
+                    self.wfile.write(body[start : start + 1460])
+                    due = started + (start + 1460) / stub.rate
+                    threading.Event().wait(max(due - time.monotonic(), 0))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--tls", action="store_true")
+    parser.add_argument("--latency", type=float, default=0, metavar="MS")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--kbps", type=float, default=0, metavar="KB/S")
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(glob.glob(os.path.join(FIXTURES, "3nnm-4jni_*.json")))
+    stub = CdcStub(
+        load_rows(paths),
+        args.port,
+        args.tls,
+        args.latency / 1000,
+        not args.no_gzip,
+        args.kbps * 1000,
+    )
+    print(f"serving {len(stub.rows)} rows on {stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
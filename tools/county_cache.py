@@ -0,0 +1,435 @@
+# The 3nnm-4jni rows in a columnar file that is used through mmap, so a
+# lookup of one county's latest weeks is a binary search and a few slices
+# instead of parsing JSON.
+#
+# The file is a header followed by 8 byte aligned sections:
+#
+#   fips index   the county_fips of every county, sorted, as 5 byte strings,
+#                with the first row and row count of each county
+#   rows         date_updated packed by history.pack_date (uint16), county
+#                and community level as ids in the string table (uint32),
+#                and a float64 column per numeric CDC column
+#   strings      the distinct county names and levels, each stored once
+#
+# Rows are sorted by county_fips and newest first. refresh() merges in the
+# weeks published since the cache was written and replaces the file in one
+# rename, and CountyCache.reload() maps the new file when it has changed.
+#
+#   python3 tools/county_cache.py build export.csv.gz [--cache counties.cache]
+#   python3 tools/county_cache.py lookup 37183 [--weeks 2] [--cache ...]
+#   python3 tools/county_cache.py refresh [--upstream URL] [--cache ...]
+import argparse
+import array
+import datetime
+import json
+import mmap
+import os
+import ssl
+import struct
+import sys
+import time
+import urllib.request
+from urllib.parse import quote, urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+import covid_values  # noqa: E402
+import history  # noqa: E402
+import nationwide  # noqa: E402
+
+PATH = "counties.cache"
+UPSTREAM = "https://data.cdc.gov/resource/3nnm-4jni.json"
+VERSION = 1
+NUMERIC_FIELDS = nationwide.NUMERIC_FIELDS
+
+_MAGIC = b"CDCC"
+# magic, version, rows, counties, strings, latest date_updated and the
+# Last-Modified header of the response it came in
+_HEADER = "<4sHIII23s29s"
+_FIPS = np.dtype("S5")
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _sections(row_count, county_count, string_count):
+    # (name, dtype, length) of every section in file order
+    sections = [
+        ("fips", _FIPS, county_count),
+        ("starts", np.dtype("<u4"), county_count),
+        ("counts", np.dtype("<u4"), county_count),
+        ("date_updated", np.dtype("<u2"), row_count),
+        ("county", np.dtype("<u4"), row_count),
+        ("covid_19_community_level", np.dtype("<u4"), row_count),
+    ]
+    sections.extend((field, np.dtype("<f8"), row_count) for field in NUMERIC_FIELDS)
+    sections.append(("string_offsets", np.dtype("<u4"), string_count + 1))
+    return sections
+
+
+class ColumnBuilder:
+    # collects rows holding covid_values.FIELDS in order into compact columns
+    def __init__(self):
+        self.fips = []
+        self.dates = array.array("H")
+        self.county = array.array("I")
+        self.level = array.array("I")
+        self.numbers = {field: array.array("d") for field in NUMERIC_FIELDS}
+        self.strings = {}  # {text: id}
+        self._numeric = [
+            (position, self.numbers[field])
+            for position, field in enumerate(covid_values.FIELDS)
+            if field in NUMERIC_FIELDS
+        ]
+        self._iso_date = nationwide.iso_dates()
+        self._packed_dates = {}
+
+    def _string(self, text):
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+        return string_id
+
+    def _date(self, text):
+        packed = self._packed_dates.get(text)
+        if packed is None:
+            packed = self._packed_dates[text] = history.pack_date(self._iso_date(text))
+        return packed
+
+    def add(self, row):
+        self.fips.append(row[nationwide.FIPS])
+        self.dates.append(self._date(row[nationwide.DATE]))
+        self.county.append(self._string(row[nationwide.COUNTY]))
+        self.level.append(self._string(row[nationwide.LEVEL] or ""))
+        for position, numbers in self._numeric:
+            numbers.append(nationwide.number(row[position]))
+
+    def add_records(self, records):
+        # records as dicts, the way Socrata's JSON has them
+        for record in records:
+            self.add([record.get(field, "") for field in covid_values.FIELDS])
+
+    def columns(self):
+        strings = sorted(self.strings, key=self.strings.get)
+        columns = {
+            "fips": np.array(self.fips, dtype=_FIPS),
+            "date_updated": np.frombuffer(self.dates, dtype=np.uint16),
+            "county": np.frombuffer(self.county, dtype=np.uint32),
+            "covid_19_community_level": np.frombuffer(self.level, dtype=np.uint32),
+        }
+        for field, numbers in self.numbers.items():
+            columns[field] = np.frombuffer(numbers, dtype=np.float64)
+        return columns, strings
+
+
+def merge(old, new, weeks=None):
+    # (columns, strings) of both, rows of new winning over rows of old with
+    # the same county and date, only the newest `weeks` weeks if given
+    columns, strings = old
+    new_columns, new_strings = new
+    ids = {text: index for index, text in enumerate(strings)}
+    strings = list(strings)
+    for text in new_strings:
+        if text not in ids:
+            ids[text] = len(strings)
+            strings.append(text)
+    remap = np.array([ids[text] for text in new_strings], dtype=np.uint32)
+
+    merged = {}
+    for name, column in columns.items():
+        new_column = new_columns[name]
+        if name in ("county", "covid_19_community_level") and len(new_column):
+            new_column = remap[new_column]
+        # new rows first, so they are the ones kept by np.unique below
+        merged[name] = np.concatenate((new_column, column))
+    # one number per county and date that sorts by fips, then newest first
+    _, fips_ids = np.unique(merged["fips"], return_inverse=True)
+    keys = fips_ids.astype(np.int64) << 16 | (0xFFFF - merged["date_updated"])
+    _, order = np.unique(keys, return_index=True)
+    merged = {name: column[order] for name, column in merged.items()}
+    if weeks is not None and len(order):
+        newest = datetime.date.fromisoformat(
+            history.unpack_date(int(merged["date_updated"].max()))[0:10]
+        )
+        oldest = history.pack_date(
+            (newest - datetime.timedelta(weeks=weeks - 1)).isoformat()
+        )
+        kept = merged["date_updated"] >= oldest
+        merged = {name: column[kept] for name, column in merged.items()}
+    return merged, strings
+
+
+def write(path, columns, strings, last_modified=""):
+    # writes sorted, merged columns next to path and renames the file over
+    # it, so a reader never maps a half written cache
+    fips, starts, counts = np.unique(
+        columns["fips"], return_index=True, return_counts=True
+    )
+    encoded = [text.encode("utf-8") for text in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(text) for text in encoded], out=string_offsets[1:])
+    row_count = len(columns["fips"])
+    latest = (
+        history.unpack_date(int(columns["date_updated"].max())) if row_count else ""
+    )
+    data = dict(columns, fips=fips, starts=starts, counts=counts)
+    data["string_offsets"] = string_offsets
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as cache_file:
+        cache_file.write(
+            struct.pack(
+                _HEADER,
+                _MAGIC,
+                VERSION,
+                row_count,
+                len(fips),
+                len(encoded),
+                latest.encode(),
+                last_modified.encode(),
+            )
+        )
+        for name, dtype, length in _sections(row_count, len(fips), len(encoded)):
+            cache_file.write(bytes(_align(cache_file.tell()) - cache_file.tell()))
+            cache_file.write(np.ascontiguousarray(data[name], dtype=dtype).tobytes())
+        cache_file.write(b"".join(encoded))
+    os.replace(temporary, path)
+
+
+class CountyCache:
+    def __init__(self, path=PATH):
+        self.path = path
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        self._stat = os.fstat(self._file.fileno())
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            rows,
+            counties,
+            strings,
+            latest,
+            last_modified,
+        ) = struct.unpack_from(_HEADER, self._map, 0)
+        if magic != _MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("%s is not a version %d cache" % (self.path, VERSION))
+        self.latest = latest.rstrip(b"\0").decode() or None
+        self.last_modified = last_modified.rstrip(b"\0").decode() or None
+        self.row_count = rows
+        self._columns = {}
+        offset = struct.calcsize(_HEADER)
+        for name, dtype, length in _sections(rows, counties, strings):
+            offset = _align(offset)
+            self._columns[name] = np.frombuffer(
+                self._map, dtype=dtype, count=length, offset=offset
+            )
+            offset += dtype.itemsize * length
+        self._strings_offset = offset
+        self._string_cache = {}
+
+    def close(self):
+        self._columns = {}
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # a NumPy view someone still holds keeps the old map open
+                # until it is collected
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reload(self):
+        # maps the file again if refresh() has replaced it. Returns whether
+        # it had
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_mtime_ns) == (
+            self._stat.st_ino,
+            self._stat.st_mtime_ns,
+        ):
+            return False
+        self.close()
+        self._open()
+        return True
+
+    def _string(self, string_id):
+        text = self._string_cache.get(string_id)
+        if text is None:
+            offsets = self._columns["string_offsets"]
+            start = self._strings_offset + int(offsets[string_id])
+            end = self._strings_offset + int(offsets[string_id + 1])
+            text = self._string_cache[string_id] = self._map[start:end].decode()
+        return text
+
+    def fips_codes(self):
+        return [fips.decode() for fips in self._columns["fips"]]
+
+    def _rows(self, fips):
+        # the first row and row count of a county, (0, 0) if it is not cached
+        key = fips.encode()
+        codes = self._columns["fips"]
+        index = int(np.searchsorted(codes, key))
+        if index == len(codes) or codes[index] != key:
+            return 0, 0
+        return int(self._columns["starts"][index]), int(self._columns["counts"][index])
+
+    def rows(self, fips, count):
+        # up to count weeks of one county, newest first, shaped like the
+        # Socrata records
+        start, length = self._rows(fips)
+        stop = start + min(count, length)
+        # one slice per column, NumPy scalars are slow one at a time
+        columns = {
+            name: self._columns[name][start:stop].tolist()
+            for name in ("date_updated", "county", "covid_19_community_level")
+            + NUMERIC_FIELDS
+        }
+        records = []
+        for row in range(stop - start):
+            record = {
+                "date_updated": history.unpack_date(columns["date_updated"][row]),
+                "county_fips": fips,
+                "county": self._string(columns["county"][row]),
+                "covid_19_community_level": self._string(
+                    columns["covid_19_community_level"][row]
+                ),
+            }
+            for field in NUMERIC_FIELDS:
+                record[field] = columns[field][row]
+            records.append(record)
+        return records
+
+    def columns(self):
+        # (columns, strings) of every row, copied out of the map, for merge()
+        names = ["fips", "date_updated", "county", "covid_19_community_level"]
+        names.extend(NUMERIC_FIELDS)
+        fips = np.repeat(self._columns["fips"], self._columns["counts"])
+        columns = {name: np.array(self._columns[name]) for name in names[1:]}
+        columns["fips"] = fips
+        strings = [
+            self._string(index)
+            for index in range(len(self._columns["string_offsets"]) - 1)
+        ]
+        return columns, strings
+
+
+def open_or_none(path):
+    try:
+        return CountyCache(path)
+    except (OSError, ValueError):
+        return None
+
+
+def empty():
+    return ColumnBuilder().columns()
+
+
+def refresh(path, fetch, weeks=history.WEEKS):
+    # adds the weeks newer than the cache's latest to it. fetch(since) gets
+    # the Socrata records with date_updated after since, every week when
+    # since is None. Returns the number of rows added
+    cache = open_or_none(path)
+    since = cache.latest if cache else None
+    old = cache.columns() if cache else empty()
+    if cache:
+        cache.close()
+    builder = ColumnBuilder()
+    builder.add_records(fetch(since))
+    if not builder.fips:
+        return 0
+    write(path, *merge(old, builder.columns(), weeks))
+    return len(builder.fips)
+
+
+def socrata_fetch(upstream, app_token=None, context=None):
+    # a fetch for refresh() that asks Socrata for the rows after since
+    def fetch(since):
+        query = {
+            "$select": ",".join(covid_values.FIELDS),
+            "$order": "date_updated DESC,county_fips",
+            "$limit": "5000000",
+        }
+        if since:
+            query["$where"] = "date_updated > '%s'" % since
+        url = upstream + "?" + urlencode(query, quote_via=quote, safe="$,'")
+        headers = {"X-App-Token": app_token} if app_token else {}
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request, timeout=120, context=context) as response:
+            return json.load(response)
+
+    return fetch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache", default=PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="from a CSV or JSON Lines export")
+    build.add_argument("export")
+    build.add_argument("--format", choices=("csv", "jsonl"))
+    build.add_argument("--weeks", type=int, help="keep only the newest weeks")
+    lookup = commands.add_parser("lookup")
+    lookup.add_argument("fips")
+    lookup.add_argument("--weeks", type=int, default=2)
+    update = commands.add_parser("refresh", help="add newly published weeks")
+    update.add_argument("--upstream", default=UPSTREAM)
+    update.add_argument("--app-token")
+    update.add_argument("--cafile", help="extra CA to trust, e.g. the stub's")
+    update.add_argument("--weeks", type=int, default=history.WEEKS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "build":
+        builder = ColumnBuilder()
+        with nationwide.open_input(args.export) as lines:
+            if (args.format or nationwide.input_format(args.export)) == "jsonl":
+                rows = nationwide.jsonl_rows(lines)
+            else:
+                rows = nationwide.csv_rows(lines)
+            for row in rows:
+                builder.add(row)
+        write(args.cache, *merge(empty(), builder.columns(), args.weeks))
+        cache = CountyCache(args.cache)
+        print(
+            "%d rows of %d counties as of %s, %d bytes, %.2f s"
+            % (
+                cache.row_count,
+                len(cache.fips_codes()),
+                cache.latest,
+                os.path.getsize(args.cache),
+                time.perf_counter() - start,
+            )
+        )
+    elif args.command == "lookup":
+        cache = CountyCache(args.cache)
+        records = cache.rows(args.fips, args.weeks)
+        lookup_ms = (time.perf_counter() - start) * 1000
+        for record in records:
+            print(json.dumps(record))
+        print("%.3f ms" % lookup_ms, file=sys.stderr)
+    else:
+        context = ssl.create_default_context()
+        if args.cafile:
+            context.load_verify_locations(args.cafile)
+        added = refresh(
+            args.cache,
+            socrata_fetch(args.upstream, args.app_token, context),
+            args.weeks,
+        )
+        print("%d rows added" % added)
+
+
+if __name__ == "__main__":
+    main()
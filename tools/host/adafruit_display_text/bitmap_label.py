@@ -0,0 +1,96 @@
+# Desktop stand-in for adafruit_display_text.bitmap_label.Label.
+#
+# Text is laid out the way the real label does it, into a list of pixels,
+# every time the text or line spacing changes. LAYOUTS counts the layouts
+# so tools/run_host.py can report how much text work a wake did.
+
+# [layouts since the stand-in was imported]
+LAYOUTS = [0]
+
+
+class Label:
+    def __init__(
+        self,
+        font,
+        *,
+        text="",
+        scale=1,
+        color=0xFFFFFF,
+        anchor_point=(0, 0),
+        anchored_position=(0, 0),
+        line_spacing=1.25,
+        **kwargs,
+    ):
+        self.font = font
+        self.scale = scale
+        self.color = color
+        self.anchor_point = anchor_point
+        self.anchored_position = anchored_position
+        self._line_spacing = line_spacing
+        self._text = text
+        self._pixels = []
+        self.bounding_box = (0, 0, 0, 0)
+        self._layout()
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+        self._layout()
+
+    @property
+    def line_spacing(self):
+        return self._line_spacing
+
+    @line_spacing.setter
+    def line_spacing(self, line_spacing):
+        self._line_spacing = line_spacing
+        self._layout()
+
+    def _layout(self):
+        # same arithmetic as adafruit_display_text.label.Label._update_text
+        LAYOUTS[0] += 1
+        y_offset = self.font.ascent // 2
+        pixels = []
+        left = top = right = bottom = 0
+        x = y = 0
+        for character in self._text:
+            if character == "\n":
+                y += int(self._line_spacing * self.font.height)
+                x = 0
+                continue
+            glyph = self.font.get_glyph(ord(character))
+            if glyph is None:
+                continue
+            metrics, rows = glyph
+            dx = metrics.left_side_bearing
+            dy = -metrics.character_descent
+            glyph_top = y - metrics.bitmap_height - dy + y_offset
+            right = max(
+                right, x + metrics.character_width, x + metrics.bitmap_width + dx
+            )
+            top = min(top, glyph_top)
+            bottom = max(bottom, y - dy + y_offset)
+            left = min(left, x + dx)
+            for row_index, row in enumerate(rows):
+                for column, pixel in enumerate(row):
+                    if pixel:
+                        pixels.append((x + dx + column, glyph_top + row_index))
+            x += metrics.character_width
+        self.bounding_box = (left, top, right - left, bottom - top)
+        self._pixels = pixels
+
+    def origin(self):
+        left, top, width, height = self.bounding_box
+        return (
+            int(self.anchored_position[0] - left - round(self.anchor_point[0] * width)),
+            int(self.anchored_position[1] - top - round(self.anchor_point[1] * height)),
+        )
+
+    def draw(self, framebuffer):
+        x, y = self.origin()
+        for pixel_x, pixel_y in self._pixels:
+            framebuffer.set(x + pixel_x, y + pixel_y)
@@ -0,0 +1,318 @@
+# Desktop stand-in for adafruit_magtag.magtag.MagTag.
+#
+# Implements the part of the API code.py uses, with the same _text entries,
+# _fonts and root_group as adafruit_portalbase.PortalBase. Labels come from
+# the adafruit_display_text stand-in and are drawn into a 296x128 one bit
+# framebuffer on refresh(). Requests go out with http.client through
+# host_network, which can send https://data.cdc.gov to tools/cdc_stub.py.
+import http.client
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+import alarm
+import host_network
+from adafruit_display_text.bitmap_label import Label
+import rtc
+import wifi
+from host_network import stats  # noqa: F401 - read by tools/run_host.py
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+from pcf import PCF  # noqa: E402
+
+WIDTH = 296
+HEIGHT = 128
+
+# where get_local_time sends its request, None to skip the round trip
+TIME_SERVICE_URL = None
+# button name -> pressed, read by the button_*_pressed properties
+BUTTONS = {"a": False, "b": False, "c": False, "d": False}
+
+
+class Response:
+    def __init__(self, connection, response):
+        self._connection = connection
+        self._response = response
+        self.bytes_received = 0
+        self.status_code = response.status
+        self.reason = response.reason.encode()
+        self.headers = {name.lower(): value for name, value in response.getheaders()}
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        while True:
+            chunk = self._response.read(chunk_size)
+            if not chunk:
+                break
+            self.bytes_received += len(chunk)
+            yield chunk
+        self.close()
+
+    @property
+    def content(self):
+        return b"".join(self.iter_content(4096))
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def close(self):
+        if self._connection is None:
+            return
+        self._response.close()
+        self._connection.close()
+        self._connection = None
+
+
+class Network:
+    def __init__(self):
+        self.connected = False
+
+    def connect(self, max_attempts=10):
+        if not self.connected:
+            wifi.radio.connect("host")
+            self.connected = True
+
+    def fetch(self, url, *, headers=None, timeout=10):
+        self.connect()
+        target = urlsplit(url)
+        if target.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                target.netloc, timeout=timeout, context=host_network.client_context()
+            )
+        else:
+            connection = http.client.HTTPConnection(target.netloc, timeout=timeout)
+        connection._create_connection = host_network.create_connection
+        path = target.path + ("?" + target.query if target.query else "")
+        connection.request("GET", path, headers=headers or {})
+        return Response(connection, connection.getresponse())
+
+    def get_local_time(self, location=None, max_attempts=10):
+        # the host clock is already right, only the round trip is simulated.
+        # The reply has the Adafruit IO format and is written to the RTC
+        if TIME_SERVICE_URL:
+            reply = self.fetch(TIME_SERVICE_URL).text
+        else:
+            reply = time.strftime("%Y-%m-%d %H:%M:%S.000 %j %u %z %Z")
+        rtc.RTC().datetime = time.localtime()
+        return reply
+
+
+class Peripherals:
+    def __init__(self):
+        self.neopixel_disable = False
+        self.speaker_disable = False
+        self.deinitialized = False
+
+    def deinit(self):
+        self.deinitialized = True
+
+    @property
+    def battery(self):
+        return 4.2
+
+    @property
+    def button_a_pressed(self):
+        return BUTTONS["a"]
+
+    @property
+    def button_b_pressed(self):
+        return BUTTONS["b"]
+
+    @property
+    def button_c_pressed(self):
+        return BUTTONS["c"]
+
+    @property
+    def button_d_pressed(self):
+        return BUTTONS["d"]
+
+    @property
+    def any_button_pressed(self):
+        return any(BUTTONS.values())
+
+
+class Font:
+    def __init__(self, path):
+        self.pcf = PCF.read(os.path.join(ROOT, path.lstrip("/")))
+        self.ascent, self.descent = self.pcf.accelerators()
+        self.height = max(m.character_ascent for m in self.pcf.metrics) + max(
+            m.character_descent for m in self.pcf.metrics
+        )
+        self.glyphs = {}
+        self.glyph_loads = 0
+
+    def load_glyphs(self, code_points):
+        if isinstance(code_points, (str, bytes)):
+            code_points = [c if isinstance(c, int) else ord(c) for c in code_points]
+        for code_point in code_points:
+            if code_point not in self.glyphs:
+                self.glyph_loads += 1
+                self.glyphs[code_point] = self.pcf.glyph(code_point)
+
+    def get_glyph(self, code_point):
+        self.load_glyphs((code_point,))
+        return self.glyphs[code_point]
+
+
+class Framebuffer:
+    def __init__(self):
+        self.pixels = bytearray(WIDTH * HEIGHT)  # 1 = black
+
+    def clear(self):
+        self.pixels[:] = bytes(WIDTH * HEIGHT)
+
+    def set(self, x, y):
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            self.pixels[y * WIDTH + x] = 1
+
+    def changed_box(self, pixels):
+        # (x, y, width, height) around the pixels that differ from `pixels`
+        changed = [i for i in range(WIDTH * HEIGHT) if self.pixels[i] != pixels[i]]
+        if not changed:
+            return None
+        xs = [i % WIDTH for i in changed]
+        top, bottom = changed[0] // WIDTH, changed[-1] // WIDTH
+        return (min(xs), top, max(xs) - min(xs) + 1, bottom - top + 1)
+
+    def save_png(self, path):
+        import struct
+        import zlib
+
+        rows = b"".join(
+            b"\0"
+            + bytes(0 if p else 255 for p in self.pixels[y * WIDTH : (y + 1) * WIDTH])
+            for y in range(HEIGHT)
+        )
+
+        def chunk(kind, data):
+            return (
+                struct.pack(">I", len(data))
+                + kind
+                + data
+                + struct.pack(">I", zlib.crc32(kind + data))
+            )
+
+        with open(path, "wb") as png:
+            png.write(b"\x89PNG\r\n\x1a\n")
+            png.write(
+                chunk(b"IHDR", struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 0, 0, 0, 0))
+            )
+            png.write(chunk(b"IDAT", zlib.compress(rows)))
+            png.write(chunk(b"IEND", b""))
+
+
+# e-ink keeps its image without power, so the panel outlives each MagTag
+PANEL = Framebuffer()
+
+
+class Display:
+    def __init__(self):
+        self.framebuffer = PANEL
+        self.refreshes = 0
+        # the area whose pixels each refresh changed, None if it changed none
+        self.changed_boxes = []
+
+    @property
+    def time_to_refresh(self):
+        return 0
+
+
+class Graphics:
+    def __init__(self):
+        self.display = Display()
+
+
+class MagTag:
+    def __init__(self, *, url=None, headers=None, **kwargs):
+        self.url = url
+        self.headers = headers
+        self.peripherals = Peripherals()
+        self.network = Network()
+        self.graphics = Graphics()
+        self._fonts = {}
+        self._text = []
+        self.root_group = []
+
+    @property
+    def display(self):
+        return self.graphics.display
+
+    def add_text(
+        self,
+        text_position=(0, 0),
+        text_font=None,
+        text_color=0x000000,
+        text_scale=1,
+        line_spacing=1.25,
+        text_anchor_point=(0, 0.5),
+        is_data=True,
+        text=None,
+        **kwargs,
+    ):
+        if text_font not in self._fonts:
+            self._fonts[text_font] = Font(text_font)
+        self._text.append(
+            {
+                "label": None,
+                "font": text_font,
+                "color": text_color,
+                "position": text_position,
+                "scale": text_scale,
+                "line_spacing": line_spacing,
+                "anchor_point": text_anchor_point,
+            }
+        )
+        index = len(self._text) - 1
+        if text is not None:
+            self.set_text(text, index, False)
+        return index
+
+    def set_text(self, val, index=0, auto_refresh=True):
+        # what PortalBase.set_text does for labels without wrap or maxlen,
+        # including laying a new label out twice
+        string = str(val)
+        entry = self._text[index]
+        if string:
+            if entry["label"] is None:
+                entry["label"] = Label(
+                    self._fonts[entry["font"]], text=string, scale=entry["scale"]
+                )
+                self.root_group.append(entry["label"])
+            else:
+                entry["label"].text = string
+            entry["label"].color = entry["color"]
+            entry["label"].anchor_point = entry["anchor_point"]
+            entry["label"].anchored_position = entry["position"]
+            entry["label"].line_spacing = entry["line_spacing"]
+        elif entry["label"] is not None:
+            self.root_group.remove(entry["label"])
+            entry["label"] = None
+        if auto_refresh:
+            self.refresh()
+
+    def preload_font(self, glyphs=None, index=0):
+        self._fonts[self._text[index]["font"]].load_glyphs(glyphs)
+
+    def refresh(self):
+        display = self.graphics.display
+        before = bytes(display.framebuffer.pixels)
+        display.framebuffer.clear()
+        for label in self.root_group:
+            label.draw(display.framebuffer)
+        display.refreshes += 1
+        display.changed_boxes.append(display.framebuffer.changed_box(before))
+
+    def fetch(self, refresh_url=None, timeout=10, auto_refresh=True):
+        response = self.network.fetch(refresh_url or self.url, headers=self.headers)
+        return response.text
+
+    def get_local_time(self, location=None, max_attempts=10):
+        return self.network.get_local_time(location, max_attempts)
+
+    def exit_and_deep_sleep(self, sleep_time):
+        alarm.exit_and_deep_sleep_until_alarms(
+            alarm.time.TimeAlarm(monotonic_time=time.monotonic() + sleep_time)
+        )
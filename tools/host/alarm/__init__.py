@@ -0,0 +1,16 @@
+# Desktop stand-in for the CircuitPython alarm module. Deep sleep raises
+# DeepSleep, which tools/run_host.py catches to start the next wake.
+from . import pin, time
+
+sleep_memory = bytearray(8192)
+wake_alarm = None
+
+
+class DeepSleep(BaseException):
+    def __init__(self, alarms):
+        super().__init__(alarms)
+        self.alarms = alarms
+
+
+def exit_and_deep_sleep_until_alarms(*alarms):
+    raise DeepSleep(alarms)
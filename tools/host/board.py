@@ -0,0 +1,4 @@
+BUTTON_A = "BUTTON_A"
+BUTTON_B = "BUTTON_B"
+BUTTON_C = "BUTTON_C"
+BUTTON_D = "BUTTON_D"
@@ -0,0 +1,91 @@
+# Desktop stand-in for the parts of CircuitPython's displayio that code.py
+# uses directly. A TileGrid draws its dark, opaque pixels into the
+# framebuffer of the desktop MagTag when the panel is refreshed.
+import struct
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self._values = bytearray(width * height)
+
+    def __getitem__(self, position):
+        x, y = position
+        return self._values[y * self.width + x]
+
+    def __setitem__(self, position, value):
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("pixel out of bounds")
+        self._values[y * self.width + x] = value
+
+    def fill(self, value):
+        self._values[:] = bytes([value]) * len(self._values)
+
+
+class Palette:
+    def __init__(self, color_count):
+        self._colors = [0] * color_count
+        self._transparent = set()
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        self._colors[index] = color
+
+    def make_transparent(self, index):
+        self._transparent.add(index)
+
+    def is_dark(self, index):
+        if index in self._transparent:
+            return False
+        color = self._colors[index]
+        return (color >> 16) + (color >> 8 & 0xFF) + (color & 0xFF) < 3 * 0x80
+
+
+class OnDiskBitmap:
+    # the 1 bit, uncompressed BMPs tools/render_screen.py makes
+    def __init__(self, file):
+        if isinstance(file, str):
+            with open(file, "rb") as bmp_file:
+                data = bmp_file.read()
+        else:
+            data = file.read()
+        if data[:2] != b"BM":
+            raise ValueError("Invalid BMP file")
+        offset, _, width, height, _, bits = struct.unpack_from("<IIiiHH", data, 10)
+        if bits != 1:
+            raise ValueError("only 1 bit BMPs are supported here")
+        self.width = width
+        self.height = abs(height)
+        self.pixel_shader = Palette(2)
+        for index in range(2):
+            blue, green, red = data[54 + 4 * index : 57 + 4 * index]
+            self.pixel_shader[index] = red << 16 | green << 8 | blue
+        self._rows = []
+        row_bytes = (width + 31) // 32 * 4
+        for row in range(self.height):
+            start = offset + row * row_bytes
+            self._rows.append(data[start : start + row_bytes])
+        if height > 0:  # stored bottom up
+            self._rows.reverse()
+
+    def __getitem__(self, position):
+        x, y = position
+        return self._rows[y][x >> 3] >> (7 - (x & 7)) & 1
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, x=0, y=0, **kwargs):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.x = x
+        self.y = y
+
+    def draw(self, framebuffer):
+        for y in range(self.bitmap.height):
+            for x in range(self.bitmap.width):
+                if self.pixel_shader.is_dark(self.bitmap[x, y]):
+                    framebuffer.set(self.x + x, self.y + y)
@@ -0,0 +1,159 @@
+# Networking shared by the desktop stand-ins.
+#
+# HOSTS sends connections for a host name somewhere else, so data.cdc.gov
+# and io.adafruit.com can be served by tools/cdc_stub.py. Every connection
+# made through the stand-ins is logged in stats, one entry per request, the
+# way tools/run_host.py reports them. TLS contexts trust the stub's test
+# certificate in tools/fixtures/stub_tls as well as the usual CAs.
+import errno
+import os
+import re
+import socket
+import ssl
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CERTIFICATE = os.path.join(ROOT, "tools", "fixtures", "stub_tls", "cert.pem")
+
+# (host, port) -> (host, port) the connection really goes to
+HOSTS = {}
+# how long wifi.radio.connect() takes
+JOIN_SECONDS = 0.0
+
+_create_default_context = ssl.create_default_context
+_HOST_HEADER = re.compile(rb"\r\nhost:\s*([^\r]+)", re.IGNORECASE)
+
+
+class NetworkStats:
+    def __init__(self):
+        self.requests = []  # (url, status, body bytes, ms)
+        self.connections = 0
+        self.handshakes = 0
+        self.resumed = 0  # handshakes that resumed a TLS session
+        self.handshake_ms = 0.0
+
+
+stats = NetworkStats()
+
+
+def wait(seconds):
+    # a real wait even while tools/run_host.py has time.sleep patched
+    if seconds:
+        threading.Event().wait(seconds)
+
+
+def resolve(host, port):
+    return (
+        HOSTS.get((host, port))
+        or socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)[0][-1]
+    )
+
+
+class _Logged:
+    # logs each request sent on this connection when the next one is sent
+    # or the connection is closed
+
+    def connect(self, address):
+        stats.connections += 1
+        self._started = time.monotonic()
+        return super().connect(address)
+
+    def send(self, data, flags=0):
+        self._note_request(data)
+        return super().send(data, flags)
+
+    def sendall(self, data, flags=0):
+        self._note_request(data)
+        return super().sendall(data, flags)
+
+    def _note_request(self, data):
+        data = bytes(data)
+        if not data.startswith(b"GET "):
+            return  # the rest of a request already noted
+        self._log_request()
+        path = data.split(b" ", 2)[1].decode()
+        host = _HOST_HEADER.search(data)
+        scheme = "https" if isinstance(self, ssl.SSLSocket) else "http"
+        self._url = "%s://%s%s" % (scheme, host[1].decode() if host else "", path)
+        self._head = b""
+        self._received = 0
+        if getattr(self, "_started", None) is None:
+            # wrapped in TLS after connecting, like http.client does
+            self._started = time.monotonic()
+
+    def recv_into(self, buffer, nbytes=0, flags=0):
+        count = super().recv_into(buffer, nbytes, flags)
+        self._count(bytes(buffer[:count]))
+        return count
+
+    def recv(self, size, flags=0):
+        data = super().recv(size, flags)
+        self._count(data)
+        return data
+
+    def _count(self, data):
+        if getattr(self, "_url", None) is None:
+            return
+        self._received += len(data)
+        if b"\r\n\r\n" not in self._head:
+            self._head += data
+
+    def _log_request(self):
+        url = getattr(self, "_url", None)
+        if url is not None:
+            self._url = None
+            head, _, _ = self._head.partition(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1]) if head else 0
+            stats.requests.append(
+                (
+                    url,
+                    status,
+                    max(self._received - len(head) - 4, 0),
+                    int((time.monotonic() - self._started) * 1000),
+                )
+            )
+            # a later request on this connection is timed from its sending
+            self._started = None
+
+    def _real_close(self):
+        # called once the socket and any makefile() readers are all closed
+        self._log_request()
+        super()._real_close()
+
+
+class HostSocket(_Logged, socket.socket):
+    pass
+
+
+class HostSSLSocket(_Logged, ssl.SSLSocket):
+    def do_handshake(self, block=False):
+        started = time.monotonic()
+        super().do_handshake(block)
+        stats.handshakes += 1
+        stats.resumed += self.session_reused
+        stats.handshake_ms += (time.monotonic() - started) * 1000
+
+    def recv_into(self, buffer, nbytes=0, flags=0):
+        # CircuitPython raises OSError(EAGAIN) when a non-blocking TLS socket
+        # has nothing to read, CPython an SSLWantReadError
+        try:
+            return super().recv_into(buffer, nbytes, flags)
+        except ssl.SSLWantReadError:
+            raise BlockingIOError(errno.EAGAIN, "no data yet") from None
+
+
+def create_connection(address, timeout=None, source_address=None, **kwargs):
+    # socket.create_connection through HOSTS, for http.client
+    sock = HostSocket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(resolve(*address))
+    return sock
+
+
+def client_context(*args, **kwargs):
+    # what ssl.create_default_context() returns while the stand-ins are in use
+    context = _create_default_context(*args, **kwargs)
+    context.load_verify_locations(CERTIFICATE)
+    context.sslsocket_class = HostSSLSocket
+    return context
@@ -0,0 +1,15 @@
+# Stand-in for the CircuitPython rtc module. The desktop clock is left alone;
+# the last datetime written is kept so a wake can be checked against it.
+import time
+
+
+class RTC:
+    _datetime = None
+
+    @property
+    def datetime(self):
+        return RTC._datetime or time.localtime()
+
+    @datetime.setter
+    def datetime(self, value):
+        RTC._datetime = value
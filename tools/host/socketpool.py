@@ -0,0 +1,29 @@
+# Stand-in for the CircuitPython socketpool module on top of the desktop
+# socket module, with connections routed and logged by host_network.
+import socket
+
+import host_network
+
+
+class SocketPool:
+    AF_INET = socket.AF_INET
+    SOCK_STREAM = socket.SOCK_STREAM
+    IPPROTO_TCP = socket.IPPROTO_TCP
+    TCP_NODELAY = socket.TCP_NODELAY
+
+    def __init__(self, radio):
+        self.radio = radio
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        return [
+            (
+                self.AF_INET,
+                self.SOCK_STREAM,
+                0,
+                "",
+                host_network.resolve(host, port),
+            )
+        ]
+
+    def socket(self, family=AF_INET, type=SOCK_STREAM, proto=0):
+        return host_network.HostSocket(family, type, proto)
@@ -0,0 +1,17 @@
+# Stand-in for the CircuitPython wifi module. Joining takes
+# host_network.JOIN_SECONDS.
+import host_network
+
+
+class Radio:
+    def __init__(self):
+        self.enabled = True
+        self.connected = False
+        self.ipv4_address = "127.0.0.1"
+
+    def connect(self, ssid, password=None, **kwargs):
+        host_network.wait(host_network.JOIN_SECONDS)
+        self.connected = True
+
+
+radio = Radio()
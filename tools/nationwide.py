@@ -0,0 +1,227 @@
+# The values a tracker shows, for every county in a full 3nnm-4jni export.
+#
+# Reads a CSV or JSON Lines export (gzipped if the name ends in .gz, - for
+# stdin) one row at a time, keeping only the newest two weeks of each
+# county, so memory grows with the number of counties and not with the
+# rows. Once the file is read, tools/vector_values.py computes every county
+# at once. Writes one line per county with at least two weeks, as JSON
+# Lines or CSV:
+#
+#   python3 tools/nationwide.py export.csv.gz [--out values.jsonl]
+#   curl -s 'https://data.cdc.gov/resource/3nnm-4jni.csv?$limit=5000000' \
+#       | python3 tools/nationwide.py --format csv - --out values.csv
+import argparse
+import csv
+import gzip
+import io
+import json
+import operator
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+import covid_values  # noqa: E402
+import vector_values  # noqa: E402
+
+# positions in the rows, which hold covid_values.FIELDS in order
+DATE, FIPS, COUNTY, LEVEL = 0, 1, 2, 4
+NUMERIC_FIELDS = ("county_population",) + tuple(
+    metric[1] for metric in covid_values.METRICS
+)
+
+
+def open_input(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def input_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    return "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def iso_dates():
+    # date_updated as "2022-12-29T00:00:00.000" whether the export wrote it
+    # that way or as "12/29/2022", converted once per distinct date
+    converted = {}
+
+    def iso_date(text):
+        date = converted.get(text)
+        if date is None:
+            if "/" in text:
+                month, day, year = text.split(" ")[0].split("/")
+                date = "%s-%02d-%02dT00:00:00.000" % (year, int(month), int(day))
+            else:
+                date = text
+            converted[text] = date
+        return date
+
+    return iso_date
+
+
+def csv_rows(lines):
+    # covid_values.FIELDS of every row, in that order
+    reader = csv.reader(lines)
+    header = next(reader)
+    try:
+        fields = operator.itemgetter(
+            *(header.index(field) for field in covid_values.FIELDS)
+        )
+    except ValueError as error:
+        raise SystemExit("the export is missing a column: %s" % error)
+    return map(fields, reader)
+
+
+def jsonl_rows(lines):
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            yield tuple(record.get(field, "") for field in covid_values.FIELDS)
+
+
+class LatestWeeks:
+    # the newest two weeks of every county seen, by date_updated
+    def __init__(self):
+        # {fips: [newest date, newest row, date before, row before]}, the
+        # dates in ISO form, "" and None while there is no week before
+        self.counties = {}
+        self.rows = 0
+        self._iso_date = iso_dates()
+
+    def add(self, row):
+        self.rows += 1
+        date = self._iso_date(row[DATE])
+        kept = self.counties.get(row[FIPS])
+        if kept is None:
+            self.counties[row[FIPS]] = [date, row, "", None]
+        elif date > kept[0]:
+            kept[2:] = kept[:2]
+            kept[:2] = date, row
+        elif kept[2] < date < kept[0]:
+            kept[2:] = date, row
+
+    def pairs(self):
+        # [(date, newest row), (date, week before)] of the counties with two
+        # weeks, by fips
+        pairs = []
+        for fips in sorted(self.counties):
+            newest_date, newest, prior_date, prior = self.counties[fips]
+            if prior is not None:
+                pairs.append(((newest_date, newest), (prior_date, prior)))
+        return pairs
+
+
+def number(text):
+    # covid_values.get_float_or_zero, quietly
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def columns(rows):
+    # rows are (date, row) pairs from LatestWeeks
+    rows = [row for _, row in rows]
+    arrays = {}
+    for position, field in enumerate(covid_values.FIELDS):
+        if field in NUMERIC_FIELDS:
+            arrays[field] = np.fromiter(
+                (number(row[position]) for row in rows), dtype=float, count=len(rows)
+            )
+    arrays["covid_19_community_level"] = vector_values.level_indexes(
+        [row[LEVEL] for row in rows]
+    )
+    return arrays
+
+
+def county_values(pairs):
+    # fetch_covid_data's values of every pair, plus county_fips
+    values = vector_values.compute(
+        columns([pair[0] for pair in pairs]), columns([pair[1] for pair in pairs])
+    )
+    for index, ((date, newest), _) in enumerate(pairs):
+        county = {
+            "county_fips": newest[FIPS],
+            "date_updated": date[0:10],
+            "county": newest[COUNTY],
+            "community_level": newest[LEVEL],
+        }
+        county.update(vector_values.county_values(values, index))
+        yield county
+
+
+def output_fields():
+    fields = [
+        "county_fips",
+        "date_updated",
+        "county",
+        "community_level",
+        "community_level_direction",
+    ]
+    for metric in covid_values.METRICS:
+        fields.extend((metric[0], metric[0] + "_direction", metric[0] + "_pct_change"))
+    return fields
+
+
+def write(counties, out, output_format):
+    if output_format == "csv":
+        writer = csv.DictWriter(out, output_fields(), restval="")
+        writer.writeheader()
+        writer.writerows(counties)
+    else:
+        for county in counties:
+            out.write(json.dumps(county, separators=(",", ":")) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("export", help="CSV or JSON Lines export, - for stdin")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="of the export")
+    parser.add_argument("--out", help="values file, .csv or .jsonl, default stdout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latest = LatestWeeks()
+    with open_input(args.export) as lines:
+        if (args.format or input_format(args.export)) == "jsonl":
+            rows = jsonl_rows(lines)
+        else:
+            rows = csv_rows(lines)
+        for row in rows:
+            latest.add(row)
+    read_s = time.perf_counter() - start
+
+    pairs = latest.pairs()
+    output_format = "csv" if args.out and args.out.endswith(".csv") else "jsonl"
+    if args.out:
+        with open(args.out, "w", newline="") as out:
+            write(county_values(pairs), out, output_format)
+    else:
+        write(county_values(pairs), sys.stdout, output_format)
+
+    print(
+        "%d rows, %d counties, %d with two weeks: read in %.2f s, %.2f s in all,"
+        " peak RSS %d MB"
+        % (
+            latest.rows,
+            len(latest.counties),
+            len(pairs),
+            read_s,
+            time.perf_counter() - start,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024,
+        ),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# Read, subset and write PCF bitmap fonts, and rasterize their glyphs.
+#
+# Only the layout adafruit_bitmap_font can load is handled: big endian tables
+# with MSB first bits, which is what fonts/*.pcf use.
+import struct
+
+PROPERTIES = 1 << 0
+ACCELERATORS = 1 << 1
+METRICS = 1 << 2
+BITMAPS = 1 << 3
+INK_METRICS = 1 << 4
+BDF_ENCODINGS = 1 << 5
+SWIDTHS = 1 << 6
+GLYPH_NAMES = 1 << 7
+BDF_ACCELERATORS = 1 << 8
+
+_BYTE_MASK = 1 << 2
+_BIT_MASK = 1 << 3
+_COMPRESSED_METRICS = 0x100
+_NO_GLYPH = 0xFFFF
+
+
+def _pad4(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _stride(width, format_):
+    # bytes per bitmap row for the glyph padding selected by format_ & 3
+    pad = 1 << (format_ & 3)
+    return ((width + 7) // 8 + pad - 1) // pad * pad
+
+
+class Metrics:
+    def __init__(self, lsb, rsb, width, ascent, descent, attributes=0):
+        self.left_side_bearing = lsb
+        self.right_side_bearing = rsb
+        self.character_width = width
+        self.character_ascent = ascent
+        self.character_descent = descent
+        self.character_attributes = attributes
+
+    @property
+    def bitmap_width(self):
+        return self.right_side_bearing - self.left_side_bearing
+
+    @property
+    def bitmap_height(self):
+        return self.character_ascent + self.character_descent
+
+    def astuple(self):
+        return (
+            self.left_side_bearing,
+            self.right_side_bearing,
+            self.character_width,
+            self.character_ascent,
+            self.character_descent,
+            self.character_attributes,
+        )
+
+
+def _read_metrics_table(data, offset):
+    (format_,) = struct.unpack_from("<I", data, offset)
+    metrics = []
+    if format_ & _COMPRESSED_METRICS:
+        (count,) = struct.unpack_from(">H", data, offset + 4)
+        for index in range(count):
+            values = struct.unpack_from("5B", data, offset + 6 + 5 * index)
+            metrics.append(Metrics(*(value - 0x80 for value in values)))
+    else:
+        (count,) = struct.unpack_from(">I", data, offset + 4)
+        for index in range(count):
+            metrics.append(
+                Metrics(*struct.unpack_from(">5hH", data, offset + 8 + 12 * index))
+            )
+    return format_, metrics
+
+
+def _write_metrics_table(format_, metrics):
+    if format_ & _COMPRESSED_METRICS:
+        body = struct.pack(">H", len(metrics)) + b"".join(
+            struct.pack("5B", *(value + 0x80 for value in m.astuple()[:5]))
+            for m in metrics
+        )
+    else:
+        body = struct.pack(">I", len(metrics)) + b"".join(
+            struct.pack(">5hH", *m.astuple()) for m in metrics
+        )
+    return struct.pack("<I", format_) + body
+
+
+class PCF:
+    def __init__(self):
+        self.tables = {}  # type -> (format, raw table bytes) for copied tables
+        self.metrics_format = 0
+        self.metrics = []
+        self.ink_metrics_format = None
+        self.ink_metrics = []
+        self.bitmap_format = 0
+        self.bitmaps = []
+        self.default_char = 0
+        self.encodings_format = 0
+        self.encoding = {}  # code point -> glyph index
+        self.swidths_format = None
+        self.swidths = []
+        self.glyph_names_format = None
+        self.glyph_names = []
+
+    @classmethod
+    def read(cls, path):
+        with open(path, "rb") as font_file:
+            data = font_file.read()
+        if data[:4] != b"\x01fcp":
+            raise ValueError(f"{path} is not a PCF font")
+        font = cls()
+        (table_count,) = struct.unpack_from("<I", data, 4)
+        toc = {}
+        for index in range(table_count):
+            type_, format_, size, offset = struct.unpack_from(
+                "<4I", data, 8 + 16 * index
+            )
+            if not format_ & _BYTE_MASK or not format_ & _BIT_MASK:
+                raise ValueError(f"{path}: only MSB first PCF tables are supported")
+            toc[type_] = (format_, size, offset)
+            font.tables[type_] = (format_, data[offset : offset + size])
+
+        font.metrics_format, font.metrics = _read_metrics_table(data, toc[METRICS][2])
+        if INK_METRICS in toc:
+            font.ink_metrics_format, font.ink_metrics = _read_metrics_table(
+                data, toc[INK_METRICS][2]
+            )
+
+        format_, _, offset = toc[BITMAPS]
+        font.bitmap_format = format_
+        (count,) = struct.unpack_from(">I", data, offset + 4)
+        offsets = struct.unpack_from(">%dI" % count, data, offset + 8)
+        start = offset + 8 + 4 * count + 16
+        for index, metrics in enumerate(font.metrics):
+            size = _stride(metrics.bitmap_width, format_) * metrics.bitmap_height
+            font.bitmaps.append(
+                data[start + offsets[index] : start + offsets[index] + size]
+            )
+
+        format_, _, offset = toc[BDF_ENCODINGS]
+        font.encodings_format = format_
+        min2, max2, min1, max1, font.default_char = struct.unpack_from(
+            ">5h", data, offset + 4
+        )
+        span = max2 - min2 + 1
+        indices = struct.unpack_from(
+            ">%dH" % (span * (max1 - min1 + 1)), data, offset + 14
+        )
+        for position, glyph in enumerate(indices):
+            if glyph != _NO_GLYPH:
+                byte1, byte2 = divmod(position, span)
+                font.encoding[(byte1 + min1) << 8 | (byte2 + min2)] = glyph
+
+        if SWIDTHS in toc:
+            format_, _, offset = toc[SWIDTHS]
+            font.swidths_format = format_
+            (count,) = struct.unpack_from(">I", data, offset + 4)
+            font.swidths = list(struct.unpack_from(">%di" % count, data, offset + 8))
+
+        if GLYPH_NAMES in toc:
+            format_, _, offset = toc[GLYPH_NAMES]
+            font.glyph_names_format = format_
+            (count,) = struct.unpack_from(">I", data, offset + 4)
+            offsets = struct.unpack_from(">%dI" % count, data, offset + 8)
+            strings = offset + 8 + 4 * count + 4
+            for name_offset in offsets:
+                end = data.index(b"\0", strings + name_offset)
+                font.glyph_names.append(data[strings + name_offset : end])
+        return font
+
+    def code_points(self):
+        return sorted(self.encoding)
+
+    def subset(self, code_points):
+        # a new font holding only the glyphs for code_points, in code point order
+        font = PCF()
+        font.tables = self.tables
+        font.metrics_format = self.metrics_format
+        font.ink_metrics_format = self.ink_metrics_format
+        font.bitmap_format = self.bitmap_format
+        font.encodings_format = self.encodings_format
+        font.swidths_format = self.swidths_format
+        font.glyph_names_format = self.glyph_names_format
+        font.default_char = self.default_char
+
+        for code_point in sorted(set(code_points)):
+            if code_point not in self.encoding:
+                continue
+            glyph = self.encoding[code_point]
+            font.encoding[code_point] = len(font.metrics)
+            font.metrics.append(self.metrics[glyph])
+            font.bitmaps.append(self.bitmaps[glyph])
+            if self.ink_metrics:
+                font.ink_metrics.append(self.ink_metrics[glyph])
+            if self.swidths:
+                font.swidths.append(self.swidths[glyph])
+            if self.glyph_names:
+                font.glyph_names.append(self.glyph_names[glyph])
+        return font
+
+    def _bitmaps_table(self):
+        offsets = []
+        position = 0
+        for bitmap in self.bitmaps:
+            offsets.append(position)
+            position += len(bitmap)
+        sizes = [
+            sum(_stride(m.bitmap_width, pad) * m.bitmap_height for m in self.metrics)
+            for pad in range(4)
+        ]
+        return (
+            struct.pack("<I", self.bitmap_format)
+            + struct.pack(">I", len(self.bitmaps))
+            + struct.pack(">%dI" % len(offsets), *offsets)
+            + struct.pack(">4I", *sizes)
+            + b"".join(self.bitmaps)
+        )
+
+    def _encodings_table(self):
+        code_points = self.code_points()
+        min1 = min(code_point >> 8 for code_point in code_points)
+        max1 = max(code_point >> 8 for code_point in code_points)
+        min2 = min(code_point & 0xFF for code_point in code_points)
+        max2 = max(code_point & 0xFF for code_point in code_points)
+        span = max2 - min2 + 1
+        indices = [_NO_GLYPH] * (span * (max1 - min1 + 1))
+        for code_point, glyph in self.encoding.items():
+            indices[((code_point >> 8) - min1) * span + (code_point & 0xFF) - min2] = (
+                glyph
+            )
+        return (
+            struct.pack("<I", self.encodings_format)
+            + struct.pack(">5h", min2, max2, min1, max1, self.default_char)
+            + struct.pack(">%dH" % len(indices), *indices)
+        )
+
+    def _swidths_table(self):
+        return (
+            struct.pack("<I", self.swidths_format)
+            + struct.pack(">I", len(self.swidths))
+            + struct.pack(">%di" % len(self.swidths), *self.swidths)
+        )
+
+    def _glyph_names_table(self):
+        offsets = []
+        strings = b""
+        for name in self.glyph_names:
+            offsets.append(len(strings))
+            strings += name + b"\0"
+        return (
+            struct.pack("<I", self.glyph_names_format)
+            + struct.pack(">I", len(offsets))
+            + struct.pack(">%dI" % len(offsets), *offsets)
+            + struct.pack(">I", len(strings))
+            + strings
+        )
+
+    def write(self, path):
+        tables = {}
+        for type_, (format_, raw) in self.tables.items():
+            tables[type_] = (format_, raw)
+        tables[METRICS] = (
+            self.metrics_format,
+            _write_metrics_table(self.metrics_format, self.metrics),
+        )
+        if self.ink_metrics_format is not None:
+            tables[INK_METRICS] = (
+                self.ink_metrics_format,
+                _write_metrics_table(self.ink_metrics_format, self.ink_metrics),
+            )
+        tables[BITMAPS] = (self.bitmap_format, self._bitmaps_table())
+        tables[BDF_ENCODINGS] = (self.encodings_format, self._encodings_table())
+        if self.swidths_format is not None:
+            tables[SWIDTHS] = (self.swidths_format, self._swidths_table())
+        if self.glyph_names_format is not None:
+            tables[GLYPH_NAMES] = (self.glyph_names_format, self._glyph_names_table())
+
+        types = sorted(tables)
+        offset = 8 + 16 * len(types)
+        toc = b""
+        body = b""
+        for type_ in types:
+            format_, raw = tables[type_]
+            toc += struct.pack("<4I", type_, format_, len(raw), offset + len(body))
+            body += _pad4(raw)
+        with open(path, "wb") as font_file:
+            font_file.write(b"\x01fcp" + struct.pack("<I", len(types)) + toc + body)
+
+    def accelerators(self):
+        # (font_ascent, font_descent) from the BDF or plain accelerator table
+        format_, raw = self.tables.get(BDF_ACCELERATORS) or self.tables[ACCELERATORS]
+        return struct.unpack_from(">II", raw, 12)
+
+    def glyph(self, code_point):
+        # (metrics, rows) where rows is a list of lists of 0/1 pixels, or None
+        if code_point not in self.encoding:
+            return None
+        index = self.encoding[code_point]
+        metrics = self.metrics[index]
+        bitmap = self.bitmaps[index]
+        stride = _stride(metrics.bitmap_width, self.bitmap_format)
+        rows = []
+        for y in range(metrics.bitmap_height):
+            row = bitmap[y * stride : (y + 1) * stride]
+            rows.append(
+                [
+                    (row[x >> 3] >> (7 - (x & 7))) & 1
+                    for x in range(metrics.bitmap_width)
+                ]
+            )
+        return metrics, rows
@@ -0,0 +1,90 @@
+# Draw a county's screen on the desktop the way code.py lays it out, as a
+# 1 bit BMP that a MagTag in screen mode shows without loading any fonts.
+#
+# The labels are laid out by the desktop stand-ins in tools/host, the same
+# ones tools/run_host.py checks code.py against, using layout.py for the
+# positions and text.
+#
+#   python3 tools/render_screen.py [--county 37183] [--out screen.bmp] [rows.json ...]
+import argparse
+import contextlib
+import glob
+import io
+import os
+import struct
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = os.path.join(ROOT, "tools", "host")
+sys.path[:0] = [HOST, ROOT, os.path.join(ROOT, "tools")]
+
+import label_batch  # noqa: E402
+import layout  # noqa: E402
+from adafruit_magtag import magtag as host_magtag  # noqa: E402
+
+WIDTH = host_magtag.WIDTH
+HEIGHT = host_magtag.HEIGHT
+# BMP rows are padded to 4 bytes
+_ROW_BYTES = (WIDTH + 31) // 32 * 4
+_PIXEL_OFFSET = 14 + 40 + 2 * 4
+
+
+def bmp(pixels):
+    # pixels is WIDTH * HEIGHT bytes, 1 for black. Index 0 of the palette is
+    # white and index 1 black, rows bottom up the way BMP stores them
+    rows = []
+    for y in range(HEIGHT - 1, -1, -1):
+        row = bytearray(_ROW_BYTES)
+        for x in range(WIDTH):
+            if pixels[y * WIDTH + x]:
+                row[x >> 3] |= 0x80 >> (x & 7)
+        rows.append(bytes(row))
+    image = b"".join(rows)
+    return (
+        struct.pack("<2sIHHI", b"BM", _PIXEL_OFFSET + len(image), 0, 0, _PIXEL_OFFSET)
+        + struct.pack(
+            "<IiiHHIIiiII", 40, WIDTH, HEIGHT, 1, 1, 0, len(image), 2835, 2835, 2, 2
+        )
+        + struct.pack("<4B4B", 0xFF, 0xFF, 0xFF, 0, 0, 0, 0, 0)
+        + image
+    )
+
+
+def render(values):
+    # the BMP of one county's values, shaped like code.py's county_values
+    magtag = host_magtag.MagTag()
+    magtag.graphics.display.framebuffer = host_magtag.Framebuffer()
+    for _ in layout.add_labels(magtag):
+        pass
+    label_batch.set_texts(magtag, dict(enumerate(layout.label_texts(values))))
+    chart = layout.sparkline_chart()
+    chart.plot(values.get("sparkline", []))
+    magtag.root_group.append(chart.tile_grid)
+    magtag.refresh()
+    return bmp(magtag.display.framebuffer.pixels)
+
+
+def main():
+    import aggregator
+    import cdc_stub
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*")
+    parser.add_argument("--county", default="37183")
+    parser.add_argument("--out", default="screen.bmp")
+    args = parser.parse_args()
+
+    paths = args.rows or sorted(
+        glob.glob(os.path.join(ROOT, "tools", "fixtures", "3nnm-4jni_*.json"))
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        values = aggregator.county_values(cdc_stub.load_rows(paths))[args.county]
+    values["api_last_called"] = "%d/%d\n%d:%02d" % time.localtime()[1:5]
+    with open(args.out, "wb") as bmp_file:
+        bmp_file.write(render(values))
+    print("saved", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+# Run the code.py wake cycle on the desktop.
+#
+# tools/host provides stand-ins for adafruit_magtag, alarm, board, rtc,
+# socketpool and wifi, and tools/cdc_stub.py replays the recorded 3nnm-4jni
+# rows over HTTPS in place of data.cdc.gov and io.adafruit.com. Sleep
+# memory is carried from one wake to the next like a real
+# deep sleep, and the panel can be saved as a PNG after every wake. Files
+# code.py writes to CIRCUITPY go to a temporary directory that lasts one run.
+#
+#   python3 tools/run_host.py --wakes 3 --png /tmp/wake%d.png
+#   python3 tools/run_host.py --county 37183,37063 --button-wakes 2
+#   python3 tools/run_host.py --set PARSER_CHUNK_SIZE=64 --profile
+#   python3 tools/run_host.py --wakes 3 --hold-a --trace-memory
+#   python3 tools/run_host.py --join-ms 1500 --latency-ms 800
+#   python3 tools/run_host.py --set ACCEPT_GZIP=False
+#   python3 tools/run_host.py --wakes 2 --aggregator
+#   python3 tools/run_host.py --wakes 2 --screen --png /tmp/screen%d.png
+import argparse
+import ast
+import cProfile
+import gc
+import glob
+import os
+import pstats
+import shutil
+import ssl
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = os.path.join(ROOT, "tools", "host")
+sys.path[:0] = [HOST, ROOT, os.path.join(ROOT, "tools")]
+
+import alarm  # noqa: E402
+import board  # noqa: E402
+import aggregator as cdc_aggregator  # noqa: E402
+import cdc_stub  # noqa: E402
+from adafruit_display_text import bitmap_label  # noqa: E402
+import host_network  # noqa: E402
+from adafruit_magtag import magtag as host_magtag  # noqa: E402
+
+# modules that live on the CIRCUITPY drive, re-imported on every wake
+DEVICE_MODULES = [
+    os.path.splitext(os.path.basename(path))[0]
+    for path in glob.glob(os.path.join(ROOT, "*.py"))
+    if not path.endswith("code.py")
+]
+
+# roughly what gc.mem_free() reports on a MagTag right after boot
+HEAP_SIZE = 2_000_000
+
+
+def mem_free():
+    # CPython has no gc.mem_free, so count down from HEAP_SIZE by what
+    # tracemalloc has seen allocated (nothing unless --trace-memory is on)
+    if not tracemalloc.is_tracing():
+        return HEAP_SIZE
+    return HEAP_SIZE - tracemalloc.get_traced_memory()[0]
+
+
+gc.mem_free = mem_free
+
+
+class Wake:
+    def __init__(self, index, wake_alarm):
+        self.index = index
+        self.wake_alarm = wake_alarm
+        self.awake_ms = 0
+        self.fixed_sleep_s = 0.0
+        self.deep_sleep_s = None
+        self.button_alarm = False
+        self.refreshes = 0
+        self.changed_boxes = []
+        self.layouts = 0
+        self.labels = []
+        self.requests = []
+        self.connections = 0
+        self.handshakes = 0
+        self.resumed = 0
+        self.error = None
+        self.magtag = None
+
+    def summary(self):
+        lines = [
+            "wake %d (%s): awake %d ms + %.1f s fixed sleeps, %d refresh(es),"
+            " %d label layouts"
+            % (
+                self.index,
+                type(self.wake_alarm).__name__ if self.wake_alarm else "power on",
+                self.awake_ms,
+                self.fixed_sleep_s,
+                self.refreshes,
+                self.layouts,
+            )
+        ]
+        for box in self.changed_boxes:
+            lines.append(
+                "  refresh changed %s" % ("x %d y %d %dx%d" % box if box else "nothing")
+            )
+        for url, status, size, elapsed in self.requests:
+            lines.append(
+                "  HTTP %d %6d bytes %5d ms %s" % (status, size, elapsed, url[:90])
+            )
+        if self.requests:
+            lines.append(
+                "  %d request(s) over %d connection(s), %d TLS handshake(s),"
+                " %d resumed"
+                % (
+                    len(self.requests),
+                    self.connections,
+                    self.handshakes,
+                    self.resumed,
+                )
+            )
+        if self.deep_sleep_s is not None:
+            lines.append(
+                "  deep sleep %d s%s"
+                % (self.deep_sleep_s, " or button D" if self.button_alarm else "")
+            )
+        if self.error:
+            lines.append("  error: %r" % (self.error,))
+        return "\n".join(lines)
+
+
+def compile_code(overrides):
+    # code.py with top level constants replaced, e.g. {"PARSER_CHUNK_SIZE": "64"}
+    with open(os.path.join(ROOT, "code.py")) as code_file:
+        tree = ast.parse(code_file.read())
+    found = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in overrides:
+                node.value = ast.parse(overrides[name], mode="eval").body
+                found.add(name)
+    missing = set(overrides) - found
+    if missing:
+        raise SystemExit("not a constant in code.py: " + ", ".join(sorted(missing)))
+    return compile(tree, os.path.join(ROOT, "code.py"), "exec")
+
+
+def install_secrets(
+    county, timezone, aggregator_url=None, screen_url=None, cdc_proxy_url=None
+):
+    module = types.ModuleType("secrets")
+    module.secrets = {
+        "ssid": "host",
+        "password": "host",
+        "aio_username": "host",
+        "aio_key": "host",
+        "timezone": timezone,
+        "cdc_app_token": "host",
+        "county_fips_code": county,
+    }
+    if aggregator_url:
+        module.secrets["aggregator_url"] = aggregator_url
+    if screen_url:
+        module.secrets["screen_url"] = screen_url
+    if cdc_proxy_url:
+        module.secrets["cdc_proxy_url"] = cdc_proxy_url
+    sys.modules["secrets"] = module
+
+
+def run_wake(code, index, wake_alarm, drive, real_sleep=False, profiler=None):
+    for name in DEVICE_MODULES:
+        sys.modules.pop(name, None)
+    import history
+
+    history.PATH = os.path.join(drive, os.path.basename(history.PATH))
+    alarm.wake_alarm = wake_alarm
+    wake = Wake(index, wake_alarm)
+    requests_before = len(host_magtag.stats.requests)
+    layouts_before = bitmap_label.LAYOUTS[0]
+    connections_before = host_magtag.stats.connections
+    handshakes_before = host_magtag.stats.handshakes
+    resumed_before = host_magtag.stats.resumed
+
+    real_time_sleep = time.sleep
+
+    def fixed_sleep(seconds):
+        wake.fixed_sleep_s += seconds
+        if real_sleep:
+            real_time_sleep(seconds)
+
+    namespace = {"__name__": "__main__"}
+    time.sleep = fixed_sleep
+    start = time.perf_counter()
+    try:
+        if profiler:
+            profiler.runcall(exec, code, namespace)
+        else:
+            exec(code, namespace)
+    except alarm.DeepSleep as sleep:
+        for requested in sleep.alarms:
+            if isinstance(requested, alarm.time.TimeAlarm):
+                wake.deep_sleep_s = requested.monotonic_time - time.monotonic()
+            elif isinstance(requested, alarm.pin.PinAlarm):
+                wake.button_alarm = True
+    except Exception as error:  # noqa: BLE001 - reported with the wake
+        wake.error = error
+    finally:
+        time.sleep = real_time_sleep
+    wake.awake_ms = int((time.perf_counter() - start) * 1000)
+
+    magtag = namespace.get("magtag")
+    if magtag is not None:
+        wake.magtag = magtag
+        wake.refreshes = magtag.display.refreshes
+        wake.changed_boxes = magtag.display.changed_boxes
+        wake.labels = [
+            entry["label"].text if entry["label"] else "" for entry in magtag._text
+        ]
+    wake.layouts = bitmap_label.LAYOUTS[0] - layouts_before
+    wake.requests = host_magtag.stats.requests[requests_before:]
+    wake.connections = host_magtag.stats.connections - connections_before
+    wake.handshakes = host_magtag.stats.handshakes - handshakes_before
+    wake.resumed = host_magtag.stats.resumed - resumed_before
+    return wake
+
+
+def run(
+    wakes=1,
+    county="37183",
+    button_wakes=(),
+    overrides=None,
+    cdc_url=None,
+    rows=None,
+    timezone="America/New_York",
+    real_sleep=False,
+    profiler=None,
+    on_wake=None,
+    hold_a=False,
+    trace_memory=False,
+    join_ms=0,
+    latency_ms=0,
+    aggregator=False,
+    screen=False,
+    proxy=False,
+):
+    # run `wakes` wake cycles, returning a Wake per cycle. button_wakes are
+    # the wake numbers that start from a button D press instead of the timer.
+    # aggregator puts tools/aggregator.py between the MagTag and the CDC,
+    # screen has it draw the screen too, proxy only has it pass the CDC
+    # queries on through its cache
+    stub = None
+    if cdc_url is None:
+        paths = rows or sorted(
+            glob.glob(os.path.join(ROOT, "tools", "fixtures", "*.json"))
+        )
+        stub = cdc_stub.CdcStub(
+            cdc_stub.load_rows(paths), tls=True, latency=latency_ms / 1000
+        ).start()
+        cdc_url = stub.base_url
+    host_network.HOSTS.clear()
+    server = urlsplit(cdc_url)
+    if server.hostname != "data.cdc.gov":
+        host_network.HOSTS["data.cdc.gov", 443] = (server.hostname, server.port)
+    # the stub answers for Adafruit IO's time service too, a time only stub
+    # when the CDC data comes from somewhere else
+    clock = stub or cdc_stub.CdcStub([], tls=True).start()
+    host_network.HOSTS["io.adafruit.com", 443] = clock.address
+    host_magtag.TIME_SERVICE_URL = "https://io.adafruit.com/time"
+    host_network.JOIN_SECONDS = join_ms / 1000
+    aggregator_url = screen_url = cdc_proxy_url = None
+    if aggregator or screen or proxy:
+        aggregator = cdc_aggregator.Aggregator(
+            cdc_url + "/resource/3nnm-4jni.json",
+            host="127.0.0.1",
+            port=0,
+            context=host_network._create_default_context(
+                cafile=host_network.CERTIFICATE
+            ),
+        ).start()
+        if proxy:
+            cdc_proxy_url = aggregator.base_url
+        elif screen:
+            screen_url = aggregator.base_url + "/screen.bmp"
+        else:
+            aggregator_url = aggregator.base_url + "/counties.bin"
+    # TLS sockets that trust the stub and behave like CircuitPython's
+    ssl.create_default_context = host_network.client_context
+    install_secrets(county, timezone, aggregator_url, screen_url, cdc_proxy_url)
+    alarm.sleep_memory[:] = bytes(len(alarm.sleep_memory))
+    host_magtag.PANEL.clear()
+    host_magtag.BUTTONS["a"] = hold_a
+    drive = tempfile.mkdtemp(prefix="CIRCUITPY-")
+    overrides = dict(overrides or {})
+    overrides.setdefault("SCREEN_PATH", repr(os.path.join(drive, "screen.bmp")))
+    code = compile_code(overrides)
+    if trace_memory:
+        tracemalloc.start()
+
+    results = []
+    try:
+        wake_alarm = None
+        for index in range(1, wakes + 1):
+            if index in button_wakes:
+                wake_alarm = alarm.pin.PinAlarm(board.BUTTON_D)
+            wake = run_wake(code, index, wake_alarm, drive, real_sleep, profiler)
+            results.append(wake)
+            if on_wake:
+                on_wake(wake)
+            wake_alarm = alarm.time.TimeAlarm(monotonic_time=time.monotonic())
+    finally:
+        ssl.create_default_context = host_network._create_default_context
+        tracemalloc.stop()
+        shutil.rmtree(drive)
+        if aggregator:
+            aggregator.stop()
+            print(
+                "aggregator: %d upstream requests, %d dataset downloads"
+                % (aggregator.upstream_requests, aggregator.dataset_fetches)
+            )
+            if proxy:
+                print("aggregator query cache:", aggregator.queries.stats())
+        clock.stop()
+    return results, stub
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wakes", type=int, default=1)
+    parser.add_argument(
+        "--county", default="37183", help="FIPS code(s), comma separated"
+    )
+    parser.add_argument(
+        "--button-wakes",
+        default="",
+        help="comma separated wake numbers started by a button D press",
+    )
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument(
+        "--cdc-url",
+        help="HTTPS server to use instead of tools/cdc_stub.py, with a"
+        " certificate valid for data.cdc.gov",
+    )
+    parser.add_argument("--png", help="save the panel after each wake, %%d is the wake")
+    parser.add_argument("--real-sleep", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument(
+        "--hold-a", action="store_true", help="hold button A to print the wake log"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="make gc.mem_free() follow tracemalloc (slows every phase down)",
+    )
+    parser.add_argument("--join-ms", type=int, default=0, help="Wi-Fi join time")
+    parser.add_argument(
+        "--latency-ms", type=int, default=0, help="stub time to first byte"
+    )
+    parser.add_argument(
+        "--aggregator",
+        action="store_true",
+        help="fetch through tools/aggregator.py instead of from the CDC",
+    )
+    parser.add_argument(
+        "--screen",
+        action="store_true",
+        help="show the screen tools/aggregator.py draws instead of the labels",
+    )
+    parser.add_argument(
+        "--proxy",
+        action="store_true",
+        help="send the CDC queries through tools/aggregator.py's cache",
+    )
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.set)
+    button_wakes = {int(wake) for wake in args.button_wakes.split(",") if wake}
+    profiler = cProfile.Profile() if args.profile else None
+
+    def report(wake):
+        print(wake.summary())
+        for text in wake.labels:
+            print("    %r" % text)
+        if args.png and wake.magtag is not None:
+            path = args.png % wake.index if "%d" in args.png else args.png
+            wake.magtag.display.framebuffer.save_png(path)
+            print("  saved", path)
+
+    run(
+        wakes=args.wakes,
+        county=args.county,
+        button_wakes=button_wakes,
+        overrides=overrides,
+        cdc_url=args.cdc_url,
+        real_sleep=args.real_sleep,
+        profiler=profiler,
+        on_wake=report,
+        hold_a=args.hold_a,
+        trace_memory=args.trace_memory,
+        join_ms=args.join_ms,
+        latency_ms=args.latency_ms,
+        aggregator=args.aggregator,
+        screen=args.screen,
+        proxy=args.proxy,
+    )
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Build the fonts/*.pcf files the tracker loads from the full fonts in
+# tools/fonts, keeping only the glyphs code.py can draw.
+#
+#   python3 tools/subset_fonts.py
+#
+# forkawesome-12 keeps the icons.* names used in code.py and layout.py.
+# Arial-Bold-12 keeps the fixed label text (the *_FORMAT constants and the
+# label formats of covid_values.METRICS), VALUE_GLYPHS and the letters
+# county names can use, including the Latin-1 letters of names like
+# "Doña Ana County" and "Mayagüez Municipio" that the source font has.
+import ast
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FONTS = os.path.join(ROOT, "tools", "fonts")
+sys.path.insert(0, ROOT)
+
+import covid_values  # noqa: E402
+import icons  # noqa: E402
+from pcf import PCF  # noqa: E402
+
+# county names are not known until the CDC data arrives
+COUNTY_CHARACTERS = " '.-ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# accented county names, kept where the source font has the letter
+COUNTY_LATIN1_LETTERS = "".join(
+    chr(code_point) for code_point in range(0xC0, 0x100) if chr(code_point).isalpha()
+)
+
+
+def read_code():
+    # code.py and layout.py, which between them decide what the labels show
+    source = ""
+    for name in ("code.py", "layout.py"):
+        with open(os.path.join(ROOT, name)) as code_file:
+            source += code_file.read() + "\n"
+    return source
+
+
+def icon_code_points(source):
+    names = sorted(set(re.findall(r"\bicons\.([A-Za-z0-9_]+)", source)))
+    return names, {ord(getattr(icons, name)) for name in names}
+
+
+def label_characters(source):
+    characters = set(COUNTY_CHARACTERS)
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Constant):
+            continue
+        name = getattr(node.targets[0], "id", "")
+        if name.endswith("_FORMAT"):
+            # literal text only, {} format fields are filled in from the data
+            characters.update(re.sub(r"\{[^}]*\}", "", node.value.value))
+        elif name == "VALUE_GLYPHS":
+            characters.update(node.value.value)
+    for metric in covid_values.METRICS:
+        characters.update(re.sub(r"\{[^}]*\}", "", metric[3]))
+    return {ord(character) for character in characters}
+
+
+def subset(name, code_points):
+    source = os.path.join(SOURCE_FONTS, name)
+    target = os.path.join(ROOT, "fonts", name)
+    font = PCF.read(source).subset(code_points)
+    font.write(target)
+    print(
+        f"{name}: {len(font.encoding)} glyphs, "
+        f"{os.path.getsize(source)} -> {os.path.getsize(target)} bytes"
+    )
+    missing = sorted(set(code_points) - set(font.encoding))
+    if missing:
+        print("  not in font:", " ".join("U+%04X" % c for c in missing))
+
+
+def main():
+    source = read_code()
+    names, icon_points = icon_code_points(source)
+    print("icons used:", ", ".join(names))
+    subset("forkawesome-12.pcf", icon_points)
+    text_font = PCF.read(os.path.join(SOURCE_FONTS, "Arial-Bold-12.pcf"))
+    latin1 = {ord(letter) for letter in COUNTY_LATIN1_LETTERS} & set(text_font.encoding)
+    subset("Arial-Bold-12.pcf", label_characters(source) | latin1)
+
+
+if __name__ == "__main__":
+    main()
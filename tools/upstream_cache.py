@@ -0,0 +1,90 @@
+# Keeps upstream answers for a while and makes concurrent callers share one
+# upstream request, so trackers asking the same thing around the same time
+# cost one call against the app token's quota.
+#
+# get(key) answers from the cache while the entry is fresh (a hit). A key
+# nobody is fetching is fetched by the caller (a miss); callers asking for
+# it while that fetch runs wait for its answer (coalesced) instead of
+# starting their own. Errors are passed to every waiting caller and never
+# cached. At most max_entries answers are kept, the least recently used
+# go first.
+import collections
+import threading
+import time
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlightCache:
+    def __init__(self, fetch, ttl, max_entries=128, clock=time.monotonic):
+        # fetch(key) gets the answer, ttl(answer) is how many seconds it
+        # stays fresh, 0 or less to not keep it
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = collections.OrderedDict()  # {key: (expires, answer)}
+        self.in_flight = {}  # {key: _Flight}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        ttl = 0
+        try:
+            flight.value = self.fetch(key)
+            ttl = self.ttl(flight.value)
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+                if ttl > 0:
+                    self._store(key, ttl, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key, ttl, value):
+        # called with the lock held
+        self.entries[key] = (self.clock() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+            }
@@ -0,0 +1,78 @@
+# covid_values.fetch_covid_data for many counties at once with NumPy, for
+# the tools that work on more than a tracker's handful of counties. Follows
+# the same covid_values.METRICS table, so a metric added there shows up here
+# too.
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import covid_values  # noqa: E402
+
+# directions as numbers, the way payload.py stores them
+DIRECTIONS = {-1: "down", 1: "up"}
+
+
+def level_indexes(levels):
+    # covid_values.level_index of every community level in a sequence
+    indexes = {name.lower(): index for index, name in enumerate(covid_values.LEVELS)}
+    return np.fromiter(
+        (indexes.get((level or "").lower(), -1) for level in levels),
+        dtype=np.int8,
+        count=len(levels),
+    )
+
+
+def percent_change(current, prior):
+    # covid_values.get_percent_change: 0 when unchanged or prior is 0
+    change = np.zeros(len(current))
+    np.divide(
+        current - prior, prior, out=change, where=(current != prior) & (prior != 0)
+    )
+    return change
+
+
+def compute(current, prior):
+    # current and prior map the numeric columns of covid_values.FIELDS to
+    # float arrays, and covid_19_community_level to an int8 array of
+    # level_indexes, one element per county for the newest and the week
+    # before. Returns arrays named like fetch_covid_data's values, with
+    # directions as -1, 0 or 1
+    values = {}
+    current_level = current["covid_19_community_level"]
+    prior_level = prior["covid_19_community_level"]
+    values["community_level_direction"] = np.where(
+        (current_level >= 0) & (prior_level >= 0),
+        np.sign(current_level - prior_level),
+        0,
+    ).astype(np.int8)
+
+    per100k_multiplier = current["county_population"] / 100000.0
+    for name, column, scale, _ in covid_values.METRICS:
+        current_value = current[column]
+        prior_value = prior[column]
+        if scale == covid_values.PER_100K:
+            scale = per100k_multiplier
+        values[name] = current_value * scale
+        values[name + "_direction"] = np.sign(current_value - prior_value).astype(
+            np.int8
+        )
+        values[name + "_pct_change"] = percent_change(current_value, prior_value)
+    return values
+
+
+def county_values(values, index):
+    # the values of one county as fetch_covid_data's dict, without the
+    # county's name, date and community level
+    county = {}
+    for name, array in values.items():
+        if name.endswith("_direction"):
+            direction = DIRECTIONS.get(int(array[index]))
+            if direction:
+                county[name] = direction
+        else:
+            county[name] = float(array[index])
+    return county
@@ -0,0 +1,63 @@
+# Decides how long the MagTag sleeps between wakes.
+#
+# The CDC publishes the dataset once a week, so instead of checking every
+# day the time of week new data shows up is learned, from the Last-Modified
+# header of responses that brought new weeks, and the MagTag sleeps until
+# MARGIN after the next expected publication. While a publication is due but
+# has not shown up the wait starts at RETRY_FIRST and doubles on every wake,
+# so a late week is caught quickly and a skipped one costs few wakes. Failed
+# fetches retry sooner, starting at FAILURE_RETRY_FIRST. All times are
+# seconds since 1970, UTC.
+WEEK = 7 * 24 * 60 * 60
+# how long after the expected publication the first check happens
+MARGIN = 15 * 60
+RETRY_FIRST = 30 * 60
+FAILURE_RETRY_FIRST = 5 * 60
+# failed fetches back off to at most one check a day
+FAILURE_RETRY_LIMIT = 24 * 60 * 60
+
+
+def learn_publication(state, published):
+    # published is when a week the history did not have yet was published
+    phase = published % WEEK
+    if "publication" in state:
+        # half way towards the new time of week, the short way around
+        difference = (phase - state["publication"] + WEEK // 2) % WEEK - WEEK // 2
+        phase = (state["publication"] + difference // 2) % WEEK
+    state["publication"] = phase
+    state["published"] = published
+    state.pop("retries", None)
+
+
+def _next_publication(state, after):
+    # the first expected publication at or after `after`
+    return after + (state["publication"] - after) % WEEK
+
+
+def _backoff(state, key, first, limit):
+    count = state.get(key, 0)
+    state[key] = count + 1
+    return min(first << min(count, 20), limit)
+
+
+def seconds_to_sleep(state, now, failed=False):
+    # None until a publication has been seen, the caller has to fall back to
+    # its own schedule then
+    if failed:
+        retry = _backoff(state, "failures", FAILURE_RETRY_FIRST, FAILURE_RETRY_LIMIT)
+        if "publication" not in state:
+            return retry
+        return min(retry, _next_publication(state, now) + MARGIN - now)
+    state.pop("failures", None)
+    if "publication" not in state:
+        return None
+
+    # the publication after the newest one the history has
+    expected = _next_publication(state, state["published"] + WEEK // 2) + MARGIN
+    if now < expected:
+        state.pop("retries", None)
+        return expected - now
+    # due, but not published yet
+    return _backoff(
+        state, "retries", RETRY_FIRST, _next_publication(state, now) + MARGIN - now
+    )
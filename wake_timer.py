@@ -0,0 +1,29 @@
+# Per-phase timing of a wake, with a gc.mem_free() snapshot at the end of
+# each phase. The phases of the last few wakes are kept in sleep memory so
+# they can be compared with show().
+import gc
+import time
+
+
+class WakeTimer:
+    def __init__(self):
+        self.phases = []  # [phase, ms, mem_free]
+        self._last = time.monotonic_ns()
+
+    def mark(self, phase):
+        # ends the phase that started at the previous mark
+        now = time.monotonic_ns()
+        self.phases.append([phase, (now - self._last) // 1000000, gc.mem_free()])
+        self._last = time.monotonic_ns()
+
+    def save(self, state, length):
+        wake_log = state.get("wake_log", [])
+        wake_log.append(self.phases)
+        state["wake_log"] = wake_log[-length:]
+
+
+def show(wake_log):
+    for age, phases in enumerate(reversed(wake_log)):
+        print("wake -%d: %d ms awake" % (age, sum(phase[1] for phase in phases)))
+        for phase, ms, mem_free in phases:
+            print("  %-14s%7d ms%9d bytes free" % (phase, ms, mem_free))
@@ -0,0 +1,170 @@
+# Keeps the RTC on local time without asking Adafruit IO on every wake.
+#
+# Every CDC response carries an HTTP Date header in UTC. Adding the UTC
+# offset from the last Adafruit IO time sync gives local time, which is
+# written to the RTC for time.localtime(). The offset is kept in sleep state
+# until the next daylight saving change, the first wake after it asks
+# Adafruit IO again. The changes follow the US rules the CDC counties use,
+# a zone without daylight saving only asks twice a year for nothing.
+#
+# The deep sleep timer runs off an oscillator that is not very accurate.
+# sleep_ratio is the real time that passed per second of requested sleep,
+# measured between two Date headers and smoothed over wakes, and
+# sleep_seconds() scales the next sleep by it.
+import time
+import rtc
+
+_MONTHS = "JanFebMarAprMayJunJulAugSepOctNovDec"
+# sleeps shorter than this are too coarse to measure with 1 second Dates
+_MIN_MEASURED_SLEEP = 600
+
+# (utc, time.monotonic()) of this wake's Date header
+_synced = None
+
+
+def _days_from_civil(year, month, day):
+    # days since 1970-01-01, valid for any proleptic Gregorian date
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _struct_time(seconds):
+    # seconds since 1970 as a struct_time, without a time zone
+    days, seconds = divmod(seconds, 86400)
+    era = (days + 719468) // 146097
+    day_of_era = days + 719468 - era * 146097
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (
+        365 * year_of_era + year_of_era // 4 - year_of_era // 100
+    )
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = month_index + (3 if month_index < 10 else -9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return time.struct_time(
+        (
+            year,
+            month,
+            day,
+            seconds // 3600,
+            seconds // 60 % 60,
+            seconds % 60,
+            (days + 3) % 7,  # 1970-01-01 was a Thursday
+            days - _days_from_civil(year, 1, 1) + 1,
+            -1,
+        )
+    )
+
+
+def _sunday_on_or_after(year, month, day):
+    days = _days_from_civil(year, month, day)
+    return days + (6 - (days + 3) % 7) % 7
+
+
+def next_transition(utc, offset):
+    # seconds since 1970 of the next daylight saving change after utc: 2:00
+    # local time on the second Sunday of March and the first Sunday of
+    # November. offset is the UTC offset in effect until then. Learned in
+    # the hour after the November change, the change is found once more an
+    # hour later, which only costs one more Adafruit IO sync
+    year = _struct_time(utc)[0]
+    for year in (year, year + 1):
+        for month, day in ((3, 8), (11, 1)):
+            change = _sunday_on_or_after(year, month, day) * 86400 + 7200 - offset
+            if change > utc:
+                return change
+
+
+def parse_http_date(value):
+    # "Sun, 18 Oct 2026 12:50:07 GMT" -> seconds since 1970, UTC
+    _, day, month, year, clock = value.split(" ")[:5]
+    hours, minutes, seconds = (int(part) for part in clock.split(":"))
+    days = _days_from_civil(int(year), _MONTHS.index(month) // 3 + 1, int(day))
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def parse_utc_offset(reply):
+    # the %z field of the Adafruit IO time reply, "-0400" -> -14400
+    offset = reply.split(" ")[4]
+    seconds = int(offset[1:3]) * 3600 + int(offset[3:5]) * 60
+    return -seconds if offset[0] == "-" else seconds
+
+
+def parse_local_time(reply):
+    # the Adafruit IO time reply as a struct_time for the RTC,
+    # "2026-10-18 09:25:05.000 291 7 -0400 EDT"
+    date, clock, year_day, week_day = reply.split(" ")[:4]
+    year, month, day = (int(part) for part in date.split("-"))
+    hours, minutes, seconds = clock.split(":")
+    return time.struct_time(
+        (
+            year,
+            month,
+            day,
+            int(hours),
+            int(minutes),
+            int(seconds.split(".")[0]),
+            int(week_day) - 1,  # %u counts from Monday = 1
+            int(year_day),
+            -1,
+        )
+    )
+
+
+def offset_expired(state, utc):
+    # whether there is no UTC offset yet or a daylight saving change came
+    # since it was learned
+    return utc >= state.get("utc_offset_expires", utc)
+
+
+def learn_offset(state, reply, utc):
+    state["utc_offset"] = parse_utc_offset(reply)
+    state["utc_offset_expires"] = next_transition(utc, state["utc_offset"])
+
+
+def set_rtc(state, utc, received_at):
+    # utc came from a Date header read at time.monotonic() == received_at
+    global _synced
+    _synced = (utc, received_at)
+    _measure_sleep(state, utc - int(received_at))
+    now = utc + int(time.monotonic() - received_at)
+    rtc.RTC().datetime = _struct_time(now + state["utc_offset"])
+
+
+def _measure_sleep(state, woke_at):
+    slept_at = state.pop("slept_at", None)
+    requested = state.pop("sleep_requested", 0)
+    if slept_at is None or requested < _MIN_MEASURED_SLEEP:
+        return
+    ratio = (woke_at - slept_at) / requested
+    if 0.5 < ratio < 2:  # anything else was not a full timer sleep
+        state["sleep_ratio"] = (state.get("sleep_ratio", 1.0) + ratio) / 2
+        print("Deep sleep ran at %.4f of the requested time" % ratio)
+
+
+def utc_now(state):
+    # from this wake's Date header, or else from the RTC and the UTC offset
+    if _synced is None:
+        return int(time.time()) - state.get("utc_offset", 0)
+    utc, received_at = _synced
+    return utc + int(time.monotonic() - received_at)
+
+
+def sleep_seconds(state, seconds):
+    # how long to ask for so that `seconds` of real time pass. The start of
+    # the sleep is recorded so the next wake can measure it
+    requested = seconds / state.get("sleep_ratio", 1.0)
+    if _synced is None:
+        # no Date header this wake, so the next one has nothing to compare
+        state.pop("slept_at", None)
+        state.pop("sleep_requested", None)
+    else:
+        state["slept_at"] = utc_now(state)
+        state["sleep_requested"] = requested
+    return requested